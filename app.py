@@ -30,6 +30,7 @@ from config.database import (
 from utils.ai_resume_analyzer import AIResumeAnalyzer
 from utils.resume_builder import ResumeBuilder
 from utils.resume_analyzer import ResumeAnalyzer
+from utils.role_recommender import get_role_recommender
 import traceback
 import plotly.express as px
 import pandas as pd
@@ -1368,6 +1369,13 @@ class ResumeApp:
                             st.warning(
                                 "Please upload a proper resume for ATS analysis.")
                             return
+
+                        # Suggest the roles this resume fits best
+                        recommendations = get_role_recommender().recommend(text, top_k=3)
+                        if recommendations and recommendations[0]['role'] != selected_role:
+                            suggested = ", ".join(
+                                f"**{rec['role']}** ({rec['category']})" for rec in recommendations)
+                            st.info(f"💡 Based on your skills, your resume also fits: {suggested}")
                         # Display results in a modern card layout
                     col1, col2 = st.columns(2)
 
@@ -2335,16 +2343,36 @@ class ResumeApp:
                                 # Analyze the resume with Google Gemini
                                 if use_custom_job_desc and custom_job_description:
                                     # Use custom job description for analysis
-                                    analysis_result = analyzer.analyze_resume_with_gemini(
-                                        resume_text, job_role=job_role, job_description=custom_job_description)
+                                    job_description = custom_job_description
                                     # Show that custom job description was used
                                     st.session_state['used_custom_job_desc'] = True
                                 else:
                                     # Use standard role-based analysis
-                                    analysis_result = analyzer.analyze_resume_with_gemini(
-                                        resume_text, job_role=job_role)
+                                    job_description = None
                                     st.session_state['used_custom_job_desc'] = False
 
+                                # Stream the analysis and show each part as soon as the model writes it
+                                live_preview = st.empty()
+                                partial = {}
+                                analysis_result = None
+                                for event in analyzer.stream_resume_analysis(
+                                        resume_text, job_role=job_role, job_description=job_description):
+                                    if event["event"] == "result":
+                                        analysis_result = event["result"]
+                                        continue
+                                    partial[event["key"]] = event["value"]
+                                    preview = []
+                                    if "match_score" in partial:
+                                        preview.append(f"**Match Score:** {partial['match_score']}/100")
+                                    if "matched_skills" in partial:
+                                        preview.append("**Matched Skills:** " + ", ".join(map(str, partial["matched_skills"])))
+                                    if "recommendations" in partial:
+                                        preview.append("**Recommendations:**\n" + "\n".join(
+                                            f"- {recommendation}" for recommendation in partial["recommendations"]))
+                                    if preview:
+                                        live_preview.markdown("\n\n".join(preview))
+                                live_preview.empty()
+
                                 
                                 # Update progress
                                 progress_bar.progress(80)
@@ -1,98 +1,166 @@
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
-def get_database_connection():
-    """Create and return a database connection"""
-    import os
+from .migrations import migrate
+from .resume_skills import INSERT_SKILL, skill_rows
+from .rollups import SCORE_BUCKETS, record_ai_analysis, record_analysis, record_resume
+
+# Idle connections kept per database file; more are opened when needed
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "16384"))
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+# Prepared statements kept per connection (sqlite3's statement cache)
+SQLITE_CACHED_STATEMENTS = 256
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that goes back to its pool on close().
+
+    It is a real sqlite3.Connection, so existing code (cursor(), commit(),
+    pandas.read_sql_query) works unchanged; only close() differs.
+    """
+
+    _pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of tuned connections to one SQLite database.
+
+    Connections are opened with WAL journaling, so dashboard reads no longer
+    block analyzer writes, plus synchronous=NORMAL (durable at checkpoints,
+    safe with WAL), a larger page cache and memory-mapped reads. Reusing
+    connections also reuses each one's prepared-statement cache. Checkout
+    never blocks: when every pooled connection is busy a new one is opened,
+    and at most max_idle are kept once returned.
+    """
+
+    def __init__(self, db_path, max_idle=None, journal_mode="WAL", synchronous="NORMAL",
+                 cache_kb=None, mmap_mb=None, timeout=30.0):
+        self.db_path = db_path
+        self.max_idle = DB_POOL_SIZE if max_idle is None else max_idle
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_kb = SQLITE_CACHE_KB if cache_kb is None else cache_kb
+        self.mmap_mb = SQLITE_MMAP_MB if mmap_mb is None else mmap_mb
+        self.timeout = timeout
+        self.opened = 0
+        self.reused = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False,
+            factory=PooledConnection, cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        if self.cache_kb:
+            conn.execute(f"PRAGMA cache_size=-{self.cache_kb}")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_mb * 1024 * 1024}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn._pool = self
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def acquire(self):
+        """Check out a connection; close() it (or use connection()) to return it"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        with self._lock:
+            self.reused += 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            sqlite3.Connection.close(conn)
+            return
+        if self._idle.qsize() < self.max_idle:
+            self._idle.put(conn)
+        else:
+            sqlite3.Connection.close(conn)
+
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as conn: ... (returned to the pool afterwards)"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                sqlite3.Connection.close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def stats(self):
+        return {
+            'opened': self.opened,
+            'reused': self.reused,
+            'idle': self._idle.qsize(),
+            'journal_mode': self.journal_mode
+        }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path=None):
+    """Return the shared pool for a database file (resume_data.db by default)"""
+    if db_path is None:
+        db_path = get_database_path()
+    db_path = os.path.abspath(db_path)
+    if db_path not in _pools:
+        with _pools_lock:
+            if db_path not in _pools:
+                _pools[db_path] = ConnectionPool(db_path)
+    return _pools[db_path]
+
+
+def get_database_path():
+    """Path of resume_data.db"""
     # Get the directory of the current file (backend/app/config/database.py)
     # Go up 3 levels to reach backend/ (where main.py and resume_data.db should be)
-    # Adjust this if structure is different. STARTING POINT: backend/app/config/database.py
     # dirname -> backend/app/config
     # dirname -> backend/app
     # dirname -> backend
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    db_path = os.path.join(base_dir, 'resume_data.db')
-    conn = sqlite3.connect(db_path)
-    return conn
+    return os.path.join(base_dir, 'resume_data.db')
+
+
+def get_database_connection():
+    """Return a pooled database connection; close() hands it back to the pool"""
+    return get_connection_pool().acquire()
 
 def init_database():
-    """Initialize database tables"""
+    """Bring the database schema up to date (see migrations.py)"""
     conn = get_database_connection()
-    cursor = conn.cursor()
-    
-    # Create resume_data table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS resume_data (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        email TEXT NOT NULL,
-        phone TEXT NOT NULL,
-        linkedin TEXT,
-        github TEXT,
-        portfolio TEXT,
-        summary TEXT,
-        target_role TEXT,
-        target_category TEXT,
-        education TEXT,
-        experience TEXT,
-        projects TEXT,
-        skills TEXT,
-        template TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create resume_skills table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS resume_skills (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        resume_id INTEGER,
-        skill_name TEXT NOT NULL,
-        skill_category TEXT NOT NULL,
-        proficiency_score REAL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (resume_id) REFERENCES resume_data (id)
-    )
-    ''')
-    
-    # Create resume_analysis table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS resume_analysis (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        resume_id INTEGER,
-        ats_score REAL,
-        keyword_match_score REAL,
-        format_score REAL,
-        section_score REAL,
-        missing_skills TEXT,
-        recommendations TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (resume_id) REFERENCES resume_data (id)
-    )
-    ''')
-    
-    # Create admin_logs table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS admin_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        admin_email TEXT NOT NULL,
-        action TEXT NOT NULL,
-        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create admin table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS admin (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        email TEXT NOT NULL UNIQUE,
-        password TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
 
 def save_resume_data(data):
     """Save resume data to database"""
@@ -124,9 +192,12 @@ def save_resume_data(data):
             str(data.get('skills', [])),
             data.get('template', '')
         ))
+        resume_id = cursor.lastrowid
+        cursor.executemany(INSERT_SKILL, skill_rows(resume_id, data.get('skills', [])))
+        record_resume(conn, resume_id)
         
         conn.commit()
-        return cursor.lastrowid
+        return resume_id
     except Exception as e:
         print(f"Error saving resume data: {str(e)}")
         conn.rollback()
@@ -155,6 +226,7 @@ def save_analysis_data(resume_id, analysis):
             analysis.get('missing_skills', ''),
             analysis.get('recommendations', '')
         ))
+        record_analysis(conn, cursor.lastrowid)
         
         conn.commit()
     except Exception as e:
@@ -169,13 +241,14 @@ def get_resume_stats():
     cursor = conn.cursor()
     
     try:
-        # Get total resumes
-        cursor.execute('SELECT COUNT(*) FROM resume_data')
-        total_resumes = cursor.fetchone()[0]
-        
-        # Get average ATS score
-        cursor.execute('SELECT AVG(ats_score) FROM resume_analysis')
-        avg_ats_score = cursor.fetchone()[0] or 0
+        # Get total resumes and average ATS score from the daily rollups
+        cursor.execute('''
+        SELECT SUM(resumes), SUM(ats_score_sum) / NULLIF(SUM(analyses), 0)
+        FROM resume_daily_stats
+        ''')
+        total_resumes, avg_ats_score = cursor.fetchone()
+        total_resumes = total_resumes or 0
+        avg_ats_score = avg_ats_score or 0
         
         # Get recent activity
         cursor.execute('''
@@ -301,20 +374,7 @@ def save_ai_analysis_data(resume_id, analysis_data):
     cursor = conn.cursor()
     
     try:
-        # Check if the ai_analysis table exists
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ai_analysis (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                resume_id INTEGER,
-                model_used TEXT,
-                resume_score INTEGER,
-                job_role TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (resume_id) REFERENCES resume_data (id)
-            )
-        """)
-        
-        # Insert the analysis data
+        # The ai_analysis table is created by migration 2 (init_database)
         cursor.execute("""
             INSERT INTO ai_analysis (
                 resume_id, model_used, resume_score, job_role
@@ -325,9 +385,11 @@ def save_ai_analysis_data(resume_id, analysis_data):
             analysis_data.get('resume_score', 0),
             analysis_data.get('job_role', '')
         ))
+        analysis_id = cursor.lastrowid
+        record_ai_analysis(conn, analysis_id)
         
         conn.commit()
-        return cursor.lastrowid
+        return analysis_id
     except Exception as e:
         print(f"Error saving AI analysis data: {e}")
         conn.rollback()
@@ -354,27 +416,28 @@ def get_ai_analysis_stats():
                 "top_job_roles": []
             }
         
-        # Get total number of analyses
-        cursor.execute("SELECT COUNT(*) FROM ai_analysis")
-        total_analyses = cursor.fetchone()[0]
+        # Totals come from the daily rollups (see rollups.py)
+        cursor.execute("""
+            SELECT SUM(analyses), SUM(score_sum) / NULLIF(SUM(analyses), 0)
+            FROM ai_analysis_daily_stats
+        """)
+        total_analyses, average_score = cursor.fetchone()
+        total_analyses = total_analyses or 0
+        average_score = average_score or 0
         
         # Get model usage statistics
         cursor.execute("""
-            SELECT model_used, COUNT(*) as count
-            FROM ai_analysis
+            SELECT model_used, SUM(analyses) as count
+            FROM ai_analysis_daily_stats
             GROUP BY model_used
             ORDER BY count DESC
         """)
         model_usage = [{"model": row[0], "count": row[1]} for row in cursor.fetchall()]
         
-        # Get average resume score
-        cursor.execute("SELECT AVG(resume_score) FROM ai_analysis")
-        average_score = cursor.fetchone()[0] or 0
-        
         # Get top job roles
         cursor.execute("""
-            SELECT job_role, COUNT(*) as count
-            FROM ai_analysis
+            SELECT job_role, SUM(analyses) as count
+            FROM ai_analysis_daily_stats
             GROUP BY job_role
             ORDER BY count DESC
             LIMIT 5
@@ -420,27 +483,28 @@ def get_detailed_ai_analysis_stats():
                 "recent_analyses": []
             }
         
-        # Get total number of analyses
-        cursor.execute("SELECT COUNT(*) FROM ai_analysis")
-        total_analyses = cursor.fetchone()[0]
+        # Totals come from the daily rollups (see rollups.py)
+        cursor.execute("""
+            SELECT SUM(analyses), SUM(score_sum) / NULLIF(SUM(analyses), 0)
+            FROM ai_analysis_daily_stats
+        """)
+        total_analyses, average_score = cursor.fetchone()
+        total_analyses = total_analyses or 0
+        average_score = average_score or 0
         
         # Get model usage statistics
         cursor.execute("""
-            SELECT model_used, COUNT(*) as count
-            FROM ai_analysis
+            SELECT model_used, SUM(analyses) as count
+            FROM ai_analysis_daily_stats
             GROUP BY model_used
             ORDER BY count DESC
         """)
         model_usage = [{"model": row[0], "count": row[1]} for row in cursor.fetchall()]
         
-        # Get average resume score
-        cursor.execute("SELECT AVG(resume_score) FROM ai_analysis")
-        average_score = cursor.fetchone()[0] or 0
-        
         # Get top job roles
         cursor.execute("""
-            SELECT job_role, COUNT(*) as count
-            FROM ai_analysis
+            SELECT job_role, SUM(analyses) as count
+            FROM ai_analysis_daily_stats
             GROUP BY job_role
             ORDER BY count DESC
             LIMIT 5
@@ -449,32 +513,24 @@ def get_detailed_ai_analysis_stats():
         
         # Get daily trend for the last 7 days
         cursor.execute("""
-            SELECT DATE(created_at) as date, COUNT(*) as count
-            FROM ai_analysis
-            WHERE created_at >= date('now', '-7 days')
-            GROUP BY DATE(created_at)
+            SELECT day as date, SUM(analyses) as count
+            FROM ai_analysis_daily_stats
+            WHERE day >= date('now', '-7 days')
+            GROUP BY day
             ORDER BY date
         """)
         daily_trend = [{"date": row[0], "count": row[1]} for row in cursor.fetchall()]
         
-        # Get score distribution
-        score_ranges = [
-            {"min": 0, "max": 20, "range": "0-20"},
-            {"min": 21, "max": 40, "range": "21-40"},
-            {"min": 41, "max": 60, "range": "41-60"},
-            {"min": 61, "max": 80, "range": "61-80"},
-            {"min": 81, "max": 100, "range": "81-100"}
+        # Get score distribution from the rollup's histogram buckets
+        cursor.execute(f"""
+            SELECT {", ".join(f"TOTAL({column})" for column, _, _ in SCORE_BUCKETS)}
+            FROM ai_analysis_daily_stats
+        """)
+        score_distribution = [
+            {"range": f"{low}-{high}", "count": int(count)}
+            for (_, low, high), count in zip(SCORE_BUCKETS, cursor.fetchone())
         ]
         
-        score_distribution = []
-        for range_info in score_ranges:
-            cursor.execute("""
-                SELECT COUNT(*) FROM ai_analysis 
-                WHERE resume_score >= ? AND resume_score <= ?
-            """, (range_info["min"], range_info["max"]))
-            count = cursor.fetchone()[0]
-            score_distribution.append({"range": range_info["range"], "count": count})
-        
         # Get recent analyses
         cursor.execute("""
             SELECT model_used, resume_score, job_role, datetime(created_at) as date
@@ -530,6 +586,7 @@ def reset_ai_analysis_stats():
         
         # Delete all records from the ai_analysis table
         cursor.execute("DELETE FROM ai_analysis")
+        cursor.execute("DELETE FROM ai_analysis_daily_stats")
         conn.commit()
         
         return {"success": True, "message": "AI analysis statistics have been reset successfully"}
@@ -0,0 +1,376 @@
+"""
+Versioned schema migrations for resume_data.db.
+
+Each migration is (version, name, steps); a step is an SQL statement or a
+function taking the connection. Applied versions are recorded in
+schema_migrations, and each migration runs in its own write transaction, so
+it is applied exactly once even when several processes start together.
+Add new migrations to the end of MIGRATIONS with the next version number;
+never edit one that has shipped. Migrations hold their own SQL and code
+rather than calling the live helpers, so later changes to those helpers do
+not change what an old migration does.
+"""
+import ast
+import re
+
+
+def _create_base_tables():
+    # The tables init_database used to create; IF NOT EXISTS adopts databases
+    # created before migrations existed
+    return [
+        '''
+        CREATE TABLE IF NOT EXISTS resume_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            linkedin TEXT,
+            github TEXT,
+            portfolio TEXT,
+            summary TEXT,
+            target_role TEXT,
+            target_category TEXT,
+            education TEXT,
+            experience TEXT,
+            projects TEXT,
+            skills TEXT,
+            template TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS resume_skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id INTEGER,
+            skill_name TEXT NOT NULL,
+            skill_category TEXT NOT NULL,
+            proficiency_score REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (resume_id) REFERENCES resume_data (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS resume_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id INTEGER,
+            ats_score REAL,
+            keyword_match_score REAL,
+            format_score REAL,
+            section_score REAL,
+            missing_skills TEXT,
+            recommendations TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (resume_id) REFERENCES resume_data (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS admin_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            admin_email TEXT NOT NULL,
+            action TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS admin (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        '''
+    ]
+
+
+def _generation_triggers(tables):
+    return [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_generation
+        AFTER {event} ON {table}
+        BEGIN
+            UPDATE write_generation SET generation = generation + 1 WHERE id = 1;
+        END
+        '''
+        for table in tables
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ]
+
+
+# Migration 4: resume_skills backfill, frozen as of that migration (the live
+# version is app/config/resume_skills.py)
+_V4_SKILL_CATEGORIES = [
+    ('Programming', ['python', 'java', 'javascript', 'c++', 'programming']),
+    ('Database', ['sql', 'database', 'mongodb']),
+    ('Cloud', ['aws', 'cloud', 'azure']),
+    ('Management', ['agile', 'scrum', 'management'])
+]
+_V4_STRIP_CHARS = '[]{}"\' \t\n'
+_V4_DICT_KEY_PATTERN = re.compile(r"^\s*\{?\s*['\"]?\w+['\"]?\s*:\s*")
+
+
+def _v4_flatten(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _v4_flatten(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _v4_flatten(item)
+    elif isinstance(value, str):
+        yield from value.split(',')
+    elif value is not None:
+        yield str(value)
+
+
+def _v4_skill_rows(resume_id, skills):
+    try:
+        skills = ast.literal_eval(skills)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+    if isinstance(skills, str):
+        skills = [_V4_DICT_KEY_PATTERN.sub('', part) for part in skills.split(',')]
+
+    rows = []
+    seen = set()
+    for name in _v4_flatten(skills):
+        name = name.strip(_V4_STRIP_CHARS)
+        if not name or name.lower() in seen:
+            continue
+        seen.add(name.lower())
+        category = next(
+            (category for category, keywords in _V4_SKILL_CATEGORIES
+             if any(keyword in name.lower() for keyword in keywords)),
+            'Other'
+        )
+        rows.append((resume_id, name, category))
+    return rows
+
+
+def _v4_backfill_resume_skills(conn, batch_size=1000):
+    last_id = 0
+    while True:
+        rows = conn.execute('''
+        SELECT id, skills FROM resume_data rd
+        WHERE id > ? AND NOT EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = rd.id)
+        ORDER BY id
+        LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            return
+        skills = []
+        for resume_id, text in rows:
+            skills.extend(_v4_skill_rows(resume_id, text or ''))
+        conn.executemany(
+            'INSERT INTO resume_skills (resume_id, skill_name, skill_category) VALUES (?, ?, ?)', skills
+        )
+        last_id = rows[-1][0]
+
+
+# Migration 5: daily rollup tables and their initial fill, as of that
+# migration (the live queries are in app/config/rollups.py)
+_V5_ROLLUPS = [
+    '''
+    CREATE TABLE IF NOT EXISTS resume_daily_stats (
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        resumes INTEGER NOT NULL DEFAULT 0,
+        analyses INTEGER NOT NULL DEFAULT 0,
+        ats_score_sum REAL NOT NULL DEFAULT 0,
+        keyword_score_sum REAL NOT NULL DEFAULT 0,
+        high_scoring INTEGER NOT NULL DEFAULT 0,
+        high_scoring_resumes INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, category)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS ai_analysis_daily_stats (
+        day TEXT NOT NULL,
+        model_used TEXT NOT NULL,
+        job_role TEXT NOT NULL,
+        analyses INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_0_20 INTEGER NOT NULL DEFAULT 0,
+        score_21_40 INTEGER NOT NULL DEFAULT 0,
+        score_41_60 INTEGER NOT NULL DEFAULT 0,
+        score_61_80 INTEGER NOT NULL DEFAULT 0,
+        score_81_100 INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, model_used, job_role)
+    ) WITHOUT ROWID
+    ''',
+    'DELETE FROM resume_daily_stats',
+    'DELETE FROM ai_analysis_daily_stats',
+    '''
+    INSERT INTO resume_daily_stats (day, category, resumes)
+    SELECT DATE(created_at), COALESCE(target_category, 'Other'), COUNT(*)
+    FROM resume_data
+    WHERE 1
+    GROUP BY 1, 2
+    ON CONFLICT (day, category) DO UPDATE SET resumes = resumes + excluded.resumes
+    ''',
+    # An analysis counts under its resume's day and category; a resume is
+    # high-scoring once, at its first analysis scoring 70 or more
+    '''
+    INSERT INTO resume_daily_stats (
+        day, category, analyses, ats_score_sum, keyword_score_sum, high_scoring, high_scoring_resumes
+    )
+    SELECT
+        COALESCE(DATE(rd.created_at), DATE(ra.created_at)),
+        COALESCE(rd.target_category, 'Other'),
+        COUNT(*),
+        TOTAL(ra.ats_score),
+        TOTAL(ra.keyword_match_score),
+        TOTAL(ra.ats_score >= 70),
+        TOTAL(ra.ats_score >= 70 AND rd.id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM resume_analysis earlier
+            WHERE earlier.resume_id = ra.resume_id
+            AND earlier.ats_score >= 70
+            AND earlier.id < ra.id
+        ))
+    FROM resume_analysis ra
+    LEFT JOIN resume_data rd ON rd.id = ra.resume_id
+    WHERE 1
+    GROUP BY 1, 2
+    ON CONFLICT (day, category) DO UPDATE SET
+        analyses = analyses + excluded.analyses,
+        ats_score_sum = ats_score_sum + excluded.ats_score_sum,
+        keyword_score_sum = keyword_score_sum + excluded.keyword_score_sum,
+        high_scoring = high_scoring + excluded.high_scoring,
+        high_scoring_resumes = high_scoring_resumes + excluded.high_scoring_resumes
+    ''',
+    '''
+    INSERT INTO ai_analysis_daily_stats (
+        day, model_used, job_role, analyses, score_sum,
+        score_0_20, score_21_40, score_41_60, score_61_80, score_81_100
+    )
+    SELECT
+        DATE(created_at),
+        COALESCE(model_used, ''),
+        COALESCE(job_role, ''),
+        COUNT(*),
+        TOTAL(resume_score),
+        TOTAL(resume_score BETWEEN 0 AND 20),
+        TOTAL(resume_score BETWEEN 21 AND 40),
+        TOTAL(resume_score BETWEEN 41 AND 60),
+        TOTAL(resume_score BETWEEN 61 AND 80),
+        TOTAL(resume_score BETWEEN 81 AND 100)
+    FROM ai_analysis
+    WHERE 1
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, model_used, job_role) DO UPDATE SET
+        analyses = analyses + excluded.analyses,
+        score_sum = score_sum + excluded.score_sum,
+        score_0_20 = score_0_20 + excluded.score_0_20,
+        score_21_40 = score_21_40 + excluded.score_21_40,
+        score_41_60 = score_41_60 + excluded.score_41_60,
+        score_61_80 = score_61_80 + excluded.score_61_80,
+        score_81_100 = score_81_100 + excluded.score_81_100
+    '''
+]
+
+
+MIGRATIONS = [
+    (1, "Base tables", _create_base_tables()),
+    (2, "AI analysis table", [
+        '''
+        CREATE TABLE IF NOT EXISTS ai_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id INTEGER,
+            model_used TEXT,
+            resume_score INTEGER,
+            job_role TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (resume_id) REFERENCES resume_data (id)
+        )
+        '''
+    ]),
+    # Covering indexes for the dashboard and AI analytics queries: each one
+    # holds every column its query reads, so those queries never touch the
+    # table rows
+    (3, "Dashboard indexes", [
+        # Date-range counts, recent activity, "latest first" listings
+        'CREATE INDEX IF NOT EXISTS idx_resume_data_created_at ON resume_data (created_at, target_category)',
+        # Per-category counts
+        'CREATE INDEX IF NOT EXISTS idx_resume_data_target_category ON resume_data (target_category)',
+        # resume_data JOIN resume_analysis, with the scores the dashboard averages
+        'CREATE INDEX IF NOT EXISTS idx_resume_analysis_resume_id '
+        'ON resume_analysis (resume_id, ats_score, keyword_match_score)',
+        # Score averages before/after a date
+        'CREATE INDEX IF NOT EXISTS idx_resume_analysis_created_at ON resume_analysis (created_at, ats_score)',
+        # Overall average and "ats_score >= 70" counts
+        'CREATE INDEX IF NOT EXISTS idx_resume_analysis_ats_score ON resume_analysis (ats_score)',
+        'CREATE INDEX IF NOT EXISTS idx_ai_analysis_created_at '
+        'ON ai_analysis (created_at, model_used, resume_score, job_role)',
+        'CREATE INDEX IF NOT EXISTS idx_ai_analysis_resume_id ON ai_analysis (resume_id)',
+        'CREATE INDEX IF NOT EXISTS idx_ai_analysis_model_used ON ai_analysis (model_used)',
+        'CREATE INDEX IF NOT EXISTS idx_ai_analysis_job_role ON ai_analysis (job_role)',
+        # Score averages and the score distribution ranges
+        'CREATE INDEX IF NOT EXISTS idx_ai_analysis_resume_score ON ai_analysis (resume_score)',
+        'ANALYZE'
+    ]),
+    (4, "Normalized resume skills", [
+        'CREATE INDEX IF NOT EXISTS idx_resume_skills_resume_id ON resume_skills (resume_id)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_skills_category ON resume_skills (skill_category)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_skills_name ON resume_skills (skill_name)',
+        _v4_backfill_resume_skills,
+        'ANALYZE resume_skills'
+    ]),
+    (5, "Dashboard daily rollups", _V5_ROLLUPS),
+    # Bumped by every write to the tables the dashboard reads, so cached
+    # query results can tell when they are stale (see dashboard/query_cache.py)
+    (6, "Write generation counter", [
+        '''
+        CREATE TABLE IF NOT EXISTS write_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL
+        )
+        ''',
+        'INSERT OR IGNORE INTO write_generation (id, generation) VALUES (1, 0)'
+    ] + _generation_triggers(['resume_data', 'resume_analysis', 'resume_skills', 'ai_analysis']))
+]
+
+
+def _ensure_migrations_table(conn):
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    conn.commit()
+
+
+def get_schema_version(conn):
+    """Highest applied migration version (0 for a new database)"""
+    _ensure_migrations_table(conn)
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations').fetchone()[0]
+
+
+def migrate(conn, migrations=None):
+    """Apply every migration newer than the database; returns the versions applied"""
+    migrations = MIGRATIONS if migrations is None else migrations
+    latest = migrations[-1][0] if migrations else 0
+    if get_schema_version(conn) >= latest:
+        return []
+
+    applied = []
+    for version, name, steps in migrations:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Re-checked under the write lock: another process may have got here first
+            if conn.execute('SELECT 1 FROM schema_migrations WHERE version = ?', (version,)).fetchone():
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute('INSERT INTO schema_migrations (version, name) VALUES (?, ?)', (version, name))
+            conn.commit()
+            applied.append(version)
+            print(f"Applied database migration {version}: {name}")
+        except Exception as e:
+            conn.rollback()
+            print(f"Error applying database migration {version} ({name}): {str(e)}")
+            raise
+    return applied
@@ -0,0 +1,136 @@
+"""
+Normalized resume skills.
+
+save_resume_data writes one resume_skills row per skill, with its category,
+in the same transaction as the resume, so the dashboard's skill charts are a
+GROUP BY over an index instead of splitting resume_data.skills text on every
+render. backfill_resume_skills fills the table for resumes saved before
+that; migration 4 ran a frozen copy of it once.
+
+Usage (from backend/), to re-run the backfill by hand:
+    python -m app.config.resume_skills [--rebuild]
+"""
+import argparse
+import ast
+import re
+
+
+# Checked in order, first match wins; the categories the dashboard has always
+# charted (substring matches, as the old LIKE '%python%' chains did)
+SKILL_CATEGORIES = [
+    ('Programming', ['python', 'java', 'javascript', 'c++', 'programming']),
+    ('Database', ['sql', 'database', 'mongodb']),
+    ('Cloud', ['aws', 'cloud', 'azure']),
+    ('Management', ['agile', 'scrum', 'management'])
+]
+DEFAULT_SKILL_CATEGORY = 'Other'
+
+STRIP_CHARS = '[]{}"\' \t\n'
+DICT_KEY_PATTERN = re.compile(r"^\s*\{?\s*['\"]?\w+['\"]?\s*:\s*")
+
+INSERT_SKILL = '''
+INSERT INTO resume_skills (resume_id, skill_name, skill_category)
+VALUES (?, ?, ?)
+'''
+
+
+def categorize_skill(skill):
+    """Dashboard category of a skill name"""
+    skill = skill.lower()
+    for category, keywords in SKILL_CATEGORIES:
+        if any(keyword in skill for keyword in keywords):
+            return category
+    return DEFAULT_SKILL_CATEGORY
+
+
+def _flatten(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _flatten(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _flatten(item)
+    elif isinstance(value, str):
+        yield from value.split(',')
+    elif value is not None:
+        yield str(value)
+
+
+def parse_skills(skills):
+    """Skill names from a skills value: a list, a {category: [skills]} dict
+    (the resume builder), a comma-separated string, or the str() of any of
+    these as stored in resume_data.skills. De-duplicated case-insensitively,
+    in order."""
+    if isinstance(skills, str):
+        try:
+            skills = ast.literal_eval(skills)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            pass
+    if isinstance(skills, str):
+        # Unparseable text (e.g. truncated): split it the way the old query did
+        skills = [DICT_KEY_PATTERN.sub('', part) for part in skills.split(',')]
+
+    names = []
+    seen = set()
+    for name in _flatten(skills):
+        name = name.strip(STRIP_CHARS)
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def skill_rows(resume_id, skills):
+    """resume_skills rows (resume_id, skill_name, skill_category) for a resume"""
+    return [(resume_id, name, categorize_skill(name)) for name in parse_skills(skills)]
+
+
+def backfill_resume_skills(conn, batch_size=1000):
+    """Write resume_skills rows for every resume that has none.
+
+    Runs on the caller's connection and leaves committing to the caller.
+    Returns the number of resumes processed.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute('''
+        SELECT id, skills FROM resume_data rd
+        WHERE id > ? AND NOT EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = rd.id)
+        ORDER BY id
+        LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            return processed
+        skills = []
+        for resume_id, text in rows:
+            skills.extend(skill_rows(resume_id, text or ''))
+        conn.executemany(INSERT_SKILL, skills)
+        processed += len(rows)
+        last_id = rows[-1][0]
+
+
+def main():
+    from .database import get_database_connection
+
+    parser = argparse.ArgumentParser(description="Backfill resume_skills from resume_data.skills")
+    parser.add_argument('--rebuild', action='store_true', help="Delete and rewrite every resume's skills")
+    args = parser.parse_args()
+
+    conn = get_database_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        if args.rebuild:
+            conn.execute('DELETE FROM resume_skills')
+        processed = backfill_resume_skills(conn)
+        conn.commit()
+        print(f"Backfilled skills for {processed} resumes")
+    except Exception as e:
+        conn.rollback()
+        print(f"Error backfilling resume skills: {str(e)}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
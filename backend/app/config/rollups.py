@@ -0,0 +1,159 @@
+"""
+Daily rollups of resume and AI analysis statistics.
+
+resume_daily_stats holds, per day and target category, the number of
+resumes and analyses, score sums and high-scoring counts; ai_analysis_daily_stats
+holds, per day, model and job role, the number of AI analyses, their score
+sum and the score histogram. The save_* functions in database.py update them
+in the same transaction as each insert, so the dashboard reads O(days) rows
+instead of aggregating every resume.
+
+Incremental updates and rebuild_rollups use the same queries (one row vs all
+rows), so the two always agree. Analyses are counted under their resume's
+day and category, as the dashboard's joins did; a resume is high-scoring
+once, at its first analysis with an ATS score of 70 or more.
+
+Usage (from backend/), to rebuild from the base tables:
+    python -m app.config.rollups
+"""
+
+# ATS score at which the dashboard counts a resume as high-scoring
+HIGH_SCORE_THRESHOLD = 70
+# AI analysis score histogram buckets: (column, min, max), inclusive
+SCORE_BUCKETS = [
+    ('score_0_20', 0, 20),
+    ('score_21_40', 21, 40),
+    ('score_41_60', 41, 60),
+    ('score_61_80', 61, 80),
+    ('score_81_100', 81, 100)
+]
+
+CREATE_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS resume_daily_stats (
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        resumes INTEGER NOT NULL DEFAULT 0,
+        analyses INTEGER NOT NULL DEFAULT 0,
+        ats_score_sum REAL NOT NULL DEFAULT 0,
+        keyword_score_sum REAL NOT NULL DEFAULT 0,
+        high_scoring INTEGER NOT NULL DEFAULT 0,
+        high_scoring_resumes INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, category)
+    ) WITHOUT ROWID
+    ''',
+    f'''
+    CREATE TABLE IF NOT EXISTS ai_analysis_daily_stats (
+        day TEXT NOT NULL,
+        model_used TEXT NOT NULL,
+        job_role TEXT NOT NULL,
+        analyses INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        {", ".join(f"{column} INTEGER NOT NULL DEFAULT 0" for column, _, _ in SCORE_BUCKETS)},
+        PRIMARY KEY (day, model_used, job_role)
+    ) WITHOUT ROWID
+    '''
+]
+
+
+def _upsert(table, key_columns, columns):
+    """ON CONFLICT clause adding the new row's counters to an existing row"""
+    updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in columns)
+    return f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+
+
+# {where} selects the rows to add: one new row, or "1" for a rebuild. The
+# WHERE clause also keeps SQLite from parsing ON CONFLICT as a join constraint.
+RESUME_ROLLUP = '''
+INSERT INTO resume_daily_stats (day, category, resumes)
+SELECT DATE(created_at), COALESCE(target_category, 'Other'), COUNT(*)
+FROM resume_data
+WHERE {where}
+GROUP BY 1, 2
+''' + _upsert('resume_daily_stats', ['day', 'category'], ['resumes'])
+
+ANALYSIS_COLUMNS = ['analyses', 'ats_score_sum', 'keyword_score_sum', 'high_scoring', 'high_scoring_resumes']
+ANALYSIS_ROLLUP = f'''
+INSERT INTO resume_daily_stats (day, category, {", ".join(ANALYSIS_COLUMNS)})
+SELECT
+    COALESCE(DATE(rd.created_at), DATE(ra.created_at)),
+    COALESCE(rd.target_category, 'Other'),
+    COUNT(*),
+    TOTAL(ra.ats_score),
+    TOTAL(ra.keyword_match_score),
+    TOTAL(ra.ats_score >= {HIGH_SCORE_THRESHOLD}),
+    TOTAL(ra.ats_score >= {HIGH_SCORE_THRESHOLD} AND rd.id IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM resume_analysis earlier
+        WHERE earlier.resume_id = ra.resume_id
+        AND earlier.ats_score >= {HIGH_SCORE_THRESHOLD}
+        AND earlier.id < ra.id
+    ))
+FROM resume_analysis ra
+LEFT JOIN resume_data rd ON rd.id = ra.resume_id
+WHERE {{where}}
+GROUP BY 1, 2
+''' + _upsert('resume_daily_stats', ['day', 'category'], ANALYSIS_COLUMNS)
+
+AI_ANALYSIS_COLUMNS = ['analyses', 'score_sum'] + [column for column, _, _ in SCORE_BUCKETS]
+AI_ANALYSIS_ROLLUP = f'''
+INSERT INTO ai_analysis_daily_stats (day, model_used, job_role, {", ".join(AI_ANALYSIS_COLUMNS)})
+SELECT
+    DATE(created_at),
+    COALESCE(model_used, ''),
+    COALESCE(job_role, ''),
+    COUNT(*),
+    TOTAL(resume_score),
+    {", ".join(f"TOTAL(resume_score BETWEEN {low} AND {high})" for _, low, high in SCORE_BUCKETS)}
+FROM ai_analysis
+WHERE {{where}}
+GROUP BY 1, 2, 3
+''' + _upsert('ai_analysis_daily_stats', ['day', 'model_used', 'job_role'], AI_ANALYSIS_COLUMNS)
+
+
+def record_resume(conn, resume_id):
+    """Add a newly inserted resume_data row to the rollups"""
+    conn.execute(RESUME_ROLLUP.format(where='id = ?'), (resume_id,))
+
+
+def record_analysis(conn, analysis_id):
+    """Add a newly inserted resume_analysis row to the rollups"""
+    conn.execute(ANALYSIS_ROLLUP.format(where='ra.id = ?'), (analysis_id,))
+
+
+def record_ai_analysis(conn, ai_analysis_id):
+    """Add a newly inserted ai_analysis row to the rollups"""
+    conn.execute(AI_ANALYSIS_ROLLUP.format(where='id = ?'), (ai_analysis_id,))
+
+
+def rebuild_rollups(conn):
+    """Recompute every rollup from the base tables.
+
+    Runs on the caller's connection and leaves committing to the caller.
+    """
+    for statement in CREATE_TABLES:
+        conn.execute(statement)
+    conn.execute('DELETE FROM resume_daily_stats')
+    conn.execute('DELETE FROM ai_analysis_daily_stats')
+    conn.execute(RESUME_ROLLUP.format(where='1'))
+    conn.execute(ANALYSIS_ROLLUP.format(where='1'))
+    conn.execute(AI_ANALYSIS_ROLLUP.format(where='1'))
+
+
+def main():
+    from .database import get_database_connection
+
+    conn = get_database_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        rebuild_rollups(conn)
+        conn.commit()
+        print("Rebuilt dashboard rollups")
+    except Exception as e:
+        conn.rollback()
+        print(f"Error rebuilding dashboard rollups: {str(e)}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# Alternate spellings for skills listed in JOB_ROLES, keyed by the lowercase
+# skill name. A skill counts as found if the skill itself or any alias occurs.
+# Only other names for the same skill belong here, not related skills (MySQL
+# is not evidence of SQL knowledge in general, Keras is not TensorFlow).
+SKILL_ALIASES = {
+    # Languages and frameworks
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "python": ["python3"],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "node.js": ["nodejs", "node"],
+    "vue.js": ["vue", "vuejs"],
+    "react": ["reactjs", "react.js"],
+    "react native": ["react-native"],
+    "angular": ["angularjs", "angular.js"],
+    "html": ["html5"],
+    "css": ["css3"],
+    "pytorch": ["torch"],
+
+    # Data and machine learning
+    "machine learning": ["ml"],
+    "statistics": ["statistical analysis"],
+    "data visualization": ["data visualisation"],
+    "databases": ["database", "dbms"],
+    "excel": ["ms excel", "microsoft excel"],
+    "mlops": ["ml ops"],
+
+    # Cloud and operations
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "kubernetes": ["k8s"],
+    "ci/cd": ["cicd", "continuous integration/continuous delivery", "continuous integration/continuous deployment"],
+    "infrastructure as code": ["iac"],
+    "devops": ["dev ops"],
+
+    # APIs and architecture
+    "apis": ["api"],
+    "restful apis": ["rest api", "rest apis", "restful", "restful api"],
+
+    # Design
+    "ui/ux": ["ux/ui"],
+    "mobile ui/ux": ["mobile ux/ui"],
+    "usability testing": ["user testing"],
+    "wireframing": ["wireframes", "wireframe"],
+    "prototyping": ["prototypes", "prototype"],
+
+    # Management
+    "agile": ["agile methodologies"],
+    "user stories": ["user story"],
+    "roadmapping": ["roadmaps", "roadmap"],
+
+    # Combined entries in recommended_skills, found when any part occurs
+    "python/java/node.js": ["python", "java", "node.js", "nodejs"],
+    "react/angular/vue": ["react", "angular", "vue", "vue.js"],
+    "tableau/power bi": ["tableau", "power bi"],
+    "ios/android development": ["ios", "android"],
+}
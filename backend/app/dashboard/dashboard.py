@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from ..config.database import get_database_connection
+from .query_cache import cached_query, get_dashboard_cache
 import io
 import uuid
 from plotly.subplots import make_subplots
@@ -109,6 +110,7 @@ class DashboardManager:
             </style>
         """, unsafe_allow_html=True)
 
+    @cached_query('resume_metrics')
     def get_resume_metrics(self):
         """Get resume-related metrics from database"""
         cursor = self.conn.cursor()
@@ -119,7 +121,7 @@ class DashboardManager:
         start_of_week = now - timedelta(days=now.weekday())
         start_of_month = now.replace(day=1)
         
-        # Fetch metrics for different time periods
+        # Fetch metrics for different time periods from the daily rollups
         metrics = {}
         for period, start_date in [
             ('Today', start_of_day),
@@ -129,14 +131,13 @@ class DashboardManager:
         ]:
             cursor.execute("""
                 SELECT 
-                    COUNT(DISTINCT rd.id) as total_resumes,
-                    ROUND(AVG(ra.ats_score), 1) as avg_ats_score,
-                    ROUND(AVG(ra.keyword_match_score), 1) as avg_keyword_score,
-                    COUNT(DISTINCT CASE WHEN ra.ats_score >= 70 THEN rd.id END) as high_scoring
-                FROM resume_data rd
-                LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
-                WHERE rd.created_at >= ?
-            """, (start_date.strftime('%Y-%m-%d %H:%M:%S'),))
+                    SUM(resumes) as total_resumes,
+                    ROUND(SUM(ats_score_sum) / NULLIF(SUM(analyses), 0), 1) as avg_ats_score,
+                    ROUND(SUM(keyword_score_sum) / NULLIF(SUM(analyses), 0), 1) as avg_keyword_score,
+                    SUM(high_scoring_resumes) as high_scoring
+                FROM resume_daily_stats
+                WHERE day >= ?
+            """, (start_date.strftime('%Y-%m-%d'),))
             
             row = cursor.fetchone()
             if row:
@@ -156,41 +157,14 @@ class DashboardManager:
         
         return metrics
 
+    @cached_query('skill_distribution')
     def get_skill_distribution(self):
         """Get skill distribution data"""
         cursor = self.conn.cursor()
         cursor.execute("""
-            WITH RECURSIVE split(skill, rest) AS (
-                SELECT '', skills || ','
-                FROM resume_data
-                UNION ALL
-                SELECT
-                    substr(rest, 0, instr(rest, ',')),
-                    substr(rest, instr(rest, ',') + 1)
-                FROM split
-                WHERE rest <> ''
-            ),
-            SkillCategories AS (
-                SELECT 
-                    CASE 
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%python%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%java%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%javascript%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%c++%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%programming%' THEN 'Programming'
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%sql%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%database%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%mongodb%' THEN 'Database'
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%aws%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%cloud%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%azure%' THEN 'Cloud'
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%agile%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%scrum%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%management%' THEN 'Management'
-                        ELSE 'Other'
-                    END as category,
-                    COUNT(*) as count
-                FROM split
-                WHERE skill <> ''
-                GROUP BY category
-            )
-            SELECT category, count
-            FROM SkillCategories
+            SELECT skill_category as category, COUNT(*) as count
+            FROM resume_skills
+            GROUP BY skill_category
             ORDER BY count DESC
         """)
         
@@ -201,34 +175,36 @@ class DashboardManager:
             
         return categories, counts
 
+    @cached_query('weekly_trends')
     def get_weekly_trends(self):
         """Get weekly submission trends"""
         cursor = self.conn.cursor()
         now = datetime.now()
         dates = [(now - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(6, -1, -1)]
         
-        submissions = []
-        for date in dates:
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM resume_data 
-                WHERE DATE(created_at) = DATE(?)
-            """, (date,))
-            submissions.append(cursor.fetchone()[0])
+        cursor.execute("""
+            SELECT day, SUM(resumes)
+            FROM resume_daily_stats
+            WHERE day >= ? AND day <= ?
+            GROUP BY day
+        """, (dates[0], dates[-1]))
+        counts = dict(cursor.fetchall())
+        submissions = [counts.get(date, 0) for date in dates]
             
         return [d[-3:] for d in dates], submissions  # Return shortened date format (e.g., 'Mon', 'Tue')
 
+    @cached_query('job_category_stats')
     def get_job_category_stats(self):
         """Get statistics by job category"""
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT 
-                COALESCE(target_category, 'Other') as category,
-                COUNT(*) as count,
-                ROUND(AVG(CASE WHEN ra.ats_score >= 70 THEN 1 ELSE 0 END) * 100, 1) as success_rate
-            FROM resume_data rd
-            LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
+                category,
+                SUM(resumes) as count,
+                ROUND(SUM(high_scoring_resumes) * 100.0 / NULLIF(SUM(resumes), 0), 1) as success_rate
+            FROM resume_daily_stats
             GROUP BY category
+            HAVING count > 0
             ORDER BY count DESC
             LIMIT 5
         """)
@@ -296,6 +272,15 @@ class DashboardManager:
             - Storage Used: {stats['storage_size']}
         """)
 
+        # Query Cache Stats
+        st.sidebar.markdown("### ⚡ Query Cache")
+        cache_stats = get_dashboard_cache().stats()
+        st.sidebar.markdown(f"""
+            - Hit Rate: {cache_stats['hit_rate']:.1%}
+            - Hits / Misses: {cache_stats['hits']} / {cache_stats['misses']}
+            - Cached Queries: {cache_stats['entries']}
+        """)
+
     def get_resume_data(self):
         """Get all resume data"""
         cursor = self.conn.cursor()
@@ -564,22 +549,22 @@ class DashboardManager:
             st.error(f"Error exporting to JSON: {str(e)}")
             return None
 
+    @cached_query('database_stats')
     def get_database_stats(self):
         """Get database statistics"""
         cursor = self.conn.cursor()
         stats = {}
         
-        # Total resumes
-        cursor.execute("SELECT COUNT(*) FROM resume_data")
-        stats['total_resumes'] = cursor.fetchone()[0]
-        
-        # Today's submissions
+        # Total resumes and today's submissions
         cursor.execute("""
-            SELECT COUNT(*) 
-            FROM resume_data 
-            WHERE DATE(created_at) = DATE('now')
+            SELECT
+                TOTAL(resumes),
+                TOTAL(CASE WHEN day = DATE('now') THEN resumes END)
+            FROM resume_daily_stats
         """)
-        stats['today_submissions'] = cursor.fetchone()[0]
+        total_resumes, today_submissions = cursor.fetchone()
+        stats['total_resumes'] = int(total_resumes)
+        stats['today_submissions'] = int(today_submissions)
         
         # Database size (approximate)
         cursor.execute("PRAGMA page_count")
@@ -842,6 +827,7 @@ class DashboardManager:
         if st.session_state.get('is_admin', False):
             self.render_admin_section()
 
+    @cached_query('trend_indicators')
     def get_trend_indicators(self):
         """Get trend indicators for stats"""
         cursor = self.conn.cursor()
@@ -853,32 +839,22 @@ class DashboardManager:
                 if metric == 'resumes':
                     cursor.execute("""
                         SELECT 
-                            (COUNT(*) - (
-                                SELECT COUNT(*) 
-                                FROM resume_data 
-                                WHERE created_at < date('now', '-7 days')
-                            )) * 100.0 / 
-                            NULLIF((
-                                SELECT COUNT(*) 
-                                FROM resume_data 
-                                WHERE created_at < date('now', '-7 days')
-                            ), 0)
-                        FROM resume_data
+                            (total.resumes - old.resumes) * 100.0 / NULLIF(old.resumes, 0)
+                        FROM
+                            (SELECT SUM(resumes) as resumes FROM resume_daily_stats) total,
+                            (SELECT SUM(resumes) as resumes FROM resume_daily_stats
+                             WHERE day < date('now', '-7 days')) old
                     """)
                 elif metric == 'ats':
                     cursor.execute("""
                         SELECT 
-                            (AVG(ats_score) - (
-                                SELECT AVG(ats_score) 
-                                FROM resume_analysis 
-                                WHERE created_at < date('now', '-7 days')
-                            )) * 100.0 / 
-                            NULLIF((
-                                SELECT AVG(ats_score) 
-                                FROM resume_analysis 
-                                WHERE created_at < date('now', '-7 days')
-                            ), 0)
-                        FROM resume_analysis
+                            (total.avg_score - old.avg_score) * 100.0 / NULLIF(old.avg_score, 0)
+                        FROM
+                            (SELECT SUM(ats_score_sum) / NULLIF(SUM(analyses), 0) as avg_score
+                             FROM resume_daily_stats) total,
+                            (SELECT SUM(ats_score_sum) / NULLIF(SUM(analyses), 0) as avg_score
+                             FROM resume_daily_stats
+                             WHERE day < date('now', '-7 days')) old
                     """)
                 
                 change = cursor.fetchone()[0] or 0
@@ -896,6 +872,7 @@ class DashboardManager:
         
         return indicators
 
+    @cached_query('detailed_insights')
     def get_detailed_insights(self):
         """Get detailed insights from the database"""
         cursor = self.conn.cursor()
@@ -903,11 +880,11 @@ class DashboardManager:
         
         # Most Successful Job Category
         cursor.execute("""
-            SELECT target_category, AVG(ats_score) as avg_score,
-                   COUNT(*) as submission_count
-            FROM resume_data rd
-            JOIN resume_analysis ra ON rd.id = ra.resume_id
-            GROUP BY target_category
+            SELECT category, SUM(ats_score_sum) / SUM(analyses) as avg_score,
+                   SUM(analyses) as submission_count
+            FROM resume_daily_stats
+            GROUP BY category
+            HAVING submission_count > 0
             ORDER BY avg_score DESC
             LIMIT 1
         """)
@@ -925,10 +902,11 @@ class DashboardManager:
         # Recent Improvement
         cursor.execute("""
             SELECT 
-                (SELECT AVG(ats_score) FROM resume_analysis 
-                 WHERE created_at >= date('now', '-7 days')) as recent_score,
-                (SELECT AVG(ats_score) FROM resume_analysis 
-                 WHERE created_at < date('now', '-7 days')) as old_score
+                SUM(CASE WHEN day >= date('now', '-7 days') THEN ats_score_sum END) /
+                    NULLIF(SUM(CASE WHEN day >= date('now', '-7 days') THEN analyses END), 0) as recent_score,
+                SUM(CASE WHEN day < date('now', '-7 days') THEN ats_score_sum END) /
+                    NULLIF(SUM(CASE WHEN day < date('now', '-7 days') THEN analyses END), 0) as old_score
+            FROM resume_daily_stats
         """)
         scores = cursor.fetchone()
         if scores and scores[0] and scores[1]:
@@ -944,26 +922,9 @@ class DashboardManager:
         
         # Most Common Skills
         cursor.execute("""
-            WITH RECURSIVE
-            split(skill, rest) AS (
-                SELECT '', skills || ',' 
-                FROM resume_data 
-                WHERE skills IS NOT NULL
-                UNION ALL
-                SELECT
-                    substr(rest, 0, instr(rest, ',')),
-                    substr(rest, instr(rest, ',') + 1)
-                FROM split 
-                WHERE rest <> ''
-            ),
-            cleaned_skills AS (
-                SELECT TRIM(REPLACE(REPLACE(skill, '[', ''), ']', '')) as skill
-                FROM split 
-                WHERE skill <> ''
-            )
-            SELECT skill, COUNT(*) as count
-            FROM cleaned_skills
-            GROUP BY skill
+            SELECT skill_name as skill, COUNT(*) as count
+            FROM resume_skills
+            GROUP BY skill_name
             ORDER BY count DESC
             LIMIT 3
         """)
@@ -981,21 +942,23 @@ class DashboardManager:
         
         return insights
 
+    @cached_query('quick_stats')
     def get_quick_stats(self):
         """Get quick statistics for the dashboard"""
         cursor = self.conn.cursor()
         
-        # Total Resumes
-        cursor.execute("SELECT COUNT(*) FROM resume_data")
-        total_resumes = cursor.fetchone()[0]
-        
-        # Average ATS Score
-        cursor.execute("SELECT AVG(ats_score) FROM resume_analysis")
-        avg_ats = cursor.fetchone()[0] or 0
-        
-        # High Performing Resumes
-        cursor.execute("SELECT COUNT(*) FROM resume_analysis WHERE ats_score >= 70")
-        high_performing = cursor.fetchone()[0]
+        # Total Resumes, Average ATS Score and High Performing Resumes
+        cursor.execute("""
+            SELECT
+                TOTAL(resumes),
+                SUM(ats_score_sum) / NULLIF(SUM(analyses), 0),
+                TOTAL(high_scoring)
+            FROM resume_daily_stats
+        """)
+        total_resumes, avg_ats, high_performing = cursor.fetchone()
+        total_resumes = int(total_resumes)
+        avg_ats = avg_ats or 0
+        high_performing = int(high_performing)
         
         # Success Rate
         success_rate = (high_performing / total_resumes * 100) if total_resumes > 0 else 0
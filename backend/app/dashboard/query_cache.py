@@ -0,0 +1,153 @@
+import copy
+import functools
+import os
+import threading
+import time
+
+from ..config.database import get_database_connection
+
+
+# Seconds a cached result stays valid when nothing is written. Writes
+# invalidate everything sooner; the TTL bounds how stale a result that
+# depends on the date ("today", "last 7 days") can get.
+DASHBOARD_CACHE_TTLS = {
+    'resume_metrics': 60,
+    'database_stats': 60,
+    'quick_stats': 300,
+    'trend_indicators': 300,
+    'weekly_trends': 300,
+    'detailed_insights': 300,
+    'skill_distribution': 600,
+    'job_category_stats': 600
+}
+DEFAULT_CACHE_TTL = 60
+# How often the database's write generation is re-read; a write shows up on
+# the dashboard at most this much later
+GENERATION_CHECK_SECONDS = 1.0
+
+
+class DashboardQueryCache:
+    """Process-wide cache of dashboard query results.
+
+    Shared by every Streamlit session, so reruns and concurrent admins reuse
+    one result per query instead of re-querying. Each result is tagged with
+    the database's write generation (a counter the triggers from migration 6
+    bump on every insert, update or delete) and is recomputed once the
+    generation moves or its TTL runs out. A result being computed is waited
+    on rather than computed again by other sessions. Set
+    DASHBOARD_CACHE_DISABLED=1 to turn the cache off.
+    """
+
+    def __init__(self, ttls=None, enabled=None, generation_check_seconds=None):
+        if enabled is None:
+            enabled = os.getenv("DASHBOARD_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+        self.ttls = DASHBOARD_CACHE_TTLS if ttls is None else ttls
+        self.enabled = enabled
+        self.generation_check_seconds = (
+            GENERATION_CHECK_SECONDS if generation_check_seconds is None else generation_check_seconds
+        )
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # name -> (value, generation, stored_at)
+        self._computing = {}  # name -> lock held while the result is computed
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def generation(self):
+        """The database's write generation, re-read at most every
+        generation_check_seconds; None if it cannot be read"""
+        with self._lock:
+            if time.time() - self._generation_checked_at < self.generation_check_seconds:
+                return self._generation
+        conn = get_database_connection()
+        try:
+            generation = conn.execute('SELECT generation FROM write_generation WHERE id = 1').fetchone()[0]
+        except Exception as e:
+            print(f"Error reading dashboard write generation: {str(e)}")
+            generation = None
+        finally:
+            conn.close()
+        with self._lock:
+            self._generation = generation
+            self._generation_checked_at = time.time()
+        return generation
+
+    def _fresh(self, name, generation):
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        value, entry_generation, stored_at = entry
+        if entry_generation != generation or time.time() - stored_at > self.ttls.get(name, DEFAULT_CACHE_TTL):
+            return None
+        return entry
+
+    def get(self, name, compute):
+        """Return the cached result of query name, calling compute() on a miss.
+
+        The caller gets its own copy, so it may modify the result.
+        """
+        generation = self.generation() if self.enabled else None
+        if generation is None:
+            return compute()
+
+        with self._lock:
+            entry = self._fresh(name, generation)
+            if entry:
+                self.hits += 1
+                return copy.deepcopy(entry[0])
+            computing = self._computing.setdefault(name, threading.Lock())
+
+        with computing:
+            # Another session may have computed it while this one waited
+            with self._lock:
+                entry = self._fresh(name, generation)
+                if entry:
+                    self.hits += 1
+                    return copy.deepcopy(entry[0])
+            # The generation was read before the query runs, so a write that
+            # lands meanwhile makes this result stale rather than hiding it
+            value = compute()
+            with self._lock:
+                self._entries[name] = (value, generation, time.time())
+                self.misses += 1
+        return copy.deepcopy(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'generation': self._generation
+            }
+
+
+_dashboard_cache = None
+_dashboard_cache_lock = threading.Lock()
+
+
+def get_dashboard_cache():
+    """Return the process-wide dashboard query cache"""
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        with _dashboard_cache_lock:
+            if _dashboard_cache is None:
+                _dashboard_cache = DashboardQueryCache()
+    return _dashboard_cache
+
+
+def cached_query(name):
+    """Cache a DashboardManager query method's result under name"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            return get_dashboard_cache().get(name, lambda: method(self))
+        return wrapper
+    return decorator
@@ -1,18 +1,20 @@
 import streamlit as st
 import os
-import sqlite3
 from datetime import datetime
 import pandas as pd
 import time
 
+from ..config.database import get_connection_pool
+
 class FeedbackManager:
     def __init__(self):
         self.db_path = os.path.join(os.path.dirname(__file__), "feedback.db")
+        self.pool = get_connection_pool(self.db_path)
         self.setup_database()
 
     def setup_database(self):
         """Create feedback table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.acquire()
         c = conn.cursor()
         c.execute('''
             CREATE TABLE IF NOT EXISTS feedback (
@@ -31,7 +33,7 @@ class FeedbackManager:
 
     def save_feedback(self, feedback_data):
         """Save feedback to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.acquire()
         c = conn.cursor()
         c.execute('''
             INSERT INTO feedback (
@@ -53,7 +55,7 @@ class FeedbackManager:
 
     def get_feedback_stats(self):
         """Get feedback statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.acquire()
         df = pd.read_sql_query("SELECT * FROM feedback", conn)
         conn.close()
         
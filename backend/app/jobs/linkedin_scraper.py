@@ -1,3 +1,4 @@
+import os
 import time
 import numpy as np
 import pandas as pd
@@ -12,10 +13,15 @@ warnings.filterwarnings('ignore')
 
 # Import our custom webdriver utility
 from .webdriver_utils import setup_webdriver
+from ..utils.embeddings import get_embedding_engine
 
 class LinkedInScraper:
     """Class for scraping job listings from LinkedIn"""
 
+    # Scraped titles at least this similar (embedding cosine) to a searched
+    # title are kept even without all of its words
+    JOB_TITLE_SIMILARITY = float(os.getenv("JOB_TITLE_SIMILARITY", "0.6"))
+
     @staticmethod
     def webdriver_setup():
         """Set up and configure the Chrome webdriver"""
@@ -242,6 +248,14 @@ class LinkedInScraper:
             if all(word in scrap_title for word in user_title.split()):
                 return scrap_job_title
         
+        # Otherwise keep titles that mean much the same ("Backend Developer" for "Software Engineer")
+        try:
+            similarities = get_embedding_engine().similarities(scrap_title, user_input, kind="job_title")
+            if similarities.max() >= LinkedInScraper.JOB_TITLE_SIMILARITY:
+                return scrap_job_title
+        except Exception as e:
+            print(f"Error comparing job titles: {str(e)}")
+        
         # No match found
         return np.nan
 
@@ -304,13 +318,9 @@ class LinkedInScraper:
             
             # Filter job titles based on user input if provided
             if job_title_input and job_title_input != ['']:
-                filtered_titles = []
-                for title in df['Job Title']:
-                    if any(user_title.lower().strip() in title.lower() for user_title in job_title_input if user_title.strip()):
-                        filtered_titles.append(title)
-                    else:
-                        filtered_titles.append(np.nan)
-                df['Job Title'] = filtered_titles
+                df['Job Title'] = [
+                    LinkedInScraper.job_title_filter(title, job_title_input) for title in df['Job Title']
+                ]
             
             # Filter locations based on user input if provided and not "India"
             if job_location and job_location.lower() != "india":
@@ -424,6 +434,23 @@ class LinkedInScraper:
         
         return df
 
+    @staticmethod
+    def rank_by_relevance(df, job_title_input):
+        """Add a 0-100 Relevance column (embedding similarity of each job
+        description to the searched titles) and sort by it, best first"""
+        titles = ', '.join(title for title in job_title_input if title.strip())
+        if df.empty or not titles:
+            return df
+        try:
+            similarities = get_embedding_engine().similarities(
+                titles, df['Job Description'].tolist(), kind="job_description"
+            )
+        except Exception as e:
+            print(f"Error ranking jobs: {str(e)}")
+            return df
+        df['Relevance'] = np.round(np.clip(similarities, 0, 1) * 100).astype(int)
+        return df.sort_values('Relevance', ascending=False, kind='stable').reset_index(drop=True)
+
     @staticmethod
     def process_job_description(text):
         """Process and structure job description text"""
@@ -571,6 +598,7 @@ class LinkedInScraper:
             location = df_final.iloc[i, 2]
             url = df_final.iloc[i, 3]
             description = df_final.iloc[i, 4]
+            relevance = f'<div class="job-location">🎯 {df_final["Relevance"].iloc[i]}% relevant</div>' if 'Relevance' in df_final else ''
             
             # Create job card
             st.markdown(f"""
@@ -578,6 +606,7 @@ class LinkedInScraper:
                     <div class="job-title">{job_title}</div>
                     <div class="company-name">{company_name}</div>
                     <div class="job-location">📍 {location}</div>
+                    {relevance}
                 </div>
             """, unsafe_allow_html=True)
             
@@ -634,6 +663,8 @@ class LinkedInScraper:
                             if df_final.empty:
                                 st.warning("Could not retrieve job descriptions. Try different search terms.")
                                 return
+                            
+                            df_final = LinkedInScraper.rank_by_relevance(df_final, job_title_input)
                         
                         # Display results
                         LinkedInScraper.display_data_userinterface(df_final)
@@ -1,21 +1,37 @@
-import spacy
 from collections import Counter
 from datetime import datetime
 
+from .nlp import get_nlp, pipe
+from .skills import get_skill_phrase_matcher
+
 class ResumeAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, model=None):
+        self.model = model
+
+    @property
+    def nlp(self):
+        """The shared spaCy pipeline, loaded on first use"""
+        return get_nlp(self.model)
         
     def analyze_resume(self, resume_text):
         """Analyze resume text and return metrics"""
-        doc = self.nlp(resume_text)
+        return self._analyze_doc(self.nlp(resume_text))
+
+    def analyze_resumes(self, resume_texts, n_process=None, batch_size=None):
+        """Analyze many resume texts with batched nlp.pipe, yielding results in order"""
+        for doc in pipe(resume_texts, self.model, n_process=n_process, batch_size=batch_size):
+            yield self._analyze_doc(doc)
+
+    def _analyze_doc(self, doc):
+        resume_text = doc.text
         
         # Basic metrics
         word_count = len(resume_text.split())
         sentence_count = len(list(doc.sents))
         
         # Skills extraction
-        skills = self._extract_skills(doc)
+        skill_matches = self._extract_skills(doc)
+        skills = list(dict.fromkeys(match['skill'] for match in skill_matches))
         
         # Experience analysis
         experience_years = self._analyze_experience(doc)
@@ -34,32 +50,16 @@ class ResumeAnalyzer:
                 "experience_years": experience_years,
                 "profile_score": profile_score
             },
-            "skills": list(skills),
+            "skills": skills,
+            "skill_matches": skill_matches,
             "suggestions": self._generate_suggestions(
                 word_count, sentence_count, skills, experience_years
             )
         }
     
     def _extract_skills(self, doc):
-        """Extract skills from resume"""
-        # Common technical skills keywords
-        tech_skills = {
-            "python", "java", "javascript", "react", "node.js", "sql",
-            "html", "css", "aws", "docker", "kubernetes", "git",
-            "machine learning", "ai", "data science", "analytics"
-        }
-        
-        skills = set()
-        for token in doc:
-            if token.text.lower() in tech_skills:
-                skills.add(token.text)
-            # Check for compound skills (e.g., "machine learning")
-            if token.i < len(doc) - 1:
-                bigram = (token.text + " " + doc[token.i + 1].text).lower()
-                if bigram in tech_skills:
-                    skills.add(bigram)
-        
-        return skills
+        """Extract skills from resume, with character offsets for highlighting"""
+        return get_skill_phrase_matcher(self.model).find(doc)
     
     def _analyze_experience(self, doc):
         """Analyze years of experience"""
@@ -0,0 +1,52 @@
+import os
+import threading
+
+import spacy
+
+
+DEFAULT_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+DEFAULT_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+DEFAULT_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "64"))
+
+# The analyzer only needs sentence boundaries and lexical attributes such as
+# like_num, so the expensive statistical components are never loaded
+UNUSED_PIPES = ["tok2vec", "tagger", "morphologizer", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def _load(name):
+    try:
+        nlp = spacy.load(name, exclude=UNUSED_PIPES)
+    except OSError as e:
+        print(f"Error loading spaCy model {name}, using a blank English pipeline: {str(e)}")
+        nlp = spacy.blank("en")
+
+    # Sentence boundaries from the small statistical senter if the model ships
+    # one, otherwise from the rule-based sentencizer
+    if "senter" in nlp.component_names:
+        nlp.enable_pipe("senter")
+    elif not nlp.has_pipe("sentencizer"):
+        nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def get_nlp(name=None):
+    """Return the process-wide pipeline for a model, loading it on first use"""
+    name = name or DEFAULT_MODEL
+    if name not in _models:
+        with _models_lock:
+            if name not in _models:
+                _models[name] = _load(name)
+    return _models[name]
+
+
+def pipe(texts, name=None, n_process=None, batch_size=None):
+    """Yield a Doc per text, processed in batches by the shared pipeline"""
+    return get_nlp(name).pipe(
+        texts,
+        n_process=n_process or DEFAULT_N_PROCESS,
+        batch_size=batch_size or DEFAULT_BATCH_SIZE
+    )
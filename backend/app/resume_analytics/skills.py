@@ -0,0 +1,78 @@
+import threading
+
+from spacy.matcher import PhraseMatcher
+
+from ..config.job_roles import JOB_ROLES
+from ..config.skill_aliases import SKILL_ALIASES
+from .nlp import get_nlp
+
+
+def job_role_skills(job_roles=None):
+    """Return every required and recommended technical skill in JOB_ROLES,
+    de-duplicated case-insensitively"""
+    job_roles = JOB_ROLES if job_roles is None else job_roles
+    skills = {}
+    for roles in job_roles.values():
+        for info in roles.values():
+            for skill in info.get('required_skills', []) + info.get('recommended_skills', {}).get('technical', []):
+                skills.setdefault(skill.lower(), skill)
+    return list(skills.values())
+
+
+class SkillPhraseMatcher:
+    """Finds skills and their aliases in a Doc with one spaCy PhraseMatcher.
+
+    Patterns of any length are matched case-insensitively in a single pass
+    over the tokens. Where matches overlap, the longest wins, and for equal
+    spans a match on the skill's own name beats a match on an alias (so
+    "Python" is reported as Python, not as "Python/Java/Node.js").
+    """
+
+    def __init__(self, nlp, skills=None, aliases=None):
+        skills = job_role_skills() if skills is None else skills
+        aliases = SKILL_ALIASES if aliases is None else aliases
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        for skill in skills:
+            forms = dict.fromkeys([skill] + aliases.get(skill.lower(), []))
+            self.matcher.add(skill, [nlp.make_doc(form) for form in forms])
+
+    def find(self, doc):
+        """Return the matched skills in doc, ordered by position.
+
+        Each match is a dict with the canonical skill, the matched text and
+        its start/end character offsets in doc.text.
+        """
+        spans = self.matcher(doc, as_spans=True)
+        spans.sort(key=lambda span: (
+            -len(span),
+            span.text.lower() != span.label_.lower(),
+            span.start
+        ))
+
+        taken = set()
+        matches = []
+        for span in spans:
+            if taken.intersection(range(span.start, span.end)):
+                continue
+            taken.update(range(span.start, span.end))
+            matches.append({
+                'skill': span.label_,
+                'text': span.text,
+                'start': span.start_char,
+                'end': span.end_char
+            })
+        matches.sort(key=lambda match: match['start'])
+        return matches
+
+
+_skill_matchers = {}
+_skill_matchers_lock = threading.Lock()
+
+
+def get_skill_phrase_matcher(model=None):
+    """Return the skill matcher for a shared spaCy model, building it once"""
+    if model not in _skill_matchers:
+        with _skill_matchers_lock:
+            if model not in _skill_matchers:
+                _skill_matchers[model] = SkillPhraseMatcher(get_nlp(model))
+    return _skill_matchers[model]
@@ -1,10 +1,15 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Body
+from typing import List
 from fastapi.responses import StreamingResponse
 from app.utils.resume_analyzer import ResumeAnalyzer
 from app.utils.ai_resume_analyzer import AIResumeAnalyzer
-import tempfile
+from app.utils.async_pipeline import analyze_upload, analyze_uploads, run_blocking
+from app.utils.llm_cache import get_llm_cache
+from app.utils.llm_output import get_llm_output_stats
+from app.utils.llm_router import get_llm_router
+from app.utils.role_recommender import get_role_recommender
+from app.utils.text_extraction import CopyMeter, record_copy
 import os
-import shutil
 import json
 import io
 
@@ -17,67 +22,206 @@ async def analyze_resume(
     job_role: str = Form("Software Engineer")
 ):
     try:
-        # Save uploaded file temporarily
-        suffix = os.path.splitext(file.filename)[1]
+        suffix = os.path.splitext(file.filename or "")[1]
         if not suffix:
             suffix = ".pdf" # Default to pdf if no extension
-            
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            tmp_path = tmp.name
 
-        try:
-            # Initialize analyzers
-            basic_analyzer = ResumeAnalyzer()
-            ai_analyzer = AIResumeAnalyzer()
+        with CopyMeter() as copy_meter:
+            # Read the upload once; extraction works on these bytes in memory
+            file_content = await file.read()
+            record_copy(len(file_content))
+
+            # Blocking stages run on the analysis executor and the AI call on
+            # the async client, so other requests keep being served meanwhile
+            text, basic_analysis, ai_analysis = await analyze_upload(
+                file_content, suffix, job_role, job_description
+            )
 
-            # Read file content for extraction
-            with open(tmp_path, "rb") as f:
-                file_content = f.read()
-                
-            # Extract text using AI analyzer (better OCR support)
-            if suffix.lower() == '.docx':
-                text = ai_analyzer.extract_text_from_docx(file) # This needs the file object, but we have content. 
-                # Actually ai_analyzer.extract_text_from_docx takes the uploaded file object usually.
-                # Let's stick to PDF for now or re-use logic. 
-                # The extract_text_from_docx in utils expects a file-like object with getbuffer or read.
-                # We can wrap file_content in BytesIO if needed, but the original code passed headers.
-                pass 
-            
-            # Re-implement text extraction call correctly
-            # The tool only supports PDF upload in UI, so let's stick to extract_text_from_pdf which handles bytes or file
-            text = ai_analyzer.extract_text_from_pdf(file_content)
-            
             if not text:
                  raise HTTPException(status_code=400, detail="Could not extract text from file.")
 
-            # Basic Analysis
-            resume_data = {'raw_text': text}
+        return {
+            "text": text,
+            "basic_analysis": basic_analysis,
+            "ai_analysis": ai_analysis,
+            "metrics": {
+                "upload_bytes": len(file_content),
+                "bytes_copied": copy_meter.bytes_copied
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze/batch")
+async def analyze_resume_batch(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(None),
+    job_role: str = Form("Software Engineer")
+):
+    """AI-analyze several resumes against one job. Resumes are packed several
+    per LLM request; each result carries the resume's stable resume_id."""
+    try:
+        uploads = []
+        for file in files:
+            suffix = os.path.splitext(file.filename or "")[1] or ".pdf"
+            uploads.append((await file.read(), suffix))
+
+        analyzed = await analyze_uploads(uploads, job_role, job_description)
+
+        results = []
+        for file, (text, ai_analysis) in zip(files, analyzed):
+            if not text:
+                results.append({"filename": file.filename, "error": "Could not extract text from file."})
+                continue
+            results.append({
+                "filename": file.filename,
+                "resume_id": ai_analysis.get("resume_id"),
+                "ai_analysis": ai_analysis
+            })
+        return {"results": results}
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze/stream")
+async def analyze_resume_stream(
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    job_role: str = Form("Software Engineer")
+):
+    """Stream analysis progress as NDJSON: one line per decoded page, then the
+    rule-based analysis, then the AI analysis"""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    file_content = await file.read()
+
+    def events():
+        try:
+            basic_analyzer = ResumeAnalyzer()
+            ai_analyzer = AIResumeAnalyzer()
             job_reqs = {'required_skills': [], 'require_gpa': False}
-            basic_analysis = basic_analyzer.analyze_resume(resume_data, job_reqs)
 
-            # AI Analysis - Use the wrapper method for structured output
+            if suffix == '.docx':
+                pages = [(1, basic_analyzer.extract_text_from_docx(io.BytesIO(file_content)), 'python-docx')]
+            else:
+                pages = basic_analyzer.iter_text_from_pdf(file_content)
+
+            text = ""
+            for event in basic_analyzer.analyze_resume_stream(pages, job_reqs):
+                if event['event'] == 'analysis':
+                    text = event['text']
+                    if not text.strip():
+                        yield json.dumps({"event": "error", "detail": "Could not extract text from file."}) + "\n"
+                        return
+                    event = {"event": "basic_analysis", "basic_analysis": event['analysis']}
+                yield json.dumps(event) + "\n"
+
             role_info = {"description": job_description} if job_description else None
             ai_analysis = ai_analyzer.analyze_resume(text, job_role, role_info)
+            yield json.dumps({"event": "ai_analysis", "ai_analysis": ai_analysis}) + "\n"
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
 
-            result = {
-                "text": text,
-                "basic_analysis": basic_analysis,
-                "ai_analysis": ai_analysis
-            }
-            
-            return result
-            
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+def _sse(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/analyze/events")
+async def analyze_resume_events(
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    job_role: str = Form("Software Engineer")
+):
+    """Server-sent events version of /analyze. Sends the rule-based analysis,
+    then each field of the AI analysis (match_score, matched_skills,
+    recommendations, ...) as soon as the model has written it, then the
+    complete AI analysis."""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    file_content = await file.read()
+
+    def events():
+        try:
+            basic_analyzer = ResumeAnalyzer()
+            ai_analyzer = AIResumeAnalyzer()
+            if suffix == '.docx':
+                text = ai_analyzer.extract_text_from_docx(file_content)
+            else:
+                text = ai_analyzer.extract_text_from_pdf(file_content)
+
+            if not text or not text.strip():
+                yield _sse("error", {"detail": "Could not extract text from file."})
+                return
+
+            job_reqs = {'required_skills': [], 'require_gpa': False}
+            yield _sse("basic_analysis", basic_analyzer.analyze_resume({'raw_text': text}, job_reqs))
+
+            role_info = {"description": job_description} if job_description else None
+            for event in ai_analyzer.analyze_resume_stream(text, job_role, role_info):
+                if event["event"] == "field":
+                    yield _sse("field", {"key": event["key"], "value": event["value"]})
+                else:
+                    yield _sse("ai_analysis", event["analysis"])
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
+@router.post("/recommend-roles")
+async def recommend_roles(
+    file: UploadFile = File(None),
+    text: str = Form(None),
+    top_k: int = Form(5)
+):
+    """Rank JOB_ROLES roles by how well a resume fits them. Accepts either an
+    uploaded resume or its extracted text."""
+    try:
+        if file is not None:
+            suffix = os.path.splitext(file.filename or "")[1].lower()
+            file_content = await file.read()
+            basic_analyzer = ResumeAnalyzer()
+            if suffix == '.docx':
+                text = await run_blocking(basic_analyzer.extract_text_from_docx, file_content)
+            else:
+                text = await run_blocking(basic_analyzer.extract_text_from_pdf, file_content)
+
+        if not text or not text.strip():
+            raise HTTPException(status_code=400, detail="Upload a resume file or provide its text.")
+
+        return {"recommendations": get_role_recommender().recommend(text, top_k=max(1, top_k))}
+
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/llm-stats")
+def llm_stats():
+    """Per-provider latency and errors, LLM cache hit rate, and how model
+    responses parsed (clean / repaired / failed) with the retry rate"""
+    return {
+        "providers": get_llm_router().get_stats(),
+        "cache": get_llm_cache().stats(),
+        "output": get_llm_output_stats().snapshot()
+    }
+
 @router.post("/report")
 async def download_report(
     data: dict = Body(...)
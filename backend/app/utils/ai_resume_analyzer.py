@@ -2,16 +2,76 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 import google.generativeai as genai
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-import tempfile
 import requests
 import json
 import math
 import re
+from .embeddings import get_embedding_engine
+from .executor import run_blocking
+from .llm_cache import get_llm_cache
+from .llm_client import get_llm_semaphore
+from .llm_output import ANALYSIS_RESPONSE_SCHEMA, parse_analysis
+from .llm_router import get_llm_router
+from .partial_json import IncrementalJSONParser
+from .prompt_compaction import compact_resume_text
+from .text_extraction import extract_docx_text, get_file_bytes, get_pdf_text_extractor
 
 
+# Bump when the analysis prompt or cache keying changes so old cached
+# responses are not reused (2: keyed by the model that produced the response)
+ANALYSIS_PROMPT_VERSION = "2"
+
+# AI model names shown in the UI, and the router provider each one prefers
+MODEL_PROVIDERS = {
+    "Google Gemini": "gemini",
+    "Anthropic Claude": "openrouter"
+}
+
+# Shape of one resume analysis, shared by the single and batch prompts
+ANALYSIS_JSON_SCHEMA = """{
+            "candidate_info": {
+                "name": "Extracted Name",
+                "role": "Detected Role",
+                "experience": "Total Experience (e.g. 2 years)",
+                "education": "Highest Degree"
+            },
+            "match_score": 0-100 (integer, penalize for poor format),
+            "match_status": "Excellent/Good/Moderate/Poor",
+            "formatting_score": 0-100 (integer),
+            "formatting_issues": ["Issue 1", "Issue 2"],
+            "matched_skills": ["Skill1", "Skill2", ...],
+            "missing_skills": ["Skill1", "Skill2", ...],
+            "job_context": {
+                "title": "Job Title Used",
+                "requirements_summary": "Brief summary of key requirements"
+            },
+            "recommendations": ["Recommendation 1", "Recommendation 2", ...],
+            "overall_assessment": "Analysis summary including formatting critique (2-3 sentences)",
+            "ats_score": 0-100 (integer),
+            "ats_keywords_missing": ["Keyword1", "Keyword2"]
+        }"""
+
+def model_display_name(model):
+    """UI name of the provider serving a model ("gemini-2.5-flash" -> "Google
+    Gemini"), or the model itself if no configured provider serves it"""
+    for provider in get_llm_router().providers.values():
+        if provider.model == model:
+            return provider.display_name
+    return model
+
+
+def semantic_match_hint(resume_text, job_text):
+    """Prompt line giving the local embedding similarity of a resume to the
+    target job, or "" when there is nothing to compare or it fails"""
+    if not resume_text or not job_text:
+        return ""
+    try:
+        similarity = get_embedding_engine().similarity(resume_text, job_text)
+    except Exception as e:
+        print(f"Error computing semantic match: {str(e)}")
+        return ""
+    return f"Semantic similarity to the target job (local embedding model, 0-1, a hint only): {max(0.0, similarity):.2f}"
+
 class AIResumeAnalyzer:
     def __init__(self):
         # Load environment variables
@@ -25,137 +85,25 @@ class AIResumeAnalyzer:
             genai.configure(api_key=self.google_api_key)
     
     def extract_text_from_pdf(self, pdf_file):
-        """Extract text from PDF using pdfplumber and OCR if needed"""
-        text = ""
-        
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            if hasattr(pdf_file, 'getbuffer'):
-                temp_file.write(pdf_file.getbuffer())
-            elif hasattr(pdf_file, 'read'):
-                temp_file.write(pdf_file.read())
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                temp_file.write(pdf_file)
-            temp_path = temp_file.name
-        
+        """Extract text from PDF, choosing pypdf, pdfplumber or OCR per page"""
         try:
-            # Try direct text extraction with pdfplumber
-            try:
-                with pdfplumber.open(temp_path) as pdf:
-                    for page in pdf.pages:
-                        try:
-                            # Suppress specific warnings about PDFColorSpace conversion
-                            import warnings
-                            with warnings.catch_warnings():
-                                warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
-                                warnings.filterwarnings("ignore", message=".*Cannot convert.*")
-                                page_text = page.extract_text()
-                                if page_text:
-                                    text += page_text + "\n"
-                        except Exception as e:
-                            # Don't show these specific errors to the user
-                            if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
-                                st.warning(f"Error extracting text from page with pdfplumber: {e}")
-            except Exception as e:
-                st.warning(f"pdfplumber extraction failed: {e}")
-            
-            # If pdfplumber extraction worked, return the text
-            if text.strip():
-                os.unlink(temp_path)  # Clean up the temp file
-                return text.strip()
-            
-            # Try PyPDF2 as a fallback
-            st.info("Trying PyPDF2 extraction method...")
-            try:
-                import pypdf
-                pdf_text = ""
-                with open(temp_path, 'rb') as file:
-                    pdf_reader = pypdf.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pdf_text += page_text + "\n"
-                
-                if pdf_text.strip():
-                    os.unlink(temp_path)  # Clean up the temp file
-                    return pdf_text.strip()
-            except Exception as e:
-                st.warning(f"PyPDF2 extraction failed: {e}")
-            
-            # If we got here, both extraction methods failed
-            st.warning("Standard text extraction methods failed. Your PDF might be image-based or scanned.")
-            
-            # Try OCR as a last resort
-            try:
-                # Check if we can import the required OCR libraries
-                import pytesseract
-                from pdf2image import convert_from_path
-                
-                st.info("Attempting OCR for image-based PDF. This may take a moment...")
-                
-                # Check if poppler is installed
-                poppler_path = None
-                if os.name == 'nt':  # Windows
-                    # Try to find poppler in common locations
-                    possible_paths = [
-                        r'C:\poppler\Library\bin',
-                        r'C:\Program Files\poppler\bin',
-                        r'C:\Program Files (x86)\poppler\bin',
-                        r'C:\poppler\bin'
-                    ]
-                    for path in possible_paths:
-                        if os.path.exists(path):
-                            poppler_path = path
-                            st.success(f"Found Poppler at: {path}")
-                            break
-                    
-                    if not poppler_path:
-                        st.warning("Poppler not found in common locations. Using default path: C:\\poppler\\Library\\bin")
-                        poppler_path = r'C:\poppler\Library\bin'
-                
-                # Try to convert PDF to images
-                try:
-                    if poppler_path and os.name == 'nt':
-                        images = convert_from_path(temp_path, poppler_path=poppler_path)
-                    else:
-                        images = convert_from_path(temp_path)
-                    
-                    # Process each image with OCR
-                    ocr_text = ""
-                    for i, image in enumerate(images):
-                        st.info(f"Processing page {i+1} with OCR...")
-                        page_text = pytesseract.image_to_string(image)
-                        ocr_text += page_text + "\n"
-                    
-                    if ocr_text.strip():
-                        os.unlink(temp_path)  # Clean up the temp file
-                        return ocr_text.strip()
-                    else:
-                        st.error("OCR extraction yielded no text. Please check if the PDF contains actual text content.")
-                except Exception as e:
-                    st.error(f"PDF to image conversion failed: {e}")
-                    st.info("If you're on Windows, make sure Poppler is installed and in your PATH.")
-                    st.info("Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except ImportError as e:
-                st.error(f"OCR libraries not available: {e}")
-                st.info("Please install the required OCR libraries:")
-                st.code("pip install pytesseract pdf2image")
-                st.info("For Windows, also download and install:")
-                st.info("1. Tesseract OCR: https://github.com/UB-Mannheim/tesseract/wiki")
-                st.info("2. Poppler: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except Exception as e:
-                st.error(f"OCR processing failed: {e}")
-        
+            result = get_pdf_text_extractor().extract(get_file_bytes(pdf_file))
         except Exception as e:
             st.error(f"PDF processing failed: {e}")
-        
-        # Clean up the temp file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+            return ""
+
+        if 'ocr' in result['extractor'].split('+') and not result['cached']:
+            ocr_pages = [str(page['page_number']) for page in result['pages'] if page['extractor'] == 'ocr']
+            st.info(f"Page(s) {', '.join(ocr_pages)} looked scanned and were processed with OCR.")
+
+        if result['text']:
+            return result['text']
+
+        st.warning("Standard text extraction methods failed. Your PDF might be image-based or scanned.")
+        st.info("For OCR, make sure Tesseract and Poppler are installed and in your PATH:")
+        st.code("pip install pytesseract pdf2image")
+        st.info("1. Tesseract OCR: https://github.com/UB-Mannheim/tesseract/wiki")
+        st.info("2. Poppler: https://github.com/oschwartz10612/poppler-windows/releases/")
         
         # If all extraction methods failed, return an empty string
         st.error("All text extraction methods failed. Please try a different PDF or manually extract the text.")
@@ -163,129 +111,209 @@ class AIResumeAnalyzer:
     
     def extract_text_from_docx(self, docx_file):
         """Extract text from DOCX file"""
-        from docx import Document
-        
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            temp_file.write(docx_file.getbuffer())
-            temp_path = temp_file.name
-        
         text = ""
         try:
-            doc = Document(temp_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+            text = extract_docx_text(docx_file) + "\n"
         except Exception as e:
             st.error(f"Error extracting text from DOCX: {e}")
         
-        os.unlink(temp_path)  # Clean up the temp file
         return text
     
-    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None):
-        """Analyze resume using Google Gemini AI"""
-        if not resume_text:
-            return {"error": "Resume text is required for analysis."}
+    def _analysis_prompt(self, resume_text, job_description=None, job_role=None):
+        """Build the structured-analysis prompt sent to the LLM"""
+        base_prompt = f"""
+        You are an expert resume analyst and career coach.
+        Your task is to analyze the resume content AND its structure/formatting to provide a structured JSON response.
+
+        IMPORTANT: 
+        1. Return ONLY valid JSON.
+        2. Evaluate strictly. Do NOT give high scores to poorly formatted resumes even if they have keywords.
+        3. A resume with poor formatting (e.g., long paragraphs, no bullet points, typos, lack of sections) should NOT score above 60, regardless of content match.
+        4. Detect typos (e.g. "Micro-soft") and penalize accordingly.
+
+        Structure the JSON exactly like this:
+        {ANALYSIS_JSON_SCHEMA}
+
+        Resume Text (Analyze structure from this text representation too):
+        {resume_text}
+        """
+
+        if job_role:
+            base_prompt += f"""
+
+            Target Job Role: {job_role}
+            """
+
+        if job_description:
+            base_prompt += f"""
+
+            Job Description to compare against:
+            {job_description}
+            """
+
+        hint = semantic_match_hint(resume_text, job_description or job_role)
+        if hint:
+            base_prompt += f"""
+            {hint}
+            """
         
-        if not self.google_api_key:
-            return {"error": "Google API key is not configured. Please add it to your .env file."}
+        return base_prompt
+
+    def _llm_result(self, data, model_used, cached=False, record=True):
+        """Parse a JSON analysis response into the result dict.
+
+        Malformed JSON (fences, trailing commas, truncation, ...) is repaired
+        and the analysis validated against ANALYSIS_RESPONSE_SCHEMA, so every
+        documented field is present with its documented type.
+        """
+        analysis, error = parse_analysis(data, record=record and not cached)
+        if error:
+            return {"error": error}
+        
+        return {
+            "structured_data": analysis,
+            "resume_score": analysis.get("match_score", 0),
+            "ats_score": analysis.get("ats_score", 0),
+            # Keep raw analysis for backward compatibility if needed, but we should rely on structured_data
+            "analysis": json.dumps(analysis, indent=2),
+            "model_used": model_used,
+            "cached": cached
+        }
+
+    @staticmethod
+    def _cache_key(prompt, model):
+        """LLM cache key of an analysis prompt answered by model"""
+        return get_llm_cache().make_key(prompt, model, ANALYSIS_PROMPT_VERSION)
+
+    def _prepare_llm_request(self, resume_text, job_description, job_role, preferred):
+        """Return (router, prompt, cache key, compaction report, error) for an LLM analysis"""
+        if not resume_text:
+            return None, None, None, None, {"error": "Resume text is required for analysis."}
+        router = get_llm_router()
+        candidates = router.candidates(preferred)
+        if not candidates:
+            return None, None, None, None, {"error": "No AI model is available. Please add GOOGLE_API_KEY or OPENROUTER_API_KEY to your .env file."}
+
+        # Input tokens drive both latency and cost, so compact the resume first
+        resume_text, compaction = compact_resume_text(resume_text)
+
+        prompt = self._analysis_prompt(resume_text, job_description, job_role)
+        # Looked up under the model that will be asked first; responses are
+        # stored under the model that actually produced them (see
+        # _store_llm_result), so a fallback's answer never stands in for it
+        cache_key = self._cache_key(prompt, candidates[0].model)
+        return router, prompt, cache_key, compaction, None
+
+    def _cached_llm_result(self, cache_key, use_cache):
+        entry = get_llm_cache().get_entry(cache_key) if use_cache else None
+        if entry is None:
+            return None
+        data, model = entry
+        return self._llm_result(data, model_display_name(model), cached=True)
+
+    def _store_llm_result(self, prompt, data, provider, record=True):
+        """Parse a response to prompt from provider, caching it under that provider's model"""
+        result = self._llm_result(data, provider.display_name, record=record)
+        if "error" not in result:
+            # Only cache responses that parsed, in their repaired form
+            get_llm_cache().put(self._cache_key(prompt, provider.model), json.dumps(result["structured_data"]), provider.model)
+        return result
+
+    def analyze_resume_with_llm(self, resume_text, job_description=None, job_role=None, preferred=None, use_cache=True):
+        """Analyze resume through the LLM router.
+
+        preferred names the provider to try first ("gemini", "openrouter");
+        the router falls back to, or hedges with, the other configured
+        providers when it fails or is slow. Identical prompts are answered
+        from the LLM response cache unless use_cache is False.
+        """
+        router, prompt, cache_key, compaction, error = self._prepare_llm_request(resume_text, job_description, job_role, preferred)
+        if error:
+            return error
         
         try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
-            
-            base_prompt = f"""
-            You are an expert resume analyst and career coach.
-            Your task is to analyze the resume content AND its structure/formatting to provide a structured JSON response.
-            
-            IMPORTANT: 
-            1. Return ONLY valid JSON.
-            2. Evaluate strictly. Do NOT give high scores to poorly formatted resumes even if they have keywords.
-            3. A resume with poor formatting (e.g., long paragraphs, no bullet points, typos, lack of sections) should NOT score above 60, regardless of content match.
-            4. Detect typos (e.g. "Micro-soft") and penalize accordingly.
+            result = self._cached_llm_result(cache_key, use_cache)
+            if not result:
+                text, provider = router.generate(prompt, preferred, response_schema=ANALYSIS_RESPONSE_SCHEMA)
+                result = self._store_llm_result(prompt, text, provider)
+            result["prompt_compaction"] = compaction
+            return result
+        
+        except Exception as e:
+            return {"error": f"Analysis failed: {str(e)}"}
 
-            Structure the JSON exactly like this:
-            {{
-                "candidate_info": {{
-                    "name": "Extracted Name",
-                    "role": "Detected Role",
-                    "experience": "Total Experience (e.g. 2 years)",
-                    "education": "Highest Degree"
-                }},
-                "match_score": 0-100 (integer, penalize for poor format),
-                "match_status": "Excellent/Good/Moderate/Poor",
-                "formatting_score": 0-100 (integer),
-                "formatting_issues": ["Issue 1", "Issue 2"],
-                "matched_skills": ["Skill1", "Skill2", ...],
-                "missing_skills": ["Skill1", "Skill2", ...],
-                "job_context": {{
-                    "title": "Job Title Used",
-                    "requirements_summary": "Brief summary of key requirements"
-                }},
-                "recommendations": ["Recommendation 1", "Recommendation 2", ...],
-                "overall_assessment": "Analysis summary including formatting critique (2-3 sentences)",
-                "ats_score": 0-100 (integer),
-                "ats_keywords_missing": ["Keyword1", "Keyword2"]
-            }}
+    async def analyze_resume_with_llm_async(self, resume_text, job_description=None, job_role=None, preferred=None, use_cache=True):
+        """Async analyze_resume_with_llm for the FastAPI backend. Waits for a
+        slot under the per-worker LLM concurrency limit before calling out.
 
-            Resume Text (Analyze structure from this text representation too):
-            {resume_text}
-            """
-            
-            if job_role:
-                base_prompt += f"""
-                
-                Target Job Role: {job_role}
-                """
-            
-            if job_description:
-                base_prompt += f"""
-                
-                Job Description to compare against:
-                {job_description}
-                """
-            
-            # Generate content
-            response = model.generate_content(base_prompt)
-            data = response.text.strip()
-            
-            # Clean up potential markdown formatting from the response
-            if data.startswith("```json"):
-                data = data.replace("```json", "", 1)
-            if data.startswith("```"):
-                data = data.replace("```", "", 1)
-            if data.endswith("```"):
-                data = data.rsplit("```", 1)[0]
-            
-            data = data.strip()
-            
-            # Parse JSON
-            try:
-                analysis = json.loads(data)
-                
-                # Ensure all keys exist
-                required_keys = ["match_score", "ats_score", "matched_skills", "missing_skills", "recommendations", "overall_assessment"]
-                for key in required_keys:
-                    if key not in analysis:
-                        if key == "match_score" or key == "ats_score":
-                            analysis[key] = 0
-                        elif key == "matched_skills" or key == "missing_skills" or key == "recommendations":
-                            analysis[key] = []
-                        elif key == "overall_assessment":
-                            analysis[key] = "Analysis failed to generate assessment."
-                
-                return {
-                    "structured_data": analysis,
-                    "resume_score": analysis.get("match_score", 0),
-                    "ats_score": analysis.get("ats_score", 0),
-                    # Keep raw analysis for backward compatibility if needed, but we should rely on structured_data
-                    "analysis": json.dumps(analysis, indent=2) 
-                }
-                
-            except json.JSONDecodeError as e:
-                return {"error": f"Failed to parse AI response as JSON: {str(e)}. Response was: {data[:100]}..."}
+        Building the prompt (segmentation, the embedding store) and the LLM
+        cache reads and writes (SQLite) run on the analysis executor; only
+        the LLM call itself is awaited on the event loop.
+        """
+        router, prompt, cache_key, compaction, error = await run_blocking(
+            self._prepare_llm_request, resume_text, job_description, job_role, preferred
+        )
+        if error:
+            return error
+        
+        try:
+            result = await run_blocking(self._cached_llm_result, cache_key, use_cache)
+            if not result:
+                async with get_llm_semaphore():
+                    text, provider = await router.generate_async(prompt, preferred, response_schema=ANALYSIS_RESPONSE_SCHEMA)
+                result = await run_blocking(self._store_llm_result, prompt, text, provider)
+            result["prompt_compaction"] = compaction
+            return result
         
         except Exception as e:
             return {"error": f"Analysis failed: {str(e)}"}
 
+    def stream_resume_analysis(self, resume_text, job_description=None, job_role=None, preferred="gemini", use_cache=True):
+        """Analyze resume like analyze_resume_with_llm, streaming the response.
+
+        Yields {"event": "field", "key": ..., "value": ...} as each top-level
+        field of the JSON analysis (match_score, matched_skills, ...) finishes
+        streaming, then {"event": "result", "result": ...} holding what
+        analyze_resume_with_llm would have returned.
+        """
+        router, prompt, cache_key, compaction, error = self._prepare_llm_request(resume_text, job_description, job_role, preferred)
+        if error:
+            yield {"event": "result", "result": error}
+            return
+        
+        try:
+            result = self._cached_llm_result(cache_key, use_cache)
+            if result:
+                for key, value in result["structured_data"].items():
+                    yield {"event": "field", "key": key, "value": value}
+            else:
+                parser = IncrementalJSONParser()
+                chunks = []
+                provider = None
+                for chunk, provider in router.stream(prompt, preferred, response_schema=ANALYSIS_RESPONSE_SCHEMA):
+                    chunks.append(chunk)
+                    for key, value in parser.feed(chunk):
+                        yield {"event": "field", "key": key, "value": value}
+                result = self._store_llm_result(prompt, "".join(chunks), provider)
+            result["prompt_compaction"] = compaction
+        
+        except Exception as e:
+            result = {"error": f"Analysis failed: {str(e)}"}
+        
+        yield {"event": "result", "result": result}
+
+    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None, use_cache=True):
+        """Analyze resume using Google Gemini AI, falling back to other configured models"""
+        return self.analyze_resume_with_llm(resume_text, job_description, job_role, "gemini", use_cache)
+
+    async def analyze_resume_with_gemini_async(self, resume_text, job_description=None, job_role=None, use_cache=True):
+        """Async analyze_resume_with_gemini"""
+        return await self.analyze_resume_with_llm_async(resume_text, job_description, job_role, "gemini", use_cache)
+
+    def analyze_resume_with_anthropic(self, resume_text, job_description=None, job_role=None, use_cache=True):
+        """Analyze resume using Anthropic Claude through OpenRouter, falling back to other configured models"""
+        return self.analyze_resume_with_llm(resume_text, job_description, job_role, "openrouter", use_cache)
+
     
     def generate_pdf_report(self, analysis_result, candidate_name, job_role):
         """Generate a PDF report of the analysis using structured data"""
@@ -623,109 +651,140 @@ class AIResumeAnalyzer:
         Returns:
         - Dictionary containing analysis results
         """
-        import traceback
-        
         try:
-            job_description = None
-            if role_info:
-                job_description = f"""
+            job_description = self._role_job_description(job_role, role_info)
+            
+            # Prefer the chosen model; the router falls back to the others
+            result = self.analyze_resume_with_llm(
+                resume_text, job_description, job_role, MODEL_PROVIDERS.get(model, "gemini")
+            )
+            model_used = result.get("model_used", model)
+            
+            return self._format_analysis(result, model_used)
+            
+        except Exception as e:
+            return self._analysis_error(e)
+
+    async def analyze_resume_async(self, resume_text, job_role=None, role_info=None, model="Google Gemini"):
+        """Async analyze_resume for the FastAPI backend"""
+        try:
+            job_description = self._role_job_description(job_role, role_info)
+            result = await self.analyze_resume_with_llm_async(
+                resume_text, job_description, job_role, MODEL_PROVIDERS.get(model, "gemini")
+            )
+            return self._format_analysis(result, result.get("model_used", model))
+        except Exception as e:
+            return self._analysis_error(e)
+
+    def analyze_resume_stream(self, resume_text, job_role=None, role_info=None, model="Google Gemini"):
+        """Streaming analyze_resume: yields field events as the model writes
+        them, then {"event": "analysis", "analysis": ...} with the final result"""
+        job_description = self._role_job_description(job_role, role_info)
+        for event in self.stream_resume_analysis(
+            resume_text, job_description, job_role, MODEL_PROVIDERS.get(model, "gemini")
+        ):
+            if event["event"] == "result":
+                result = event["result"]
+                event = {
+                    "event": "analysis",
+                    "analysis": self._format_analysis(result, result.get("model_used", model))
+                }
+            yield event
+
+    def _role_job_description(self, job_role, role_info):
+        """Describe the target role for the prompt, from its JOB_ROLES entry"""
+        if not role_info:
+            return None
+        return f"""
                 Role: {job_role}
                 Description: {role_info.get('description', '')}
                 Required Skills: {', '.join(role_info.get('required_skills', []))}
                 """
-            
-            # Choose the appropriate model for analysis
-            if model == "Google Gemini":
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
-                model_used = "Google Gemini"
-            elif model == "Anthropic Claude":
-                # Assuming this might still return text-based result, or not implemented
-                # For safety, if it returns text, we might need the old parsing logic or just fail gracefully 
-                # for now, as we are focusing on Gemini
-                result = self.analyze_resume_with_anthropic(resume_text, job_description, job_role)
-                model_used = result.get("model_used", "Anthropic Claude")
-            else:
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
-                model_used = "Google Gemini"
-            
-            # Process the result
-            # If we have structured data (from new Gemini implementation), use it directly
-            if "structured_data" in result:
-                data = result["structured_data"]
-                return {
-                    "score": data.get("match_score", 0),
-                    "ats_score": data.get("ats_score", 0),
-                    "strengths": data.get("matched_skills", []), # Mapping matched skills to strengths for now, or use actual recommendations
-                    "weaknesses": data.get("missing_skills", []), # Mapping missing skills to weaknesses
-                    "suggestions": data.get("recommendations", []),
-                    "candidate_info": data.get("candidate_info", {}),
-                    "matched_skills": data.get("matched_skills", []),
-                    "missing_skills": data.get("missing_skills", []),
-                    "job_context": data.get("job_context", {}),
-                    "overall_assessment": data.get("overall_assessment", ""),
-                    "full_response": result.get("analysis", ""), # Start keeping raw JSON string as full_response
-                    "structured_data": data, # Pass full object
-                    "model_used": model_used
-                }
 
-            # Fallback for text-based results (e.g. old Claude implementation or error)
-            analysis_text = result.get("analysis", "")
-            
-            # Extract strengths
-            strengths = []
-            if "## Key Strengths" in analysis_text:
-                strengths_section = analysis_text.split("## Key Strengths")[1].split("##")[0].strip()
-                strengths = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                            for s in strengths_section.split("\n") 
-                            if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
-            
-            # Extract weaknesses/areas for improvement
-            weaknesses = []
-            if "## Areas for Improvement" in analysis_text:
-                weaknesses_section = analysis_text.split("## Areas for Improvement")[1].split("##")[0].strip()
-                weaknesses = [clean_markdown(w.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                             for w in weaknesses_section.split("\n") 
-                             if w.strip() and (w.strip().startswith("-") or w.strip().startswith("*") or w.strip().startswith("•"))]
-            
-            # Extract suggestions/recommendations
-            suggestions = []
-            if "## Recommended Courses" in analysis_text:
-                suggestions_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
-                suggestions = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                 for s in suggestions_section.split("\n") 
-                                 if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
-            
-            # Extract score
-            score = result.get("resume_score", 0)
-            if not score:
-                score = self._extract_score_from_text(analysis_text)
-            
-            # Extract ATS score
-            ats_score = self._extract_ats_score_from_text(analysis_text)
-            
+    def _format_analysis(self, result, model_used):
+        """Map a model result onto the analysis dict the UI and API expect"""
+        # Process the result
+        # If we have structured data (from new Gemini implementation), use it directly
+        if "structured_data" in result:
+            data = result["structured_data"]
             return {
-                "score": score,
-                "ats_score": ats_score,
-                "strengths": strengths,
-                "weaknesses": weaknesses,
-                "suggestions": suggestions,
-                "full_response": analysis_text,
-                "model_used": model_used
+                "score": data.get("match_score", 0),
+                "ats_score": data.get("ats_score", 0),
+                "strengths": data.get("matched_skills", []), # Mapping matched skills to strengths for now, or use actual recommendations
+                "weaknesses": data.get("missing_skills", []), # Mapping missing skills to weaknesses
+                "suggestions": data.get("recommendations", []),
+                "candidate_info": data.get("candidate_info", {}),
+                "matched_skills": data.get("matched_skills", []),
+                "missing_skills": data.get("missing_skills", []),
+                "job_context": data.get("job_context", {}),
+                "overall_assessment": data.get("overall_assessment", ""),
+                "full_response": result.get("analysis", ""), # Start keeping raw JSON string as full_response
+                "structured_data": data, # Pass full object
+                "model_used": model_used,
+                "prompt_compaction": result.get("prompt_compaction")
             }
-            
-        except Exception as e:
-            print(f"Error in analyze_resume: {str(e)}")
-            print(traceback.format_exc())
-            return {
-                "error": f"Analysis failed: {str(e)}",
-                "score": 0,
-                "ats_score": 0,
-                "strengths": ["Unable to analyze resume due to an error."],
-                "weaknesses": ["Unable to analyze resume due to an error."],
-                "suggestions": ["Try again with a different model or check your resume format."],
-                "full_response": f"Error: {str(e)}",
-                "model_used": "Error"
-            } 
+
+        # Fallback for text-based results (e.g. old Claude implementation or error)
+        analysis_text = result.get("analysis", "")
+        
+        # Extract strengths
+        strengths = []
+        if "## Key Strengths" in analysis_text:
+            strengths_section = analysis_text.split("## Key Strengths")[1].split("##")[0].strip()
+            strengths = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
+                        for s in strengths_section.split("\n") 
+                        if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
+        
+        # Extract weaknesses/areas for improvement
+        weaknesses = []
+        if "## Areas for Improvement" in analysis_text:
+            weaknesses_section = analysis_text.split("## Areas for Improvement")[1].split("##")[0].strip()
+            weaknesses = [clean_markdown(w.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
+                         for w in weaknesses_section.split("\n") 
+                         if w.strip() and (w.strip().startswith("-") or w.strip().startswith("*") or w.strip().startswith("•"))]
+        
+        # Extract suggestions/recommendations
+        suggestions = []
+        if "## Recommended Courses" in analysis_text:
+            suggestions_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
+            suggestions = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
+                             for s in suggestions_section.split("\n") 
+                             if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
+        
+        # Extract score
+        score = result.get("resume_score", 0)
+        if not score:
+            score = self._extract_score_from_text(analysis_text)
+        
+        # Extract ATS score
+        ats_score = self._extract_ats_score_from_text(analysis_text)
+        
+        return {
+            "score": score,
+            "ats_score": ats_score,
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "suggestions": suggestions,
+            "full_response": analysis_text,
+            "model_used": model_used
+        }
+
+    def _analysis_error(self, e):
+        """Analysis result returned when analyze_resume fails"""
+        import traceback
+        
+        print(f"Error in analyze_resume: {str(e)}")
+        print(traceback.format_exc())
+        return {
+            "error": f"Analysis failed: {str(e)}",
+            "score": 0,
+            "ats_score": 0,
+            "strengths": ["Unable to analyze resume due to an error."],
+            "weaknesses": ["Unable to analyze resume due to an error."],
+            "suggestions": ["Try again with a different model or check your resume format."],
+            "full_response": f"Error: {str(e)}",
+            "model_used": "Error"
+        }
 
     def simple_generate_pdf_report(self, analysis_result, candidate_name, job_role):
         """Generate a simple PDF report without complex charts as a fallback"""
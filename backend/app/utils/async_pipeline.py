@@ -0,0 +1,62 @@
+import asyncio
+
+from .ai_resume_analyzer import AIResumeAnalyzer
+from .batch_analysis import BatchResumeAnalyzer
+# The executor lives in executor.py so the analyzers can use it without a
+# circular import; re-exported here for existing callers
+from .executor import ANALYSIS_MAX_WORKERS, get_analysis_executor, run_blocking
+from .resume_analyzer import ResumeAnalyzer
+
+
+def _extract_text(file_content, suffix):
+    ai_analyzer = AIResumeAnalyzer()
+    if suffix.lower() == '.docx':
+        return ai_analyzer.extract_text_from_docx(file_content)
+    return ai_analyzer.extract_text_from_pdf(file_content)
+
+
+def _basic_analysis(text, job_requirements):
+    return ResumeAnalyzer().analyze_resume({'raw_text': text}, job_requirements)
+
+
+async def analyze_upload(file_content, suffix, job_role=None, job_description=None, job_requirements=None):
+    """Extract and analyze an uploaded resume without blocking the event loop.
+
+    Extraction runs on the analysis executor. The rule-based analysis (also on
+    the executor) and the AI analysis (async client) then run concurrently.
+    Returns (text, basic_analysis, ai_analysis); text is empty if nothing
+    could be extracted.
+    """
+    text = await run_blocking(_extract_text, file_content, suffix)
+    if not text or not text.strip():
+        return "", None, None
+
+    job_requirements = job_requirements or {'required_skills': [], 'require_gpa': False}
+    role_info = {"description": job_description} if job_description else None
+    basic_analysis, ai_analysis = await asyncio.gather(
+        run_blocking(_basic_analysis, text, job_requirements),
+        AIResumeAnalyzer().analyze_resume_async(text, job_role, role_info)
+    )
+    return text, basic_analysis, ai_analysis
+
+
+async def analyze_uploads(uploads, job_role=None, job_description=None):
+    """Extract and AI-analyze several uploaded resumes against one job.
+
+    uploads is a list of (file bytes, suffix). Extraction runs concurrently
+    on the analysis executor; the AI analysis packs several resumes into
+    each LLM request (see BatchResumeAnalyzer). Returns (text, ai_analysis)
+    per upload, in order; text is empty and ai_analysis None if nothing
+    could be extracted.
+    """
+    texts = await asyncio.gather(*(
+        run_blocking(_extract_text, file_content, suffix) for file_content, suffix in uploads
+    ))
+    extracted = [text for text in texts if text and text.strip()]
+
+    role_info = {"description": job_description} if job_description else None
+    analyses = iter(await BatchResumeAnalyzer().analyze_resumes_async(extracted, job_role, role_info))
+    return [
+        (text, next(analyses)) if text and text.strip() else ("", None)
+        for text in texts
+    ]
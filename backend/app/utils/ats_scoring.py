@@ -0,0 +1,163 @@
+"""
+Vectorized ATS scoring.
+
+ResumeAnalyzer.analyze_resume scores one resume against one role. Ranking a
+large pool of resumes against every JOB_ROLES role that way repeats the text
+analysis once per role. ATSScorer instead extracts each resume's features once
+(the role-independent section scores plus which skills it mentions), stacks
+them into NumPy arrays, and scores all resumes against all roles with a single
+matrix product. Scores are identical to analyze_resume's ats_score.
+
+Usage:
+    scorer = get_ats_scorer()
+    features = scorer.extract_features(texts)
+    scores = scorer.score(features)            # (resumes, roles) int matrix
+    scorer.rank_resumes(features, "Data Scientist", top_k=10)
+"""
+import threading
+
+import numpy as np
+
+from ..config.job_roles import JOB_ROLES
+from .resume_analyzer import ATS_WEIGHTS, ResumeAnalyzer
+from .skill_matcher import SkillMatcher
+
+
+# Columns of the section feature matrix. education_gpa is the education score
+# for roles that require a GPA.
+SECTION_COLUMNS = ('contact', 'summary', 'experience', 'education', 'education_gpa', 'format')
+
+
+def flatten_job_roles(job_roles=None):
+    """Return {role name: role info} across every JOB_ROLES category"""
+    job_roles = JOB_ROLES if job_roles is None else job_roles
+    roles = {}
+    for category_roles in job_roles.values():
+        roles.update(category_roles)
+    return roles
+
+
+class ATSScorer:
+    """Scores many resumes against many job roles at once"""
+
+    def __init__(self, roles=None, analyzer=None):
+        roles = flatten_job_roles() if roles is None else roles
+        self.analyzer = analyzer or ResumeAnalyzer()
+        self.role_names = list(roles)
+        self._role_index = {name: i for i, name in enumerate(self.role_names)}
+
+        # One matcher over the union of every role's required skills
+        self.skills = list(dict.fromkeys(
+            skill for info in roles.values() for skill in info.get('required_skills', [])
+        ))
+        self.skill_matcher = SkillMatcher(self.skills)
+        skill_index = {skill: i for i, skill in enumerate(self.skills)}
+
+        # role_skills[s, r] counts how often skill s is listed for role r, so a
+        # duplicated required skill weighs the same as in calculate_keyword_match
+        self.role_skills = np.zeros((len(self.skills), len(self.role_names)))
+        for r, info in enumerate(roles.values()):
+            for skill in info.get('required_skills', []):
+                self.role_skills[skill_index[skill], r] += 1
+        self.role_sizes = self.role_skills.sum(axis=0)
+        self.require_gpa = np.array(
+            [bool(info.get('require_gpa', False)) for info in roles.values()], dtype=bool
+        )
+
+    def extract_features(self, texts):
+        """Extract the feature arrays for a list of resume texts.
+
+        Returns a dict with 'sections' (n x len(SECTION_COLUMNS) float scores),
+        'skills' (n x len(self.skills) 0/1 presence) and 'is_resume' (n bools).
+        """
+        sections = np.zeros((len(texts), len(SECTION_COLUMNS)))
+        skills = np.zeros((len(texts), len(self.skills)))
+        is_resume = np.zeros(len(texts), dtype=bool)
+        any_gpa = bool(self.require_gpa.any())
+        skill_index = {skill: i for i, skill in enumerate(self.skills)}
+
+        for i, text in enumerate(texts):
+            features = self.analyzer.section_features(text)
+            if not features['is_resume']:
+                continue
+            is_resume[i] = True
+
+            education_gpa = features['education']
+            if any_gpa:
+                education = self.analyzer.extract_education(text)
+                education_gpa = 100 - (len(self.analyzer.education_suggestions(education, True)) * 25)
+
+            sections[i] = (
+                features['contact'],
+                features['summary'],
+                features['experience'],
+                features['education'],
+                education_gpa,
+                features['format']
+            )
+            for skill in self.skill_matcher.find(text):
+                skills[i, skill_index[skill]] = 1
+
+        return {'sections': sections, 'skills': skills, 'is_resume': is_resume}
+
+    def skill_scores(self, features):
+        """Return the (resumes x roles) keyword match percentages"""
+        found = features['skills'] @ self.role_skills
+        sizes = np.where(self.role_sizes > 0, self.role_sizes, 1)
+        return np.where(self.role_sizes > 0, found / sizes * 100, 0.0)
+
+    def score(self, features):
+        """Return the (resumes x roles) ATS score matrix.
+
+        Each weighted component is rounded half-to-even before summing, the
+        same way analyze_resume rounds with round().
+        """
+        sections = features['sections']
+        column = {name: sections[:, i] for i, name in enumerate(SECTION_COLUMNS)}
+
+        fixed = sum(
+            np.rint(column[name] * ATS_WEIGHTS[name])
+            for name in ('contact', 'summary', 'experience', 'format')
+        )
+        education = np.where(
+            self.require_gpa[None, :],
+            np.rint(column['education_gpa'] * ATS_WEIGHTS['education'])[:, None],
+            np.rint(column['education'] * ATS_WEIGHTS['education'])[:, None]
+        )
+        skills = np.rint(self.skill_scores(features) * ATS_WEIGHTS['skills'])
+
+        scores = fixed[:, None] + education + skills
+        scores[~features['is_resume']] = 0
+        return scores.astype(np.int64)
+
+    def score_texts(self, texts):
+        """Extract features and score in one call"""
+        return self.score(self.extract_features(texts))
+
+    def rank_roles(self, text, top_k=5):
+        """Return the top_k (role, ats_score) pairs for one resume"""
+        scores = self.score_texts([text])[0]
+        order = np.argsort(-scores, kind='stable')[:top_k]
+        return [(self.role_names[r], int(scores[r])) for r in order]
+
+    def rank_resumes(self, features, role, top_k=10):
+        """Return the top_k (resume index, ats_score) pairs for a role"""
+        if role not in self._role_index:
+            raise ValueError(f"Unknown job role: {role}")
+        scores = self.score(features)[:, self._role_index[role]]
+        order = np.argsort(-scores, kind='stable')[:top_k]
+        return [(int(i), int(scores[i])) for i in order]
+
+
+_ats_scorer = None
+_ats_scorer_lock = threading.Lock()
+
+
+def get_ats_scorer():
+    """Return the process-wide scorer over all JOB_ROLES roles"""
+    global _ats_scorer
+    if _ats_scorer is None:
+        with _ats_scorer_lock:
+            if _ats_scorer is None:
+                _ats_scorer = ATSScorer()
+    return _ats_scorer
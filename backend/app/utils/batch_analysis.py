@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import json
+import os
+
+from .ai_resume_analyzer import (
+    ANALYSIS_JSON_SCHEMA, MODEL_PROVIDERS, AIResumeAnalyzer, semantic_match_hint
+)
+from .executor import run_blocking
+from .json_repair import parse_json
+from .llm_client import get_llm_rate_limiter, get_llm_semaphore
+from .llm_output import ANALYSIS_RESPONSE_SCHEMA, BATCH_RESPONSE_SCHEMA, get_llm_output_stats
+from .llm_router import get_llm_router
+from .prompt_compaction import compact_resume_text, estimate_tokens
+
+
+# Most resumes packed into one request, and most compacted resume tokens per
+# request; larger batches risk truncated responses
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "5"))
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "12000"))
+
+
+def make_resume_id(text):
+    """Stable ID for a resume: the same text always gets the same ID"""
+    return "r" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class BatchResumeAnalyzer:
+    """Scores many resumes against one job description, several per LLM request.
+
+    The instructions and job description are sent once per batch instead of
+    once per resume. Each resume is tagged with its ID and the model returns
+    {"results": [...]} with the ID in every entry, which is how the results
+    are split back out. Batches run concurrently under the per-worker LLM
+    semaphore and the process-wide request rate limiter. Resumes already in
+    the LLM response cache are not sent at all, fresh results are cached per
+    resume, and a resume missing from its batch's response (or cut short by
+    truncation) is retried on its own. A batch whose request failed is not
+    retried; its resumes get the error.
+    """
+
+    def __init__(self, analyzer=None, batch_size=None, token_budget=None):
+        self.analyzer = analyzer or AIResumeAnalyzer()
+        self.batch_size = batch_size or LLM_BATCH_SIZE
+        self.token_budget = token_budget or LLM_BATCH_TOKEN_BUDGET
+
+    def build_prompt(self, items, job_description=None, job_role=None):
+        """Prompt analyzing items, a list of (resume ID, resume text) pairs"""
+        prompt = f"""
+        You are an expert resume analyst and career coach.
+        Your task is to analyze EACH of the {len(items)} resumes below, content AND structure/formatting, independently of the others.
+
+        IMPORTANT:
+        1. Return ONLY valid JSON of the form {{"results": [...]}} with exactly one entry per resume.
+        2. Each entry must include "resume_id", copied exactly from the resume's header line.
+        3. Evaluate strictly. Do NOT give high scores to poorly formatted resumes even if they have keywords.
+        4. A resume with poor formatting (e.g., long paragraphs, no bullet points, typos, lack of sections) should NOT score above 60, regardless of content match.
+        5. Detect typos (e.g. "Micro-soft") and penalize accordingly.
+
+        Structure each entry exactly like this, plus its "resume_id":
+        {ANALYSIS_JSON_SCHEMA}
+        """
+
+        if job_role:
+            prompt += f"""
+            Target Job Role: {job_role}
+            """
+
+        if job_description:
+            prompt += f"""
+            Job Description to compare against:
+            {job_description}
+            """
+
+        for resume_id, text in items:
+            hint = semantic_match_hint(text, job_description or job_role)
+            prompt += f"\n=== RESUME {resume_id} ===\n{hint}\n{text}\n=== END RESUME {resume_id} ===\n"
+        return prompt
+
+    def _pack(self, items):
+        """Split (ID, text) pairs into batches by count and token budget"""
+        batches = []
+        current = []
+        used = 0
+        for resume_id, text in items:
+            tokens = estimate_tokens(text)
+            if current and (len(current) >= self.batch_size or used + tokens > self.token_budget):
+                batches.append(current)
+                current = []
+                used = 0
+            current.append((resume_id, text))
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def split_results(data):
+        """Map resume ID -> analysis dict from a batch response, repairing
+        malformed JSON; a truncated response yields the entries it completed"""
+        parsed, repaired = parse_json(data)
+        get_llm_output_stats().record('repaired' if repaired else 'clean')
+        entries = parsed.get("results", []) if isinstance(parsed, dict) else parsed
+        results = {}
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get("resume_id") is not None:
+                results[str(entry.pop("resume_id"))] = entry
+        return results
+
+    async def _run_batch(self, router, batch, job_description, job_role, preferred, prompts):
+        """Analyze one batch. Returns (resume ID -> result for the resumes the
+        model answered, None), or ({}, error message) if the request failed or
+        its response could not be parsed at all"""
+        # The prompt's semantic hints read and write the embedding store
+        prompt = await run_blocking(self.build_prompt, batch, job_description, job_role)
+        try:
+            async with get_llm_semaphore():
+                await get_llm_rate_limiter().acquire_async()
+                text, provider = await router.generate_async(prompt, preferred, response_schema=BATCH_RESPONSE_SCHEMA)
+        except Exception as e:
+            print(f"Error in batch analysis of {len(batch)} resumes: {str(e)}")
+            return {}, f"AI analysis failed: {str(e)}"
+        try:
+            return await run_blocking(self._store_batch, batch, text, provider, prompts), None
+        except ValueError as e:
+            get_llm_output_stats().record('failed')
+            print(f"Error in batch analysis of {len(batch)} resumes: {str(e)}")
+            return {}, f"AI analysis returned an unreadable response: {str(e)}"
+
+    def _store_batch(self, batch, text, provider, prompts):
+        """Split a batch response and cache each complete entry; returns
+        resume ID -> result. Raises ValueError if the response is unreadable."""
+        entries = self.split_results(text)
+        results = {}
+        for resume_id, _ in batch:
+            # An entry cut short by truncation is retried rather than defaulted
+            if resume_id in entries and all(key in entries[resume_id] for key in ANALYSIS_RESPONSE_SCHEMA["required"]):
+                data = json.dumps(entries[resume_id])
+                # Cached under the resume's single-resume prompt, so both paths share analyses
+                results[resume_id] = self.analyzer._store_llm_result(prompts[resume_id], data, provider, record=False)
+        return results
+
+    def _prepare(self, text, job_description, job_role, cache_model, use_cache):
+        """Return (compacted text, single-resume prompt, cached result or None)"""
+        text, _ = compact_resume_text(text)
+        prompt = self.analyzer._analysis_prompt(text, job_description, job_role)
+        cached = self.analyzer._cached_llm_result(self.analyzer._cache_key(prompt, cache_model), use_cache)
+        return text, prompt, cached
+
+    async def analyze_async(self, resumes, job_description=None, job_role=None, preferred=None, use_cache=True):
+        """Analyze resumes, a list of texts or {"id": ..., "text": ...} dicts.
+
+        Returns one result per input, in order, each shaped like
+        analyze_resume_with_llm's plus "resume_id" and "batched" (whether it
+        came from a batch request rather than the cache or a retry). Resumes
+        without an ID get one from their text, so identical texts share one
+        analysis; raises ValueError if two resumes are given the same ID.
+        """
+        ids = []
+        texts = {}
+        for resume in resumes:
+            if isinstance(resume, dict) and resume.get("id") is not None:
+                resume_id, text = str(resume["id"]), resume.get("text", "") or ""
+                if resume_id in texts:
+                    raise ValueError(f"Duplicate resume id: {resume_id}")
+            else:
+                text = (resume.get("text", "") if isinstance(resume, dict) else resume) or ""
+                resume_id = make_resume_id(text)
+            ids.append(resume_id)
+            texts[resume_id] = text
+
+        router = get_llm_router()
+        candidates = router.candidates(preferred)
+        if not candidates:
+            error = "No AI model is available. Please add GOOGLE_API_KEY or OPENROUTER_API_KEY to your .env file."
+            return [{"error": error, "resume_id": resume_id, "batched": False} for resume_id in ids]
+
+        results = {}
+        prompts = {}
+        pending = []
+        for resume_id, text in texts.items():
+            if not text.strip():
+                results[resume_id] = {"error": "Resume text is required for analysis."}
+        # Compaction, the prompt's embeddings and the cache lookup are
+        # blocking (CPU and SQLite), so they run on the analysis executor
+        to_prepare = [resume_id for resume_id in texts if resume_id not in results]
+        prepared = await asyncio.gather(*(
+            run_blocking(self._prepare, texts[resume_id], job_description, job_role, candidates[0].model, use_cache)
+            for resume_id in to_prepare
+        ))
+        for resume_id, (text, prompt, cached) in zip(to_prepare, prepared):
+            prompts[resume_id] = prompt
+            if cached:
+                results[resume_id] = cached
+            else:
+                pending.append((resume_id, text))
+
+        batches = self._pack(pending)
+        outcomes = await asyncio.gather(*(
+            self._run_batch(router, batch, job_description, job_role, preferred, prompts) for batch in batches
+        ))
+        for batch, (batch_results, error) in zip(batches, outcomes):
+            if error:
+                # Every provider already failed this request; retrying each
+                # resume would only multiply the failing calls
+                batch_results = {resume_id: {"error": error} for resume_id, _ in batch}
+            for result in batch_results.values():
+                result["batched"] = True
+            results.update(batch_results)
+
+        # Retry the resumes a parsed batch response left out one at a time
+        missing = [resume_id for resume_id, _ in pending if resume_id not in results]
+        if missing:
+            print(f"Batch analysis: retrying {len(missing)} resume(s) individually")
+            get_llm_output_stats().record_retry(len(missing))
+            retried = await asyncio.gather(*(
+                self.analyzer.analyze_resume_with_llm_async(texts[resume_id], job_description, job_role, preferred, use_cache)
+                for resume_id in missing
+            ))
+            results.update(zip(missing, retried))
+
+        output = []
+        for resume_id in ids:
+            result = dict(results[resume_id])
+            result["resume_id"] = resume_id
+            result.setdefault("batched", False)
+            output.append(result)
+        return output
+
+    def analyze(self, resumes, job_description=None, job_role=None, preferred=None, use_cache=True):
+        """Blocking analyze_async, for callers without an event loop (Streamlit)"""
+        return asyncio.run(self.analyze_async(resumes, job_description, job_role, preferred, use_cache))
+
+    async def analyze_resumes_async(self, resumes, job_role=None, role_info=None, model="Google Gemini"):
+        """Batch counterpart of AIResumeAnalyzer.analyze_resume_async: one
+        formatted analysis per resume, in order, each with its resume_id"""
+        job_description = self.analyzer._role_job_description(job_role, role_info)
+        results = await self.analyze_async(
+            resumes, job_description, job_role, MODEL_PROVIDERS.get(model, "gemini")
+        )
+
+        analyses = []
+        for result in results:
+            analysis = self.analyzer._format_analysis(result, result.get("model_used", model))
+            if "error" in result:
+                analysis["error"] = result["error"]
+            analysis["resume_id"] = result["resume_id"]
+            analysis["batched"] = result["batched"]
+            analyses.append(analysis)
+        return analyses
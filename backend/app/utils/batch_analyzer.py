@@ -0,0 +1,231 @@
+"""
+Batch resume analysis.
+
+Runs text extraction and rule-based ATS scoring for many resumes across a
+process pool and streams each result to a JSONL file or SQLite database as it
+completes. Re-running a batch against the same output skips resumes that are
+already done.
+
+Usage (from backend/):
+    python -m app.utils.batch_analyzer resumes/ --role "Data Scientist" --output results.jsonl
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from ..config.job_roles import JOB_ROLES
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+
+def find_role(role):
+    """Return the JOB_ROLES entry for a role name, searching every category"""
+    for roles in JOB_ROLES.values():
+        if role in roles:
+            return roles[role]
+    raise ValueError(f"Unknown job role: {role}")
+
+
+def collect_resume_paths(paths):
+    """Expand files and directories into a sorted list of resume file paths"""
+    resume_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        resume_paths.append(os.path.abspath(os.path.join(root, name)))
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            resume_paths.append(os.path.abspath(path))
+    return sorted(set(resume_paths))
+
+
+class JsonlResultWriter:
+    """Appends one JSON line per analyzed resume"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def done_keys(self):
+        """Return the (path, role) pairs already present in the output"""
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written last line of an interrupted run
+                if record.get('status') == 'ok':
+                    done.add((record['path'], record['role']))
+        return done
+
+    def write(self, record):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class SqliteResultWriter:
+    """Stores one row per analyzed resume in a batch_results table"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS batch_results (
+            path TEXT NOT NULL,
+            role TEXT NOT NULL,
+            status TEXT NOT NULL,
+            ats_score REAL,
+            result TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (path, role)
+        )
+        ''')
+        self.conn.commit()
+
+    def done_keys(self):
+        """Return the (path, role) pairs already analyzed successfully"""
+        cursor = self.conn.execute("SELECT path, role FROM batch_results WHERE status = 'ok'")
+        return set(cursor.fetchall())
+
+    def write(self, record):
+        self.conn.execute('''
+        INSERT OR REPLACE INTO batch_results (path, role, status, ats_score, result)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (
+            record['path'],
+            record['role'],
+            record['status'],
+            record.get('ats_score'),
+            json.dumps(record)
+        ))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def get_result_writer(output):
+    """Pick the writer from the output file extension"""
+    if output.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        return SqliteResultWriter(output)
+    return JsonlResultWriter(output)
+
+
+_worker_analyzer = None
+
+
+def _init_worker():
+    # Each batch worker OCRs its own pages; don't fan out a second pool per worker
+    os.environ.setdefault("OCR_MAX_WORKERS", "1")
+
+
+def analyze_file(path, role, job_requirements):
+    """Extract and score one resume; runs inside a pool worker"""
+    global _worker_analyzer
+    from .resume_analyzer import ResumeAnalyzer
+
+    if _worker_analyzer is None:
+        _worker_analyzer = ResumeAnalyzer()
+
+    started = time.perf_counter()
+    record = {'path': path, 'role': role}
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+        if path.lower().endswith('.docx'):
+            text = _worker_analyzer.extract_text_from_docx(content)
+        else:
+            text = _worker_analyzer.extract_text_from_pdf(content)
+
+        if not text.strip():
+            raise ValueError("Could not extract text from file")
+
+        analysis = _worker_analyzer.analyze_resume({'raw_text': text}, job_requirements)
+        if 'error' in analysis:
+            raise ValueError(analysis['error'])
+
+        record.update(status='ok', ats_score=analysis.get('ats_score', 0), analysis=analysis)
+    except Exception as e:
+        record.update(status='error', error=str(e))
+
+    record['seconds'] = round(time.perf_counter() - started, 3)
+    record['analyzed_at'] = datetime.now().isoformat()
+    return record
+
+
+def analyze_batch(paths, role, output='batch_results.jsonl', max_workers=None, progress_every=25):
+    """Analyze every resume under paths for a JOB_ROLES role.
+
+    Results are streamed to output (JSONL, or SQLite for .db/.sqlite files)
+    as they complete; resumes already analyzed into the same output are
+    skipped. Returns a summary with counts and resumes per second.
+    """
+    job_requirements = find_role(role)
+    writer = get_result_writer(output)
+    done = writer.done_keys()
+    resume_paths = collect_resume_paths(paths)
+    # The output may hold results for other roles and folders; only this
+    # run's resumes count towards its totals
+    pending = [path for path in resume_paths if (path, role) not in done]
+
+    summary = {
+        'total': len(resume_paths),
+        'skipped': len(resume_paths) - len(pending),
+        'processed': 0,
+        'failed': 0
+    }
+    started = time.perf_counter()
+    try:
+        if pending:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+                futures = [pool.submit(analyze_file, path, role, job_requirements) for path in pending]
+                for future in as_completed(futures):
+                    record = future.result()
+                    writer.write(record)
+                    summary['processed'] += 1
+                    if record['status'] != 'ok':
+                        summary['failed'] += 1
+
+                    if progress_every and summary['processed'] % progress_every == 0:
+                        elapsed = time.perf_counter() - started
+                        print(f"{summary['processed']}/{len(pending)} resumes, "
+                              f"{summary['processed'] / elapsed:.1f} resumes/s")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    summary['seconds'] = round(elapsed, 3)
+    summary['resumes_per_second'] = round(summary['processed'] / elapsed, 2) if elapsed > 0 else 0
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a directory of resumes against a job role")
+    parser.add_argument('paths', nargs='+', help="Resume files or directories (.pdf, .docx)")
+    parser.add_argument('--role', required=True, help="Job role name from JOB_ROLES, e.g. 'Data Scientist'")
+    parser.add_argument('--output', default='batch_results.jsonl', help="JSONL file, or .db/.sqlite for SQLite")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    summary = analyze_batch(args.paths, args.role, output=args.output, max_workers=args.workers)
+    print(f"Analyzed {summary['processed']} resumes ({summary['failed']} failed, "
+          f"{summary['skipped']} already done) in {summary['seconds']}s "
+          f"- {summary['resumes_per_second']} resumes/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+SQLite write throughput under concurrent dashboard reads.
+
+Writer threads insert resume_data rows (the save_resume_data statement)
+while reader threads run the get_resume_stats queries, against a scratch
+database. Runs once with the pooled WAL connections used by the app and once
+the way connections used to be made (a new default connection per call,
+rollback journal), and prints inserts/sec and reads/sec for each.
+
+Usage (from backend/):
+    python -m app.utils.db_benchmark --readers 4 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from ..config.database import ConnectionPool
+
+
+CREATE_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS resume_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        phone TEXT NOT NULL,
+        linkedin TEXT,
+        github TEXT,
+        portfolio TEXT,
+        summary TEXT,
+        target_role TEXT,
+        target_category TEXT,
+        education TEXT,
+        experience TEXT,
+        projects TEXT,
+        skills TEXT,
+        template TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS resume_analysis (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        resume_id INTEGER,
+        ats_score REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    '''
+]
+
+INSERT_RESUME = '''
+INSERT INTO resume_data (
+    name, email, phone, linkedin, github, portfolio,
+    summary, target_role, target_category, education,
+    experience, projects, skills, template
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+READ_QUERIES = [
+    'SELECT COUNT(*) FROM resume_data',
+    'SELECT AVG(ats_score) FROM resume_analysis',
+    'SELECT name, target_role, created_at FROM resume_data ORDER BY created_at DESC LIMIT 5'
+]
+
+
+def _resume_row(number):
+    return (
+        f"Candidate {number}", f"candidate{number}@example.com", "555-0100", "", "", "",
+        "Engineer with experience in Python and SQL. " * 5, "Data Scientist", "Data Science",
+        "['B.Sc. Computer Science']", "['Analyst at Example Corp']", "[]",
+        "['Python', 'SQL', 'Pandas']", "modern"
+    )
+
+
+def legacy_connect(db_path):
+    """A connection made the way the app used to: default settings, per call"""
+    return sqlite3.connect(db_path, timeout=30)
+
+
+def run(connect, db_path, readers, writers, seconds):
+    """Return (inserts, reads, errors) completed in seconds; connect() opens or
+    checks out a connection and close() releases it"""
+    conn = connect()
+    for statement in CREATE_TABLES:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+    stop = threading.Event()
+    counts = {'inserts': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def count(key):
+        with lock:
+            counts[key] += 1
+
+    def writer(offset):
+        number = offset
+        while not stop.is_set():
+            conn = connect()
+            try:
+                conn.execute(INSERT_RESUME, _resume_row(number))
+                conn.commit()
+                count('inserts')
+            except sqlite3.Error:
+                count('errors')
+            finally:
+                conn.close()
+            number += writers
+
+    def reader():
+        while not stop.is_set():
+            conn = connect()
+            try:
+                for query in READ_QUERIES:
+                    conn.execute(query).fetchall()
+                count('reads')
+            except sqlite3.Error:
+                count('errors')
+            finally:
+                conn.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts['inserts'], counts['reads'], counts['errors']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite inserts/sec under concurrent readers")
+    parser.add_argument('--readers', type=int, default=4, help="Reader threads (default: 4)")
+    parser.add_argument('--writers', type=int, default=2, help="Writer threads (default: 2)")
+    parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each run (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pooled_path = os.path.join(directory, 'pooled.db')
+        legacy_path = os.path.join(directory, 'legacy.db')
+        pool = ConnectionPool(pooled_path)
+        modes = [
+            ('pooled WAL', pool.acquire, pooled_path),
+            ('per-call, rollback journal', lambda: legacy_connect(legacy_path), legacy_path)
+        ]
+        print(f"{args.writers} writer(s), {args.readers} reader(s), {args.seconds:g}s per run")
+        for name, connect, path in modes:
+            inserts, reads, errors = run(connect, path, args.readers, args.writers, args.seconds)
+            print(f"{name:>28}: {inserts / args.seconds:9.0f} inserts/sec "
+                  f"{reads / args.seconds:9.0f} reads/sec  ({errors} errors)")
+        pool.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,362 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import sklearn
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ..config.courses import COURSES_BY_CATEGORY
+from ..config.job_roles import JOB_ROLES
+from ..config.skill_aliases import SKILL_ALIASES
+
+
+# Bump when the corpus construction or vectorizer settings change
+EMBEDDING_MODEL_VERSION = "1"
+# Few dimensions generalize best on a corpus this small (about 80 documents)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "24"))
+# Most embeddings kept per model version (about 10 MB at 24 dimensions)
+EMBEDDING_STORE_MAX_ROWS = int(os.getenv("EMBEDDING_STORE_MAX_ROWS", "100000"))
+
+# Words plus skill tokens such as c++, c#, node.js and ci/cd
+TOKEN_PATTERN = r"(?u)\w[\w+#./-]*[\w+#]|\w"
+
+
+def role_text(role, info, category=""):
+    """Describe a JOB_ROLES role as one text: title, description and skills"""
+    recommended = info.get('recommended_skills', {})
+    skills = info.get('required_skills', []) + recommended.get('technical', []) + recommended.get('soft', [])
+    return f"{role}. {category}. {info.get('description', '')}. Skills: {', '.join(skills)}"
+
+
+def _corpus(job_roles):
+    """Training documents: one per role (with its course titles), and one per
+    skill with its aliases so that alternate names land close together"""
+    documents = []
+    for category, roles in job_roles.items():
+        for role, info in roles.items():
+            courses = COURSES_BY_CATEGORY.get(category, {}).get(role, [])
+            documents.append(role_text(role, info, category) + ". " + ". ".join(course[0] for course in courses))
+    for skill, aliases in SKILL_ALIASES.items():
+        documents.append(", ".join([skill] + aliases))
+    return documents
+
+
+class SemanticModel:
+    """TF-IDF + truncated SVD (latent semantic analysis) text embeddings.
+
+    Fitted once, deterministically, on the bundled JOB_ROLES, course and
+    skill alias texts, so it runs on CPU with no download or network. Terms
+    that appear together in those texts (React and frontend) embed near
+    each other; terms outside their vocabulary (PostgreSQL) are ignored.
+    Embeddings are L2-normalized float32 rows; a dot product is the cosine
+    similarity. Text with no known terms embeds to zeros.
+    """
+
+    def __init__(self, job_roles=None, dim=None):
+        documents = _corpus(JOB_ROLES if job_roles is None else job_roles)
+        dim = dim or EMBEDDING_DIM
+        self.vectorizer = TfidfVectorizer(
+            token_pattern=TOKEN_PATTERN, ngram_range=(1, 2), sublinear_tf=True, stop_words='english'
+        )
+        tfidf = self.vectorizer.fit_transform(documents)
+        self.dim = min(dim, tfidf.shape[0] - 1, tfidf.shape[1] - 1)
+        self.svd = TruncatedSVD(n_components=self.dim, random_state=0)
+        self.svd.fit(tfidf)
+
+        fingerprint = "\x00".join(documents + [str(self.dim), sklearn.__version__, EMBEDDING_MODEL_VERSION])
+        self.version = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+
+    def transform(self, texts):
+        vectors = self.svd.transform(self.vectorizer.transform(texts)).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class EmbeddingStore:
+    """Float32 embedding matrix on disk, memory-mapped.
+
+    Rows live in a matrix file next to an SQLite index of text key -> row,
+    one matrix per model version. The matrix file grows by doubling, and
+    appends are serialized through an SQLite write transaction, so several
+    processes can share the store.
+
+    The store holds at most max_rows embeddings per version
+    (EMBEDDING_STORE_MAX_ROWS). An append that would pass it first compacts
+    the store: the newest half of the rows is copied into a new matrix file
+    and the old one is deleted. Each compaction bumps the version's epoch in
+    the index, which tells other processes to reload their row map before
+    reading. Matrices of earlier model versions are not cleaned up; to reset
+    the store, stop the app and delete EMBEDDING_STORE_DIR.
+    """
+
+    def __init__(self, directory, version, dim, max_rows=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.dim = dim
+        self.version = version
+        self.max_rows = max_rows or EMBEDDING_STORE_MAX_ROWS
+        self.epoch = None
+        self._rows = {}
+        self._matrix = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS embedding_rows (
+            version TEXT NOT NULL,
+            text_key TEXT NOT NULL,
+            row_number INTEGER NOT NULL,
+            kind TEXT,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (version, text_key)
+        )
+        ''')
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS embedding_epochs (
+            version TEXT PRIMARY KEY,
+            epoch INTEGER NOT NULL
+        )
+        ''')
+        self._conn.commit()
+
+    def _matrix_path(self, epoch):
+        suffix = f".{epoch}" if epoch else ""
+        return os.path.join(self.directory, f"{self.version}{suffix}.f32")
+
+    @property
+    def matrix_path(self):
+        return self._matrix_path(self.epoch or 0)
+
+    def _sync(self):
+        """Reload the row map if another process compacted the store; call
+        inside a transaction"""
+        row = self._conn.execute('SELECT epoch FROM embedding_epochs WHERE version = ?', (self.version,)).fetchone()
+        epoch = row[0] if row else 0
+        if epoch != self.epoch:
+            self.epoch = epoch
+            self._matrix = None
+            self._rows = dict(self._conn.execute(
+                'SELECT text_key, row_number FROM embedding_rows WHERE version = ?', (self.version,)
+            ).fetchall())
+
+    def _refresh(self, keys):
+        """Pick up rows other processes added for keys missing from the in-memory index"""
+        missing = [key for key in keys if key not in self._rows]
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            self._rows.update(self._conn.execute(
+                f'SELECT text_key, row_number FROM embedding_rows WHERE version = ? '
+                f'AND text_key IN ({", ".join("?" * len(chunk))})',
+                [self.version] + chunk
+            ).fetchall())
+
+    def _capacity(self):
+        return self._matrix.shape[0] if self._matrix is not None else 0
+
+    def _open(self, rows_needed):
+        """Map the matrix file, growing it to hold at least rows_needed rows"""
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+        capacity = size // row_bytes
+        if capacity < rows_needed:
+            capacity = max(rows_needed, capacity * 2, 1024)
+            with open(self.matrix_path, 'ab') as f:
+                f.truncate(capacity * row_bytes)
+        if self._matrix is None or self._capacity() != capacity:
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _compact(self, keep):
+        """Copy the newest keep rows into the next epoch's matrix file and
+        re-point the index at it; call inside a write transaction. Returns
+        the old matrix path, to delete once the transaction commits."""
+        kept = self._conn.execute('''
+        SELECT text_key, row_number, kind, created_at FROM embedding_rows
+        WHERE version = ? ORDER BY created_at DESC, row_number DESC LIMIT ?
+        ''', (self.version, keep)).fetchall()
+        if kept:
+            self._open(max(row for _, row, _, _ in kept) + 1)
+        old_matrix, old_path = self._matrix, self.matrix_path
+
+        epoch = self.epoch + 1
+        path = self._matrix_path(epoch)
+        capacity = max(keep, 1024)
+        with open(path, 'wb') as f:
+            f.truncate(capacity * self.dim * 4)
+        matrix = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+        for new_row, (_, old_row, _, _) in enumerate(kept):
+            matrix[new_row] = old_matrix[old_row]
+        matrix.flush()
+
+        self._conn.execute('DELETE FROM embedding_rows WHERE version = ?', (self.version,))
+        self._conn.executemany(
+            'INSERT INTO embedding_rows (version, text_key, row_number, kind, created_at) VALUES (?, ?, ?, ?, ?)',
+            [(self.version, key, new_row, kind, created_at)
+             for new_row, (key, _, kind, created_at) in enumerate(kept)]
+        )
+        self._conn.execute(
+            'INSERT OR REPLACE INTO embedding_epochs (version, epoch) VALUES (?, ?)', (self.version, epoch)
+        )
+        self.epoch = epoch
+        self._matrix = matrix
+        self._rows = {key: new_row for new_row, (key, _, _, _) in enumerate(kept)}
+        print(f"Compacted embedding store to {len(kept)} rows")
+        return old_path
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, keys):
+        """Return {key: vector} for the keys already stored"""
+        with self._lock:
+            # One read transaction, so the epoch, the rows and the matrix
+            # file all come from the same compaction
+            self._conn.execute('BEGIN')
+            try:
+                self._sync()
+                self._refresh(keys)
+                found = [key for key in keys if key in self._rows]
+                if not found:
+                    return {}
+                rows = [self._rows[key] for key in found]
+                if self._matrix is None or max(rows) >= self._capacity():
+                    self._open(max(rows) + 1)
+                vectors = np.array(self._matrix[rows])
+            finally:
+                self._conn.commit()
+        return dict(zip(found, vectors))
+
+    def add(self, keys, vectors, kind=None):
+        """Append embeddings for keys not stored yet, compacting the store
+        first if they would not fit in max_rows"""
+        with self._lock:
+            old_path = None
+            try:
+                self._conn.execute('BEGIN IMMEDIATE')
+                self._sync()
+                self._refresh(keys)
+                new_keys = set(key for key in keys if key not in self._rows)
+                next_row = self._conn.execute(
+                    'SELECT COALESCE(MAX(row_number) + 1, 0) FROM embedding_rows WHERE version = ?', (self.version,)
+                ).fetchone()[0]
+                if new_keys and next_row + len(new_keys) > self.max_rows:
+                    old_path = self._compact(max(0, min(self.max_rows // 2, self.max_rows - len(new_keys))))
+                    next_row = len(self._rows)
+                self._open(next_row + len(keys))
+                new = {}
+                for key, vector in zip(keys, vectors):
+                    if key not in self._rows and key not in new:
+                        new[key] = next_row
+                        self._matrix[next_row] = vector
+                        next_row += 1
+                if new:
+                    # Vectors reach the file before the index points at them
+                    self._matrix.flush()
+                    now = time.time()
+                    self._conn.executemany(
+                        'INSERT INTO embedding_rows (version, text_key, row_number, kind, created_at) VALUES (?, ?, ?, ?, ?)',
+                        [(self.version, key, row, kind, now) for key, row in new.items()]
+                    )
+                self._conn.commit()
+                self._rows.update(new)
+            except Exception as e:
+                self._conn.rollback()
+                # The in-memory state may describe the rolled-back compaction
+                self.epoch = None
+                old_path = None
+                print(f"Error storing embeddings: {str(e)}")
+        if old_path and os.path.exists(old_path):
+            try:
+                os.remove(old_path)
+            except OSError as e:
+                # Still mapped elsewhere (Windows); the next compaction's file replaces it
+                print(f"Error removing old embedding matrix: {str(e)}")
+
+
+class EmbeddingEngine:
+    """Embeds and compares resumes, role descriptions and job postings.
+
+    Every embedding is stored in the shared EmbeddingStore under a hash of
+    its normalized text, so the same text is never embedded twice, across
+    calls, requests and restarts.
+    """
+
+    def __init__(self, model=None, store_dir=None):
+        if store_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            store_dir = os.getenv("EMBEDDING_STORE_DIR", os.path.join(base_dir, 'embeddings'))
+        self.model = model or SemanticModel()
+        self.store = EmbeddingStore(store_dir, self.model.version, self.model.dim)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def text_key(text):
+        normalized = re.sub(r'\s+', ' ', text or '').strip().lower()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def embed(self, texts, kind=None):
+        """Return an (n, dim) float32 array of embeddings for texts.
+
+        kind ("resume", "role", "job_description", ...) is recorded with new
+        embeddings for inspection only.
+        """
+        keys = [self.text_key(text) for text in texts]
+        vectors = self.store.get(list(dict.fromkeys(keys)))
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            computed = self.model.transform(list(missing.values()))
+            self.store.add(list(missing), computed, kind)
+            vectors.update(zip(missing, computed))
+
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        if not keys:
+            return np.zeros((0, self.model.dim), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def similarity(self, text_a, text_b, kind=None):
+        """Cosine similarity (0 when either text has no known terms)"""
+        vectors = self.embed([text_a, text_b], kind)
+        return float(vectors[0] @ vectors[1])
+
+    def similarities(self, query, candidates, kind=None):
+        """Cosine similarity of query to each candidate text"""
+        return self.embed(candidates, kind) @ self.embed([query], kind)[0]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'stored': len(self.store),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'dim': self.model.dim,
+                'model_version': self.model.version
+            }
+
+
+_embedding_engine = None
+_embedding_engine_lock = threading.Lock()
+
+
+def get_embedding_engine():
+    """Return the process-wide embedding engine"""
+    global _embedding_engine
+    if _embedding_engine is None:
+        with _embedding_engine_lock:
+            if _embedding_engine is None:
+                _embedding_engine = EmbeddingEngine()
+    return _embedding_engine
@@ -0,0 +1,38 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Threads for the blocking stages (text extraction, rule-based scoring, the
+# SQLite-backed caches). OCR itself runs in the shared OCR process pool, so
+# these threads mostly wait.
+ANALYSIS_MAX_WORKERS = int(os.getenv("ANALYSIS_MAX_WORKERS", "0")) or min(8, (os.cpu_count() or 1) + 2)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_analysis_executor():
+    """Return the bounded thread pool shared by all blocking analysis stages"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS, thread_name_prefix="analysis")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the analysis executor without stalling the event loop.
+
+    The caller's context is carried over, so per-request state such as the
+    CopyMeter keeps counting inside the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_analysis_executor(), call)
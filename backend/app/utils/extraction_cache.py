@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import threading
+
+from .sqlite_lru import SQLiteLRUCache
+
+
+class ExtractionCache(SQLiteLRUCache):
+    """Content-addressed cache of extracted resume text, stored in SQLite.
+
+    Entries are keyed by the SHA-256 of the uploaded file bytes and the
+    extractor options that produced the text (see make_key), so a
+    re-uploaded resume skips pdfplumber/pypdf/OCR entirely. The total size of
+    cached text is bounded; least recently used entries are evicted first.
+    """
+
+    name = "extraction cache"
+
+    def __init__(self, db_path=None, max_bytes=None):
+        if db_path is None:
+            # Same location as resume_data.db (backend/)
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_path = os.getenv("EXTRACTION_CACHE_DB", os.path.join(base_dir, 'extraction_cache.db'))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("EXTRACTION_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+        super().__init__(
+            db_path,
+            table='extraction_cache',
+            key_column='content_hash',
+            columns=[('extractor', 'TEXT NOT NULL'), ('text', 'TEXT NOT NULL'), ('pages', 'TEXT NOT NULL')],
+            max_bytes=max_bytes
+        )
+
+    @staticmethod
+    def hash_bytes(data):
+        """Return the SHA-256 of the given file bytes"""
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def make_key(cls, data, options=''):
+        """Return the cache key for file bytes extracted with the given
+        options, a string describing every setting that affects the text"""
+        if not options:
+            return cls.hash_bytes(data)
+        return hashlib.sha256(f"{cls.hash_bytes(data)}\x00{options}".encode('utf-8')).hexdigest()
+
+    def get(self, content_hash):
+        """Return the cached entry as a dict, or None on a miss"""
+        row = self._read(content_hash)
+        if row is None:
+            return None
+        return {
+            'text': row[1],
+            'extractor': row[0],
+            'pages': json.loads(row[2])
+        }
+
+    def put(self, content_hash, text, extractor, pages=None):
+        """Store extracted text for the given key and evict old entries if needed"""
+        if not text:
+            return
+        pages = pages if pages is not None else [text]
+        pages_json = json.dumps(pages)
+        size_bytes = len(text.encode('utf-8')) + len(pages_json.encode('utf-8'))
+        self._write(content_hash, (extractor, text, pages_json), size_bytes)
+
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """Return the process-wide extraction cache shared by all analyzers"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache()
+    return _extraction_cache
@@ -0,0 +1,185 @@
+import json
+import re
+
+
+LITERAL_PATTERN = re.compile(r'[^\s,:{}\[\]"]+')
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+JSON_ESCAPES = set('"\\/bfnrtu')
+CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def parse_json(text):
+    """Parse the first JSON object or array in an LLM response.
+
+    Returns (value, repaired). Text around the JSON (```json fences, a
+    sentence of preamble) is ignored. A response that does not parse is
+    repaired first; see repair_json. Raises ValueError if there is no
+    JSON in the text or it cannot be repaired.
+    """
+    starts = [index for index in (text.find('{'), text.find('[')) if index >= 0]
+    if not starts:
+        raise ValueError("No JSON object found in response")
+    start = min(starts)
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, start)
+        return value, False
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        return json.loads(repair_json(text[start:])), True
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Could not repair JSON: {str(e)}")
+
+
+def repair_json(text):
+    """Rewrite almost-JSON into JSON in one pass.
+
+    Fixes what LLMs typically get wrong: trailing commas, missing commas,
+    unescaped quotes, raw newlines and bad escapes inside strings, Python
+    True/False/None, unquoted values, and output cut off mid-string or
+    mid-array (open strings, arrays and objects are closed, a dangling key
+    gets null). Anything after the top-level value is dropped.
+    """
+    out = []
+    stack = []  # [opener, state]; state is what the container expects next
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+
+        if char == '"':
+            index, string = _read_string(text, index)
+            _before_value(out, stack)
+            out.append(string)
+            if stack and stack[-1] == ['{', 'key']:
+                stack[-1][1] = 'colon'
+            else:
+                _after_value(stack)
+            continue
+
+        if char in '{[':
+            _before_value(out, stack)
+            out.append(char)
+            stack.append([char, 'key' if char == '{' else 'value'])
+        elif char in '}]':
+            while stack and _closer(stack[-1][0]) != char:
+                _close(out, stack)
+            if not stack:
+                break
+            _close(out, stack)
+            if not stack:
+                break
+        elif char == ':':
+            if stack and stack[-1][0] == '{':
+                out.append(char)
+                stack[-1][1] = 'value'
+        elif char == ',':
+            # Drop leading and doubled commas
+            if stack and stack[-1][1] == 'comma':
+                out.append(char)
+                stack[-1][1] = 'key' if stack[-1][0] == '{' else 'value'
+        elif char.isspace():
+            out.append(char)
+        else:
+            literal = LITERAL_PATTERN.match(text, index).group()
+            index += len(literal)
+            literal = PYTHON_LITERALS.get(literal, literal)
+            try:
+                json.loads(literal)
+            except json.JSONDecodeError:
+                if index >= length:
+                    break  # Truncated mid-literal ("tr", "1."): drop it
+                literal = json.dumps(literal)
+            _before_value(out, stack)
+            out.append(literal)
+            _after_value(stack)
+            continue
+
+        index += 1
+
+    while stack:
+        _close(out, stack)
+    return ''.join(out)
+
+
+def _closer(opener):
+    return '}' if opener == '{' else ']'
+
+
+def _read_string(text, index):
+    """Read the string starting at index; returns (end index, JSON string literal)"""
+    parts = ['"']
+    index += 1
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char == '\\':
+            if index + 1 >= length:
+                break  # Truncated mid-escape
+            escaped = text[index + 1]
+            if escaped in JSON_ESCAPES and (escaped != 'u' or re.match(r'[0-9a-fA-F]{4}', text[index + 2:index + 6])):
+                parts.append(char + escaped)
+            else:
+                parts.append('\\\\' + escaped)
+            index += 2
+            continue
+        if char == '"':
+            if _closes_string(text, index + 1):
+                return index + 1, ''.join(parts) + '"'
+            parts.append('\\"')
+        elif char in CONTROL_ESCAPES:
+            parts.append(CONTROL_ESCAPES[char])
+        elif ord(char) < 0x20:
+            parts.append(f'\\u{ord(char):04x}')
+        else:
+            parts.append(char)
+        index += 1
+    return length, ''.join(parts) + '"'
+
+
+def _closes_string(text, index):
+    """Whether a quote followed by text[index:] ends its string, rather than
+    being an unescaped quote inside it"""
+    rest = text[index:].lstrip()
+    if not rest or rest[0] in ':}]':
+        return True
+    if rest[0] != ',':
+        return False
+    after = rest[1:].lstrip()
+    return not after or after[0] in '"{[]},-0123456789' or re.match(r'(true|false|null)\b', after) is not None
+
+
+def _before_value(out, stack):
+    """Insert a comma or colon the model left out before the next value"""
+    if not stack:
+        return
+    opener, state = stack[-1]
+    if state == 'comma':
+        out.append(',')
+        stack[-1][1] = 'key' if opener == '{' else 'value'
+    elif state == 'colon':
+        out.append(':')
+        stack[-1][1] = 'value'
+
+
+def _after_value(stack):
+    if stack:
+        stack[-1][1] = 'comma'
+
+
+def _close(out, stack):
+    """Close the innermost container, dropping a trailing comma and giving a
+    dangling key a null value"""
+    while out and out[-1].isspace():
+        out.pop()
+    opener, state = stack.pop()
+    if out and out[-1] == ',':
+        out.pop()
+    elif opener == '{' and state == 'colon':
+        out.append(':null')
+    elif opener == '{' and state == 'value':
+        out.append('null')
+    out.append(_closer(opener))
+    _after_value(stack)
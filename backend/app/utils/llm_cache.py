@@ -0,0 +1,88 @@
+import hashlib
+import os
+import re
+import threading
+
+from .sqlite_lru import SQLiteLRUCache
+
+
+class LLMResponseCache(SQLiteLRUCache):
+    """Persistent cache of LLM responses, stored in SQLite.
+
+    Entries are keyed by the SHA-256 of the model name, the prompt template
+    version and the whitespace-normalized prompt, so re-analyzing the same
+    resume for the same role (a Streamlit rerun, a double click) skips the API
+    call. Entries expire after a TTL, and the total size is bounded with least
+    recently used entries evicted first. Set LLM_CACHE_DISABLED=1 to turn the
+    cache off.
+    """
+
+    name = "LLM cache"
+
+    def __init__(self, db_path=None, max_bytes=None, ttl_seconds=None, enabled=None):
+        if db_path is None:
+            # Same location as resume_data.db (backend/)
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_path = os.getenv("LLM_CACHE_DB", os.path.join(base_dir, 'llm_cache.db'))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("LLM_CACHE_MAX_MB", "32")) * 1024 * 1024)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+        if enabled is None:
+            enabled = os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+        self.enabled = enabled
+        super().__init__(
+            db_path,
+            table='llm_cache',
+            key_column='cache_key',
+            columns=[('model', 'TEXT NOT NULL'), ('response', 'TEXT NOT NULL')],
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds
+        )
+
+    @staticmethod
+    def make_key(prompt, model, template_version):
+        """Return the cache key for a prompt sent to a model"""
+        normalized = re.sub(r'\s+', ' ', prompt).strip()
+        payload = f"{model}\x00{template_version}\x00{normalized}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached response text, or None on a miss or expired entry"""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key):
+        """Return (response text, model that produced it), or None on a miss
+        or expired entry"""
+        if not self.enabled:
+            return None
+        row = self._read(key)
+        return (row[1], row[0]) if row is not None else None
+
+    def put(self, key, response, model):
+        """Store a response and evict expired or old entries if needed"""
+        if not self.enabled or not response:
+            return
+        self._write(key, (model, response), len(response.encode('utf-8')))
+
+    def stats(self):
+        """Return hit/miss counters and the current cache size"""
+        stats = super().stats()
+        stats.update({'enabled': self.enabled, 'ttl_seconds': self.ttl_seconds})
+        return stats
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide LLM response cache"""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache()
+    return _llm_cache
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+import google.generativeai as genai
+
+
+# Most LLM calls one worker process keeps in flight at once; further requests
+# wait for a slot instead of piling onto the API and its rate limits
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Upstream request quota for rate-limited callers (batch analysis); 0 disables it
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "4"))
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_gemini_model(name):
+    """Return the shared GenerativeModel for a model name.
+
+    The model's async calls go through genai's process-wide async client, so
+    every request on the worker reuses the same gRPC channel instead of
+    opening a connection per call.
+    """
+    if name not in _models:
+        with _models_lock:
+            if name not in _models:
+                _models[name] = genai.GenerativeModel(name)
+    return _models[name]
+
+
+# asyncio primitives belong to one event loop, so keep a semaphore per loop
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_llm_semaphore():
+    """Return the LLM concurrency limiter for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+class RateLimiter:
+    """Spaces out requests to stay within a requests-per-minute quota.
+
+    A generic cell rate limiter: up to burst requests may go at once, after
+    which they are released one every 60 / rate_per_minute seconds.
+    reserve() books the next slot under a lock and returns how long to wait
+    for it, so it works from threads and from any event loop.
+    """
+
+    def __init__(self, rate_per_minute, burst=1):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self.tolerance = self.interval * (max(1, burst) - 1)
+        self.waited = 0.0
+        self._tat = time.monotonic()  # theoretical arrival time of the next request
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Book a request slot and return the seconds until it opens"""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            delay = max(0.0, tat - self.tolerance - now)
+            self._tat = tat + self.interval
+            self.waited += delay
+        return delay
+
+    def acquire(self):
+        time.sleep(self.reserve())
+
+    async def acquire_async(self):
+        await asyncio.sleep(self.reserve())
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter():
+    """Return the process-wide LLM request rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_RATE_BURST)
+    return _rate_limiter
@@ -0,0 +1,215 @@
+import re
+import threading
+
+from .json_repair import parse_json
+
+
+def _strings():
+    return {"type": "array", "items": {"type": "string"}}
+
+
+# JSON schema of one resume analysis, as documented in ANALYSIS_JSON_SCHEMA.
+# Providers with native structured output are constrained to it, and every
+# response is validated against it. Only the schema keywords Gemini accepts
+# are used (no ranges or additionalProperties); scores are clamped to 0-100
+# by validate_analysis instead.
+ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "candidate_info": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "role": {"type": "string"},
+                "experience": {"type": "string"},
+                "education": {"type": "string"}
+            }
+        },
+        "match_score": {"type": "integer"},
+        "match_status": {"type": "string"},
+        "formatting_score": {"type": "integer"},
+        "formatting_issues": _strings(),
+        "matched_skills": _strings(),
+        "missing_skills": _strings(),
+        "job_context": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "requirements_summary": {"type": "string"}
+            }
+        },
+        "recommendations": _strings(),
+        "overall_assessment": {"type": "string"},
+        "ats_score": {"type": "integer"},
+        "ats_keywords_missing": _strings()
+    },
+    "required": [
+        "candidate_info", "match_score", "match_status", "formatting_score",
+        "formatting_issues", "matched_skills", "missing_skills", "job_context",
+        "recommendations", "overall_assessment", "ats_score", "ats_keywords_missing"
+    ]
+}
+
+# {"results": [...]} of analyses tagged with resume_id, for batch prompts
+BATCH_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                **ANALYSIS_RESPONSE_SCHEMA,
+                "properties": {"resume_id": {"type": "string"}, **ANALYSIS_RESPONSE_SCHEMA["properties"]},
+                "required": ["resume_id"] + ANALYSIS_RESPONSE_SCHEMA["required"]
+            }
+        }
+    },
+    "required": ["results"]
+}
+
+MATCH_STATUSES = ["Excellent", "Good", "Moderate", "Poor"]
+DEFAULT_ASSESSMENT = "Analysis failed to generate assessment."
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def _match_status(score):
+    # Same bands as the report's score gauge
+    if score >= 80:
+        return "Excellent"
+    if score >= 60:
+        return "Good"
+    if score >= 40:
+        return "Moderate"
+    return "Poor"
+
+
+def _coerce(value, schema, path, problems):
+    """Coerce value to schema's type, noting each fix in problems"""
+    kind = schema["type"]
+    if kind == "object":
+        if not isinstance(value, dict):
+            if value is not None:
+                problems.append(f"{path}: expected an object")
+            value = {}
+        value = dict(value)
+        for key, field in schema.get("properties", {}).items():
+            if key not in value and key in schema.get("required", []):
+                problems.append(f"{path}.{key}: missing")
+            value[key] = _coerce(value.get(key), field, f"{path}.{key}", problems)
+        return value
+
+    if kind == "array":
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            problems.append(f"{path}: expected an array")
+            value = [value] if value != "" else []
+        return [_coerce(item, schema["items"], f"{path}[]", problems) for item in value if item is not None]
+
+    if kind == "integer":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            if value is not None:
+                problems.append(f"{path}: expected an integer")
+            match = NUMBER_PATTERN.search(str(value)) if value is not None else None
+            value = float(match.group()) if match else 0
+        score = min(100, max(0, int(round(value))))
+        if score != round(value):
+            problems.append(f"{path}: out of range")
+        return score
+
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        problems.append(f"{path}: expected a string")
+        # e.g. a recommendation given as {"title": ..., "detail": ...}
+        if isinstance(value, dict):
+            return " - ".join(str(item) for item in value.values())
+        if isinstance(value, list):
+            return ", ".join(str(item) for item in value)
+        return str(value)
+    return value
+
+
+def validate_analysis(data):
+    """Validate a parsed analysis against ANALYSIS_RESPONSE_SCHEMA.
+
+    Returns (analysis, problems): the analysis with every documented field
+    present and of the documented type (numbers in strings parsed, scores
+    clamped to 0-100, missing lists empty), and a list of what was fixed.
+    Fields outside the schema are kept.
+    """
+    problems = []
+    analysis = _coerce(data, ANALYSIS_RESPONSE_SCHEMA, "$", problems)
+    if not analysis["overall_assessment"]:
+        analysis["overall_assessment"] = DEFAULT_ASSESSMENT
+    if analysis["match_status"] not in MATCH_STATUSES:
+        analysis["match_status"] = _match_status(analysis["match_score"])
+    return analysis, problems
+
+
+class LLMOutputStats:
+    """Counts how LLM responses parsed: clean, repaired, or failed.
+
+    A failed response is one the user has to retry; retried counts the
+    requests sent again automatically (a resume missing from a batch
+    response). retry_rate is both over all responses.
+    """
+
+    def __init__(self):
+        self.clean = 0
+        self.repaired = 0
+        self.failed = 0
+        self.retried = 0
+        self.schema_fixes = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome, schema_fixes=0):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.schema_fixes += schema_fixes
+
+    def record_retry(self, count=1):
+        with self._lock:
+            self.retried += count
+
+    def snapshot(self):
+        with self._lock:
+            responses = self.clean + self.repaired + self.failed
+            return {
+                'responses': responses,
+                'clean': self.clean,
+                'repaired': self.repaired,
+                'failed': self.failed,
+                'retried': self.retried,
+                'schema_fixes': self.schema_fixes,
+                'repair_rate': self.repaired / responses if responses else 0.0,
+                'retry_rate': (self.failed + self.retried) / responses if responses else 0.0
+            }
+
+
+_output_stats = LLMOutputStats()
+
+
+def get_llm_output_stats():
+    """Return the process-wide LLM response parsing counters"""
+    return _output_stats
+
+
+def parse_analysis(text, record=True):
+    """Parse, repair and validate an analysis response.
+
+    Returns (analysis, error); error is None on success. Outcomes are counted
+    in get_llm_output_stats() unless record is False (cached responses).
+    """
+    try:
+        data, repaired = parse_json(text)
+    except ValueError as e:
+        if record:
+            _output_stats.record('failed')
+        return None, f"Failed to parse AI response as JSON: {str(e)}. Response was: {text[:100]}..."
+
+    analysis, problems = validate_analysis(data)
+    if record:
+        _output_stats.record('repaired' if repaired else 'clean', len(problems))
+    if repaired or problems:
+        print(f"LLM response {'repaired' if repaired else 'parsed'}; schema fixes: {problems[:5]}")
+    return analysis, None
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import google.generativeai as genai
+import requests
+
+from .llm_client import get_gemini_model
+
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet")
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+class LLMProvider:
+    """One upstream that turns a prompt into response text.
+
+    Subclasses implement generate(); generate_async() defaults to running
+    generate() in a worker thread, and stream() to yielding the whole
+    response as one chunk. response_schema is a JSON schema the response
+    must follow; providers with a native structured-output mode enforce
+    it, the others ignore it and rely on the prompt.
+    """
+
+    name = None
+    display_name = None
+
+    def __init__(self, model):
+        self.model = model
+
+    def available(self):
+        """Whether the provider is configured (API key present, ...)"""
+        return True
+
+    def generate(self, prompt, response_schema=None):
+        raise NotImplementedError
+
+    async def generate_async(self, prompt, response_schema=None):
+        return await asyncio.to_thread(self.generate, prompt, response_schema)
+
+    def stream(self, prompt, response_schema=None):
+        """Yield the response text in chunks as the model produces it"""
+        yield self.generate(prompt, response_schema)
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google-generativeai"""
+
+    name = "gemini"
+    display_name = "Google Gemini"
+
+    def __init__(self, model=GEMINI_MODEL):
+        super().__init__(model)
+
+    def available(self):
+        return bool(os.getenv("GOOGLE_API_KEY"))
+
+    @staticmethod
+    def _generation_config(response_schema):
+        # JSON mode with a schema: Gemini only emits responses that match it
+        if response_schema is None:
+            return None
+        return genai.GenerationConfig(response_mime_type="application/json", response_schema=response_schema)
+
+    def generate(self, prompt, response_schema=None):
+        return get_gemini_model(self.model).generate_content(
+            prompt, generation_config=self._generation_config(response_schema)
+        ).text
+
+    async def generate_async(self, prompt, response_schema=None):
+        response = await get_gemini_model(self.model).generate_content_async(
+            prompt, generation_config=self._generation_config(response_schema)
+        )
+        return response.text
+
+    def stream(self, prompt, response_schema=None):
+        for chunk in get_gemini_model(self.model).generate_content(
+            prompt, generation_config=self._generation_config(response_schema), stream=True
+        ):
+            yield chunk.text
+
+
+class OpenRouterProvider(LLMProvider):
+    """Any OpenRouter model (Anthropic Claude by default) over its chat
+    completions API, on one pooled HTTP session"""
+
+    name = "openrouter"
+    display_name = "Anthropic Claude"
+
+    def __init__(self, model=OPENROUTER_MODEL, timeout=60):
+        super().__init__(model)
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def available(self):
+        return bool(os.getenv("OPENROUTER_API_KEY"))
+
+    def _post(self, prompt, response_schema=None, stream=False):
+        body = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "stream": stream}
+        if response_schema is not None:
+            # Structured outputs; OpenRouter drops it for models without support
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "strict": False, "schema": response_schema}
+            }
+        response = self._session.post(
+            OPENROUTER_URL,
+            headers={"Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}"},
+            json=body,
+            timeout=self.timeout,
+            stream=stream
+        )
+        response.raise_for_status()
+        return response
+
+    def generate(self, prompt, response_schema=None):
+        return self._post(prompt, response_schema).json()["choices"][0]["message"]["content"]
+
+    def stream(self, prompt, response_schema=None):
+        # Server-sent events: "data: {...}" lines, ending with "data: [DONE]"
+        with self._post(prompt, response_schema, stream=True) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                payload = line[len("data: "):]
+                if payload == "[DONE]":
+                    break
+                content = json.loads(payload)["choices"][0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
+
+# A valid analysis in the shape the prompt asks for, returned by the stub
+STUB_RESPONSE = json.dumps({
+    "candidate_info": {"name": "", "role": "", "experience": "", "education": ""},
+    "match_score": 50,
+    "match_status": "Moderate",
+    "formatting_score": 50,
+    "formatting_issues": [],
+    "matched_skills": [],
+    "missing_skills": [],
+    "job_context": {"title": "", "requirements_summary": ""},
+    "recommendations": [],
+    "overall_assessment": "Stub analysis.",
+    "ats_score": 50,
+    "ats_keywords_missing": []
+})
+
+
+class StubProvider(LLMProvider):
+    """Local provider for tests and offline development: returns a canned
+    response after an optional delay, or raises if told to fail"""
+
+    name = "stub"
+    display_name = "Stub"
+
+    def __init__(self, response=STUB_RESPONSE, latency=0.0, fail=False, name=None):
+        super().__init__("stub")
+        self.response = response
+        self.latency = latency
+        self.fail = fail
+        if name:
+            self.name = name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, response_schema=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.name} provider failure")
+        return self.response
+
+    async def generate_async(self, prompt, response_schema=None):
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.name} provider failure")
+        return self.response
+
+    def stream(self, prompt, response_schema=None, chunk_size=16):
+        text = self.generate(prompt, response_schema)
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+
+
+PROVIDER_CLASSES = {
+    "gemini": GeminiProvider,
+    "openrouter": OpenRouterProvider,
+    "stub": StubProvider
+}
+
+
+def create_providers(names=None):
+    """Instantiate providers by name, in order. Defaults to LLM_PROVIDERS
+    (comma separated), or gemini then openrouter."""
+    if names is None:
+        names = os.getenv("LLM_PROVIDERS", "gemini,openrouter").split(",")
+    providers = []
+    for name in names:
+        name = name.strip()
+        if name not in PROVIDER_CLASSES:
+            print(f"Error: unknown LLM provider {name}")
+            continue
+        providers.append(PROVIDER_CLASSES[name]())
+    return providers
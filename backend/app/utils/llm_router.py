@@ -0,0 +1,375 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .llm_providers import create_providers
+
+
+# Hedge after this many seconds until a provider has enough samples for its own p95
+DEFAULT_HEDGE_AFTER = float(os.getenv("LLM_DEFAULT_HEDGE_AFTER_SECONDS", "10"))
+
+
+class ProviderStats:
+    """Rolling latency and error-rate window for one provider"""
+
+    def __init__(self, window=100):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            if ok:
+                self.latencies.append(seconds)
+            self.outcomes.append(ok)
+
+    def percentile(self, q):
+        """Latency percentile (0-1) of successful calls, or None without samples"""
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(round(q * (len(latencies) - 1))))]
+
+    @property
+    def samples(self):
+        return len(self.latencies)
+
+    @property
+    def error_rate(self):
+        with self._lock:
+            outcomes = list(self.outcomes)
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
+    def snapshot(self):
+        return {
+            'requests': len(self.outcomes),
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'error_rate': self.error_rate
+        }
+
+
+class CircuitBreaker:
+    """Stops routing to a provider after repeated failures.
+
+    After failure_threshold consecutive failures the breaker opens and the
+    provider is skipped. Once reset_timeout has passed it is half-open:
+    acquire() admits a single probe call, and every other call is turned
+    away until that probe succeeds (closing the breaker) or fails
+    (reopening it). A probe that never reports back frees its slot after
+    another reset_timeout.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def _probing(self):
+        return self.probe_started is not None and time.monotonic() - self.probe_started < self.reset_timeout
+
+    def allows(self):
+        """Whether a call could be admitted now; does not claim the probe"""
+        with self._lock:
+            state = self.state
+            return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing())
+
+    def acquire(self):
+        """Admit one call: returns the state it was admitted in (HALF_OPEN
+        for the probe), or None if the call must go elsewhere"""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return state
+            if state == self.OPEN or self._probing():
+                return None
+            self.probe_started = time.monotonic()
+            return state
+
+    def release(self):
+        """Free the probe slot of a probe that ended without an outcome"""
+        with self._lock:
+            self.probe_started = None
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LLMRouter:
+    """Routes prompts across LLM providers by measured latency and errors.
+
+    Providers are ranked by p95 latency inflated by their error rate; the
+    preferred provider (the model the user picked) goes first while its
+    breaker is closed. Providers still without enough samples rank first
+    so that each gets measured. A failed call falls back to the next
+    provider, and a call still running after the hedge threshold (the
+    primary's p95, or LLM_HEDGE_AFTER_SECONDS) is duplicated to the next
+    provider; the first success wins.
+    """
+
+    def __init__(self, providers=None, hedge_after=None, min_samples=10,
+                 failure_threshold=5, reset_timeout=30.0, max_workers=16):
+        providers = create_providers() if providers is None else providers
+        if hedge_after is None and os.getenv("LLM_HEDGE_AFTER_SECONDS"):
+            hedge_after = float(os.getenv("LLM_HEDGE_AFTER_SECONDS"))
+
+        self.providers = {provider.name: provider for provider in providers}
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.stats = {name: ProviderStats() for name in self.providers}
+        self.breakers = {
+            name: CircuitBreaker(failure_threshold, reset_timeout) for name in self.providers
+        }
+        self._order = {name: i for i, name in enumerate(self.providers)}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+
+    def candidates(self, preferred=None, providers=None):
+        """Providers to try, best first"""
+        names = providers or list(self.providers)
+        usable = [
+            self.providers[name] for name in names
+            if name in self.providers
+            and self.providers[name].available()
+            and self.breakers[name].allows()
+        ]
+        return sorted(usable, key=lambda provider: (
+            provider.name != preferred,
+            self._score(provider.name),
+            self._order[provider.name]
+        ))
+
+    def _score(self, name):
+        stats = self.stats[name]
+        if stats.samples < self.min_samples:
+            return 0.0
+        return stats.percentile(0.95) * (1 + 10 * stats.error_rate)
+
+    def hedge_delay(self, provider):
+        """Seconds to wait on a provider before hedging to the next one"""
+        if self.hedge_after is not None:
+            return self.hedge_after
+        stats = self.stats[provider.name]
+        if stats.samples >= self.min_samples:
+            return stats.percentile(0.95)
+        return DEFAULT_HEDGE_AFTER
+
+    def _record(self, provider, started, ok):
+        self.stats[provider.name].record(time.monotonic() - started, ok)
+        if ok:
+            self.breakers[provider.name].record_success()
+        else:
+            self.breakers[provider.name].record_failure()
+
+    def _call(self, provider, prompt, response_schema=None):
+        started = time.monotonic()
+        try:
+            text = provider.generate(prompt, response_schema)
+        except Exception:
+            self._record(provider, started, False)
+            raise
+        self._record(provider, started, True)
+        return text
+
+    async def _call_async(self, provider, prompt, response_schema=None):
+        started = time.monotonic()
+        try:
+            text = await provider.generate_async(prompt, response_schema)
+        except asyncio.CancelledError:
+            raise  # Lost a hedge race; says nothing about the provider
+        except Exception:
+            self._record(provider, started, False)
+            raise
+        self._record(provider, started, True)
+        return text
+
+    def generate(self, prompt, preferred=None, providers=None, response_schema=None):
+        """Return (response text, provider) for a prompt, hedging and falling
+        back across providers. Raises RuntimeError if every provider fails.
+        response_schema is passed on to the providers (structured output)."""
+        remaining = self.candidates(preferred, providers)
+        if not remaining:
+            raise RuntimeError("No LLM provider is configured or available")
+
+        pending = {}
+        probes = set()
+        errors = []
+
+        def launch():
+            # Next provider whose breaker admits the call; returns when the
+            # launched call should be hedged, or None if none was admitted
+            while remaining:
+                provider = remaining.pop(0)
+                admitted = self.breakers[provider.name].acquire()
+                if admitted is None:
+                    continue
+                future = self._pool.submit(self._call, provider, prompt, response_schema)
+                pending[future] = provider
+                if admitted == CircuitBreaker.HALF_OPEN:
+                    probes.add(future)
+                return time.monotonic() + self.hedge_delay(provider)
+            return None
+
+        hedge_at = launch()
+        if hedge_at is None:
+            raise RuntimeError("No LLM provider is configured or available")
+        hedged = False
+        while pending:
+            timeout = None if hedged or not remaining else max(0.0, hedge_at - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                launch()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {str(e)}")
+                    # The fallback gets its own hedge delay
+                    hedge_at = launch() or hedge_at
+                    continue
+                for other, other_provider in pending.items():
+                    if other.cancel() and other in probes:
+                        self.breakers[other_provider.name].release()
+                return text, provider
+
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    async def generate_async(self, prompt, preferred=None, providers=None, response_schema=None):
+        """Async generate(); losing hedged calls are cancelled"""
+        remaining = self.candidates(preferred, providers)
+        if not remaining:
+            raise RuntimeError("No LLM provider is configured or available")
+
+        pending = {}
+        probes = set()
+        errors = []
+
+        def launch():
+            while remaining:
+                provider = remaining.pop(0)
+                admitted = self.breakers[provider.name].acquire()
+                if admitted is None:
+                    continue
+                task = asyncio.ensure_future(self._call_async(provider, prompt, response_schema))
+                pending[task] = provider
+                if admitted == CircuitBreaker.HALF_OPEN:
+                    probes.add(task)
+                return time.monotonic() + self.hedge_delay(provider)
+            return None
+
+        hedge_at = launch()
+        if hedge_at is None:
+            raise RuntimeError("No LLM provider is configured or available")
+        hedged = False
+        try:
+            while pending:
+                timeout = None if hedged or not remaining else max(0.0, hedge_at - time.monotonic())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch()
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        text = task.result()
+                    except Exception as e:
+                        errors.append(f"{provider.name}: {str(e)}")
+                        hedge_at = launch() or hedge_at
+                        continue
+                    return text, provider
+        finally:
+            # Cancelled calls record nothing, so a cancelled probe frees its slot
+            for task, provider in pending.items():
+                task.cancel()
+                if task in probes:
+                    self.breakers[provider.name].release()
+
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    def stream(self, prompt, preferred=None, providers=None, response_schema=None):
+        """Yield (text chunk, provider) as the best provider streams its response.
+
+        Streams are not hedged. A provider that fails before sending any text
+        falls back to the next one; a failure mid-stream is raised.
+        """
+        errors = []
+        for provider in self.candidates(preferred, providers):
+            admitted = self.breakers[provider.name].acquire()
+            if admitted is None:
+                continue
+            started = time.monotonic()
+            sent = False
+            try:
+                for chunk in provider.stream(prompt, response_schema):
+                    sent = True
+                    yield chunk, provider
+            except GeneratorExit:
+                # The caller stopped reading; that says nothing about the provider
+                if admitted == CircuitBreaker.HALF_OPEN:
+                    self.breakers[provider.name].release()
+                raise
+            except Exception as e:
+                self._record(provider, started, False)
+                if sent:
+                    raise
+                errors.append(f"{provider.name}: {str(e)}")
+                continue
+            self._record(provider, started, True)
+            return
+
+        if not errors:
+            raise RuntimeError("No LLM provider is configured or available")
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    def get_stats(self):
+        """Per-provider latency percentiles, error rate and breaker state"""
+        return {
+            name: {**self.stats[name].snapshot(), 'state': self.breakers[name].state}
+            for name in self.providers
+        }
+
+
+_llm_router = None
+_llm_router_lock = threading.Lock()
+
+
+def get_llm_router():
+    """Return the process-wide router over the configured providers"""
+    global _llm_router
+    if _llm_router is None:
+        with _llm_router_lock:
+            if _llm_router is None:
+                _llm_router = LLMRouter()
+    return _llm_router
@@ -0,0 +1,102 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Common Poppler install locations on Windows
+WINDOWS_POPPLER_PATHS = [
+    r'C:\poppler\Library\bin',
+    r'C:\Program Files\poppler\bin',
+    r'C:\Program Files (x86)\poppler\bin',
+    r'C:\poppler\bin'
+]
+DEFAULT_WINDOWS_POPPLER_PATH = r'C:\poppler\Library\bin'
+
+
+def find_poppler_path():
+    """Return the Poppler bin directory on Windows, or None to use PATH"""
+    if os.name != 'nt':
+        return None
+    for path in WINDOWS_POPPLER_PATHS:
+        if os.path.exists(path):
+            return path
+    return DEFAULT_WINDOWS_POPPLER_PATH
+
+
+def get_page_count(pdf_path, poppler_path=None):
+    """Return the number of pages in a PDF without rasterizing it"""
+    from pdf2image import pdfinfo_from_path
+    info = pdfinfo_from_path(pdf_path, poppler_path=poppler_path)
+    return int(info.get("Pages", 0))
+
+
+def ocr_page(pdf_path, page_number, poppler_path=None, dpi=200, lang=None):
+    """Rasterize a single page (1-based) and run tesseract on it.
+
+    Runs inside a pool worker, so at most one page bitmap per worker is alive
+    at any time.
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=page_number,
+        last_page=page_number,
+        poppler_path=poppler_path
+    )
+    try:
+        return "\n".join(pytesseract.image_to_string(image, lang=lang) for image in images)
+    finally:
+        for image in images:
+            image.close()
+
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+def get_ocr_pool():
+    """Return the process pool shared by all OCR requests"""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                max_workers = int(os.getenv("OCR_MAX_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+                _ocr_pool = ProcessPoolExecutor(max_workers=max_workers)
+    return _ocr_pool
+
+
+def submit_ocr_page(pdf_path, page_number, poppler_path=None, dpi=200, lang=None):
+    """Queue OCR of one page on the shared pool and return its Future"""
+    return get_ocr_pool().submit(ocr_page, pdf_path, page_number, poppler_path, dpi, lang)
+
+
+def iter_ocr_pages(pdf_path, page_numbers=None, poppler_path=None, dpi=200):
+    """Yield (page_number, text) for each page, in page order.
+
+    Pages are rasterized lazily, one per task, across the shared process pool.
+    """
+    if page_numbers is None:
+        page_numbers = range(1, get_page_count(pdf_path, poppler_path) + 1)
+    page_numbers = list(page_numbers)
+    if not page_numbers:
+        return
+
+    futures = [
+        submit_ocr_page(pdf_path, page_number, poppler_path, dpi)
+        for page_number in page_numbers
+    ]
+    try:
+        for page_number, future in zip(page_numbers, futures):
+            yield page_number, future.result()
+    finally:
+        # Drop any pages still queued if the caller stops early
+        for future in futures:
+            future.cancel()
+
+
+def ocr_pdf(pdf_path, poppler_path=None, dpi=200):
+    """Return the OCR text of every page of a PDF as a list, in page order"""
+    return [text for _, text in iter_ocr_pages(pdf_path, poppler_path=poppler_path, dpi=dpi)]
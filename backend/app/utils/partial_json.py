@@ -0,0 +1,87 @@
+import json
+
+
+class IncrementalJSONParser:
+    """Parses a streamed JSON object one top-level field at a time.
+
+    Feed response chunks as they arrive; feed() returns the (key, value)
+    pairs whose values became complete in that chunk, so a UI can show
+    "match_score" long before "recommendations" has finished streaming.
+    Text before the opening brace (such as a ```json fence) is skipped.
+    Each character is scanned once, however the chunks are split.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._done = False
+        self._key = None
+        self._token_start = None   # start of the current top-level key or value
+        self._expect = 'key'       # 'key', 'colon' or 'value' at depth 1
+
+    def feed(self, chunk):
+        """Add a chunk of response text and return newly completed fields"""
+        self.buffer += chunk
+        completed = []
+        buffer = self.buffer
+        while self._pos < len(buffer) and not self._done:
+            char = buffer[self._pos]
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == 'key':
+                        self._key = json.loads(buffer[self._token_start:self._pos + 1])
+                        self._expect = 'colon'
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == 'key':
+                    self._token_start = self._pos
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+            elif char == ':' and self._depth == 1 and self._expect == 'colon':
+                self._expect = 'value'
+                self._token_start = self._pos + 1
+
+            if self._depth == 1 and self._expect == 'value' and char == ',':
+                completed.extend(self._complete_value(self._pos))
+            elif self._depth == 0:
+                if self._expect == 'value':
+                    completed.extend(self._complete_value(self._pos))
+                self._done = True
+            self._pos += 1
+        return completed
+
+    def _complete_value(self, end):
+        raw = self.buffer[self._token_start:end]
+        key = self._key
+        self._key = None
+        self._expect = 'key'
+        try:
+            return [(key, json.loads(raw))]
+        except json.JSONDecodeError:
+            return []
+
+    @property
+    def done(self):
+        """Whether the closing brace of the object has been seen"""
+        return self._done
@@ -0,0 +1,215 @@
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+
+from ..config.job_roles import JOB_ROLES
+from ..config.skill_aliases import SKILL_ALIASES
+from .resume_analyzer import ResumeAnalyzer
+from .skill_matcher import tokenize
+from .text_extraction import PAGE_SEPARATOR
+
+
+# Rough size of a token in English text; good enough for budgeting and reporting
+CHARS_PER_TOKEN = 4
+
+PAGE_NUMBER_PATTERN = re.compile(r'^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$|^-\s*\d{1,3}\s*-$', re.IGNORECASE)
+# A rule drawn with one repeated character: "-----", "_ _ _ _", "ooooo" (OCR'd dots)
+SEPARATOR_PATTERN = re.compile(r'^(\S)(?:\s*\1){3,}$')
+CONTROL_CHARS_PATTERN = re.compile(r'[\x00-\x08\x0b-\x1f\x7f\u200b-\u200f\ufeff]')
+SPACES_PATTERN = re.compile(r'[ \t\xa0]+')
+
+# Lines at the top and bottom of each page that may be a running header or
+# footer, and the longest line treated as one
+PAGE_EDGE_LINES = 2
+PAGE_EDGE_MAX_CHARS = 80
+DIGITS_PATTERN = re.compile(r'\d+')
+
+# Order in which sections get the token budget in sections-only mode
+SECTION_PRIORITY = ['summary', 'experience', 'skills', 'education', 'projects']
+# Lines before the first section heading, which hold the name and contact details
+PREAMBLE_LINES = 6
+
+
+def estimate_tokens(text):
+    """Estimate the number of LLM tokens in text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=1)
+def _known_skill_tokens():
+    tokens = set()
+    for roles in JOB_ROLES.values():
+        for info in roles.values():
+            skills = info.get('required_skills', []) + info.get('recommended_skills', {}).get('technical', [])
+            for skill in skills:
+                tokens.update(tokenize(skill))
+    for skill, aliases in SKILL_ALIASES.items():
+        for form in [skill] + aliases:
+            tokens.update(tokenize(form))
+    return frozenset(tokens)
+
+
+def is_junk_line(line):
+    """Whether a line is a page number, a separator or has no letters or
+    digits at all. Lines that are mostly symbols ("C/C++ | C# | .NET") are
+    content, and a line with a known skill in it is always kept."""
+    if not any(char.isalnum() for char in line):
+        return True
+    if PAGE_NUMBER_PATTERN.match(line) or SEPARATOR_PATTERN.match(line):
+        return not _known_skill_tokens().intersection(tokenize(line))
+    return False
+
+
+_thread_local = threading.local()
+
+
+def _section_analyzer():
+    # ResumeAnalyzer memoizes its last segmentation, so keep one per thread
+    if not hasattr(_thread_local, 'analyzer'):
+        _thread_local.analyzer = ResumeAnalyzer()
+    return _thread_local.analyzer
+
+
+class PromptCompactor:
+    """Shrinks extracted resume text before it goes into an LLM prompt.
+
+    Normalizes unicode and whitespace, drops OCR junk and page numbers,
+    removes a line that repeats the one before it and short headers and
+    footers repeated at the top or bottom of several pages (pages are split
+    on PAGE_SEPARATOR), and trims to a token budget. With
+    sections_only, only the preamble and the sections found by
+    ResumeAnalyzer are kept, in SECTION_PRIORITY order.
+    """
+
+    def __init__(self, token_budget=None, sections_only=None):
+        if token_budget is None:
+            token_budget = int(os.getenv("PROMPT_TOKEN_BUDGET", "4000"))
+        if sections_only is None:
+            sections_only = os.getenv("PROMPT_SECTIONS_ONLY", "").lower() in ("1", "true", "yes")
+        self.token_budget = token_budget
+        self.sections_only = sections_only
+
+    @staticmethod
+    def _page_lines(page):
+        """Normalized lines of one page, with junk lines dropped and blank lines kept"""
+        page = CONTROL_CHARS_PATTERN.sub('', page)
+        lines = []
+        for line in page.split('\n'):
+            line = SPACES_PATTERN.sub(' ', line).strip()
+            if line and is_junk_line(line):
+                continue
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def _edge_key(line):
+        # Page numbers inside a header ("Jane Doe - Page 2") differ per page
+        return DIGITS_PATTERN.sub('#', line.lower())
+
+    def _running_lines(self, pages):
+        """Keys of short lines found at the top or bottom of two or more pages"""
+        counts = {}
+        for lines in pages:
+            content = [line for line in lines if line]
+            edges = content[:PAGE_EDGE_LINES] + content[PAGE_EDGE_LINES:][-PAGE_EDGE_LINES:]
+            for key in set(self._edge_key(line) for line in edges if len(line) <= PAGE_EDGE_MAX_CHARS):
+                counts[key] = counts.get(key, 0) + 1
+        return set(key for key, count in counts.items() if count >= 2)
+
+    def clean_lines(self, text):
+        """Return the normalized, non-junk lines of text, without repeats of
+        the line before and without running page headers and footers.
+
+        Lines repeated elsewhere (two jobs with the same title, the same
+        "Technologies:" line under two projects) are content and are kept.
+        """
+        text = unicodedata.normalize('NFKC', text)
+        pages = [self._page_lines(page) for page in text.split(PAGE_SEPARATOR.strip('\n'))]
+        running = self._running_lines(pages) if len(pages) > 1 else set()
+
+        lines = []
+        previous = None
+        seen_running = set()
+        for page in pages:
+            content = [index for index, line in enumerate(page) if line]
+            edges = set(content[:PAGE_EDGE_LINES] + content[PAGE_EDGE_LINES:][-PAGE_EDGE_LINES:])
+            for index, line in enumerate(page):
+                if not line:
+                    # Keep single blank lines; they separate section entries
+                    if lines and lines[-1]:
+                        lines.append('')
+                    continue
+                key = line.lower()
+                if key == previous:
+                    continue
+                if index in edges and self._edge_key(line) in running:
+                    # Keep the first copy of a header: it is often the name
+                    if self._edge_key(line) in seen_running:
+                        continue
+                    seen_running.add(self._edge_key(line))
+                previous = key
+                lines.append(line)
+        return lines
+
+    def _fit(self, lines, budget):
+        """Return the leading lines that fit in budget tokens"""
+        kept = []
+        used = 0
+        for line in lines:
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            kept.append(line)
+            used += cost
+        return kept
+
+    def _sections(self, lines):
+        text = '\n'.join(lines)
+        segments = _section_analyzer().segment_sections(text)
+
+        preamble = []
+        for line in lines[:PREAMBLE_LINES]:
+            if _section_analyzer().section_matcher.contains(line.lower()):
+                break
+            if line:
+                preamble.append(line)
+
+        budget = self.token_budget or float('inf')
+        kept = self._fit(preamble, budget)
+        budget -= estimate_tokens('\n'.join(kept))
+        for section in SECTION_PRIORITY:
+            entries = segments.get(section) or []
+            if not entries or budget <= 0:
+                continue
+            fitted = self._fit([section.upper()] + entries, budget)
+            if len(fitted) > 1:
+                kept.extend([''] + fitted)
+                budget -= estimate_tokens('\n'.join(fitted))
+        return kept
+
+    def compact(self, text):
+        """Return (compacted text, report) where report counts tokens before and after"""
+        lines = self.clean_lines(text or '')
+        if self.sections_only:
+            sectioned = self._sections(lines)
+            # Fall back to the full text when no sections were recognized
+            if any(line.isupper() and line.lower() in SECTION_PRIORITY for line in sectioned):
+                lines = sectioned
+        if self.token_budget:
+            lines = self._fit(lines, self.token_budget)
+
+        compacted = '\n'.join(lines).strip()
+        original_tokens = estimate_tokens(text or '')
+        compacted_tokens = estimate_tokens(compacted)
+        return compacted, {
+            'original_tokens': original_tokens,
+            'compacted_tokens': compacted_tokens,
+            'tokens_saved': original_tokens - compacted_tokens
+        }
+
+
+def compact_resume_text(text, token_budget=None, sections_only=None):
+    """Compact resume text for a prompt; see PromptCompactor"""
+    return PromptCompactor(token_budget, sections_only).compact(text)
@@ -1,4 +1,57 @@
 import re
+from .embeddings import get_embedding_engine
+from .skill_matcher import get_skill_matcher
+from .text_extraction import extract_docx_text, get_file_bytes, get_pdf_text_extractor
+
+# Weight of each section score in the overall ATS score
+ATS_WEIGHTS = {
+    'contact': 0.1,      # 10% weight for contact info
+    'summary': 0.1,      # 10% weight for summary
+    'skills': 0.3,       # 30% weight for skills match
+    'experience': 0.2,   # 20% weight for experience
+    'education': 0.1,    # 10% weight for education
+    'format': 0.2        # 20% weight for formatting
+}
+
+
+class KeywordMatcher:
+    """Finds which keyword groups occur in a line with one precompiled regex.
+
+    A zero-width lookahead at every position reports the longest keyword
+    starting there, and each keyword also carries the groups of every shorter
+    keyword it contains, so overlapping matches ("work experience" also
+    contains "work" and "experience") are not lost.
+    """
+
+    def __init__(self, groups):
+        keyword_groups = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                keyword_groups.setdefault(keyword.lower(), set()).add(label)
+
+        self._exact = keyword_groups
+        self._contains = {
+            keyword: frozenset().union(*(
+                labels for other, labels in keyword_groups.items() if other in keyword
+            ))
+            for keyword in keyword_groups
+        }
+        alternation = '|'.join(
+            re.escape(keyword) for keyword in sorted(keyword_groups, key=len, reverse=True)
+        )
+        self._pattern = re.compile(f'(?=({alternation}))')
+
+    def contains(self, line_lower):
+        """Return the groups with a keyword occurring anywhere in the line"""
+        found = set()
+        for match in self._pattern.finditer(line_lower):
+            found |= self._contains[match.group(1)]
+        return found
+
+    def exact(self, line_lower):
+        """Return the groups with a keyword equal to the whole line"""
+        return self._exact.get(line_lower, ())
+
 
 class ResumeAnalyzer:
     def __init__(self):
@@ -22,6 +75,46 @@ class ResumeAnalyzer:
             ]
         }
         
+        # Section header keywords used by the extract_* methods
+        self.section_keywords = {
+            'education': [
+                'education', 'academic', 'qualification', 'degree', 'university', 'college',
+                'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
+                'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
+                'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
+            ],
+            'experience': [
+                'experience', 'employment', 'work history', 'professional experience',
+                'work experience', 'career history', 'professional background',
+                'employment history', 'job history', 'positions held', 'experience',
+                'job title', 'job responsibilities', 'job description', 'job summary'
+            ],
+            'projects': [
+                'projects', 'personal projects', 'academic projects', 'key projects',
+                'major projects', 'professional projects', 'project experience',
+                'relevant projects', 'featured projects','latest projects',
+                'top projects'
+            ],
+            'skills': [
+                'skills', 'technical skills', 'competencies', 'expertise',
+                'core competencies', 'professional skills', 'key skills',
+                'technical expertise', 'proficiencies', 'qualifications',
+                'top skills', 'key skill', 'major skill', 'personal skill',
+                'soft skills', 'soft skill', 'soft skillset'
+            ],
+            'summary': [
+                'summary', 'professional summary', 'career summary', 'objective',
+                'career objective', 'professional objective', 'about me', 'profile',
+                'professional profile', 'career profile', 'overview', 'skill summary'
+            ]
+        }
+        # One matcher for every section plus the generic resume keywords
+        self.section_matcher = KeywordMatcher({
+            **self.section_keywords,
+            'resume': self.document_types['resume']
+        })
+        self._segments = None
+        
     def detect_document_type(self, text):
         text = text.lower()
         scores = {}
@@ -40,20 +133,10 @@ class ResumeAnalyzer:
         return best_match[0] if best_match[1] > 0.15 else 'unknown'
         
     def calculate_keyword_match(self, resume_text, required_skills):
-        resume_text = resume_text.lower()
-        found_skills = []
-        missing_skills = []
-        
-        for skill in required_skills:
-            skill_lower = skill.lower()
-            # Check for exact match
-            if skill_lower in resume_text:
-                found_skills.append(skill)
-            # Check for partial matches (e.g., "Python" in "Python programming")
-            elif any(skill_lower in phrase for phrase in resume_text.split('.')):
-                found_skills.append(skill)
-            else:
-                missing_skills.append(skill)
+        # Matchers are compiled once per skill list (i.e. per role) and cached
+        found = get_skill_matcher(required_skills).find(resume_text)
+        found_skills = [skill for skill in required_skills if skill in found]
+        missing_skills = [skill for skill in required_skills if skill not in found]
                 
         match_score = (len(found_skills) / len(required_skills)) * 100 if required_skills else 0
         
@@ -62,6 +145,24 @@ class ResumeAnalyzer:
             'found_skills': found_skills,
             'missing_skills': missing_skills
         }
+
+    def semantic_match(self, resume_text, required_skills):
+        """0-100 embedding similarity between the resume and the required skills.
+
+        Not part of analyze_resume: it embeds the resume and writes it to the
+        shared embedding store, so call it only where the number is used.
+        Only words from the bundled role, course and skill alias texts
+        count; terms that often appear together there (React and frontend)
+        score as related, anything outside that vocabulary scores nothing.
+        """
+        if not required_skills:
+            return 0
+        try:
+            similarity = get_embedding_engine().similarity(resume_text, ', '.join(required_skills))
+        except Exception as e:
+            print(f"Error computing semantic match: {str(e)}")
+            return 0
+        return round(max(0.0, similarity) * 100, 1)
         
     def check_resume_sections(self, text):
         text = text.lower()
@@ -119,40 +220,20 @@ class ResumeAnalyzer:
         
     def extract_text_from_pdf(self, file):
         try:
-            import PyPDF2
-            import io
-            
-            # Create a PDF reader object
-            # First make sure we have the file content as bytes
-            if hasattr(file, 'read'):
-                # If it's already a file-like object, read it
-                file_content = file.read()
-                file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = file
-                
-            # Create BytesIO from bytes content
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            
-            # Extract text from all pages
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-                
-            return text
+            # Pages are extracted with pypdf, pdfplumber or OCR as each needs
+            result = get_pdf_text_extractor().extract(get_file_bytes(file))
+            return result['text']
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
             
+    def iter_text_from_pdf(self, file):
+        """Yield (page_number, text, extractor) for each PDF page as it is decoded"""
+        return get_pdf_text_extractor().iter_pages(get_file_bytes(file))
+
     def extract_text_from_docx(self, docx_file):
         """Extract text from a DOCX file"""
         try:
-            from docx import Document
-            doc = Document(docx_file)
-            full_text = []
-            for paragraph in doc.paragraphs:
-                full_text.append(paragraph.text)
-            return '\n'.join(full_text)
+            return extract_docx_text(docx_file)
         except Exception as e:
             raise Exception(f"Error extracting text from DOCX file: {str(e)}")
 
@@ -182,265 +263,256 @@ class ResumeAnalyzer:
             'portfolio': ''  # Can be enhanced later
         }
 
-    def extract_education(self, text):
-        """Extract education information from resume text"""
-        education = []
-        lines = text.split('\n')
-        education_keywords = [
-            'education', 'academic', 'qualification', 'degree', 'university', 'college',
-            'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
-            'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
-            'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
-        ]
-        in_education_section = False
-        current_entry = []
+    def segment_sections(self, text):
+        """Split resume text into section entries in a single pass.
+
+        Each line is lowercased and run through the combined keyword matcher
+        once; the education, experience, projects, skills and summary section
+        trackers then all advance on that one classification. Returns a dict
+        of section label -> list of entries. The last result is memoized, so
+        the extract_* methods share one pass over the same text.
+        """
+        # Read the memo once: another thread may replace it between a check
+        # and a second read
+        memo = self._segments
+        if memo is not None and memo[0] == text:
+            return memo[1]
+
+        labels = list(self.section_keywords)
+        segments = {label: [] for label in labels}
+        current = {label: [] for label in labels}
+        in_section = {label: False for label in labels}
 
-        for line in lines:
+        for line in text.split('\n'):
             line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in education_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in education_keywords):
-                    # This line contains education info, not just a header
-                    current_entry.append(line)
-                in_education_section = True
-                continue
-            
-            if in_education_section:
+            line_lower = line.lower()
+            contains = self.section_matcher.contains(line_lower)
+            exact = self.section_matcher.exact(line_lower)
+            is_other_section = 'resume' in contains
+
+            for label in labels:
+                entry = current[label]
+                # Check for section header
+                if label in contains:
+                    if label not in exact:
+                        # This line contains section info, not just a header
+                        entry.append(line)
+                    in_section[label] = True
+                    continue
+
+                if not in_section[label]:
+                    continue
+
                 # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(edu_key.lower() in line.lower() for edu_key in education_keywords):
-                        in_education_section = False
-                        if current_entry:
-                            education.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
+                if line and is_other_section:
+                    in_section[label] = False
+                    if entry:
+                        segments[label].append(' '.join(entry))
+                        current[label] = []
+                    continue
+
                 if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    education.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            education.append(' '.join(current_entry))
-        
-        return education
+                    entry.append(line)
+                elif entry:  # Empty line and we have content
+                    segments[label].append(' '.join(entry))
+                    current[label] = []
+
+        for label in labels:
+            if current[label]:
+                segments[label].append(' '.join(current[label]))
+
+        self._segments = (text, segments)
+        return segments
+
+    def extract_education(self, text):
+        """Extract education information from resume text"""
+        return list(self.segment_sections(text)['education'])
 
     def extract_experience(self, text):
         """Extract work experience information from resume text"""
-        experience = []
-        lines = text.split('\n')
-        experience_keywords = [
-            'experience', 'employment', 'work history', 'professional experience',
-            'work experience', 'career history', 'professional background',
-            'employment history', 'job history', 'positions held', 'experience',
-            'job title', 'job responsibilities', 'job description', 'job summary'
-        ]
-        in_experience_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in experience_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in experience_keywords):
-                    # This line contains experience info, not just a header
-                    current_entry.append(line)
-                in_experience_section = True
-                continue
-            
-            if in_experience_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(exp_key.lower() in line.lower() for exp_key in experience_keywords):
-                        in_experience_section = False
-                        if current_entry:
-                            experience.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    experience.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            experience.append(' '.join(current_entry))
-        
-        return experience
+        return list(self.segment_sections(text)['experience'])
 
     def extract_projects(self, text):
         """Extract project information from resume text"""
-        projects = []
-        lines = text.split('\n')
-        project_keywords = [
-            'projects', 'personal projects', 'academic projects', 'key projects',
-            'major projects', 'professional projects', 'project experience',
-            'relevant projects', 'featured projects','latest projects',
-            'top projects'
-        ]
-        in_project_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in project_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in project_keywords):
-                    # This line contains project info, not just a header
-                    current_entry.append(line)
-                in_project_section = True
-                continue
-            
-            if in_project_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(proj_key.lower() in line.lower() for proj_key in project_keywords):
-                        in_project_section = False
-                        if current_entry:
-                            projects.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    projects.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            projects.append(' '.join(current_entry))
-        
-        return projects
+        return list(self.segment_sections(text)['projects'])
 
     def extract_skills(self, text):
         """Extract skills from resume text"""
         skills = set()  # Use set to avoid duplicates
-        lines = text.split('\n')
-        skills_keywords = [
-            'skills', 'technical skills', 'competencies', 'expertise',
-            'core competencies', 'professional skills', 'key skills',
-            'technical expertise', 'proficiencies', 'qualifications',
-            'top skills', 'key skill', 'major skill', 'personal skill',
-            'soft skills', 'soft skill', 'soft skillset'
-        ]
-        in_skills_section = False
-        current_entry = []
 
         # Common skill separators
         separators = [',', '•', '|', '/', '\\', '·', '>', '-', '–', '―']
 
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in skills_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in skills_keywords):
-                    # This line contains skills, not just a header
-                    current_entry.append(line)
-                in_skills_section = True
-                continue
-            
-            if in_skills_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(skill_key.lower() in line.lower() for skill_key in skills_keywords):
-                        in_skills_section = False
-                        if current_entry:
-                            # Process the current entry
-                            text_to_process = ' '.join(current_entry)
-                            # Split by common separators
-                            for separator in separators:
-                                if separator in text_to_process:
-                                    skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    # Process the current entry
-                    text_to_process = ' '.join(current_entry)
-                    # Split by common separators
-                    for separator in separators:
-                        if separator in text_to_process:
-                            skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                    current_entry = []
-        
-        if current_entry:
-            # Process any remaining skills
-            text_to_process = ' '.join(current_entry)
+        for text_to_process in self.segment_sections(text)['skills']:
+            # Split by common separators
             for separator in separators:
                 if separator in text_to_process:
                     skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-        
+
         return list(skills)
 
     def extract_summary(self, text):
         """Extract summary/objective from resume text"""
         summary = []
-        lines = text.split('\n')
-        summary_keywords = [
-            'summary', 'professional summary', 'career summary', 'objective',
-            'career objective', 'professional objective', 'about me', 'profile',
-            'professional profile', 'career profile', 'overview', 'skill summary'
-        ]
-        in_summary_section = False
-        current_entry = []
-
-        # Try to find summary at the beginning of the resume
-        start_index = 0
-        while start_index < min(10, len(lines)) and not lines[start_index].strip():
-            start_index += 1
 
         # Check first few non-empty lines for potential summary
         first_lines = []
-        lines_checked = 0
-        for line in lines[start_index:]:
+        for line in text.split('\n'):
             if line.strip():
                 first_lines.append(line.strip())
-                lines_checked += 1
-                if lines_checked >= 5:  # Check first 5 non-empty lines
+                if len(first_lines) >= 5:  # Check first 5 non-empty lines
                     break
 
         # If first few lines look like a summary (no special formatting, no contact info)
-        if first_lines and not any(keyword in first_lines[0].lower() for keyword in summary_keywords):
+        if first_lines and 'summary' not in self.section_matcher.contains(first_lines[0].lower()):
             potential_summary = ' '.join(first_lines)
             if len(potential_summary.split()) > 10:  # More than 10 words
                 if not re.search(r'\b(?:email|phone|address|tel|mobile|linkedin)\b', potential_summary.lower()):
                     summary.append(potential_summary)
 
         # Look for explicitly marked summary section
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in summary_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in summary_keywords):
-                    # This line contains summary info, not just a header
-                    current_entry.append(line)
-                in_summary_section = True
+        summary.extend(self.segment_sections(text)['summary'])
+
+        return ' '.join(summary) if summary else ''
+
+    def detect_sections(self, text):
+        """Return the resume section headings found in text, in order"""
+        sections = []
+        for line in text.split('\n'):
+            heading = line.strip().lower().rstrip(':')
+            # Headings are short lines such as "Work Experience" or "SKILLS:"
+            if not heading or len(heading.split()) > 4:
                 continue
+            for label in self.section_keywords:
+                if label in self.section_matcher.contains(heading) and label not in sections:
+                    sections.append(label)
+        return sections
+
+    def analyze_resume_stream(self, pages, job_requirements):
+        """Analyze a resume page by page.
+
+        pages is an iterable of (page_number, text, extractor) tuples, e.g.
+        from iter_text_from_pdf. A 'page' event with contact details (first
+        page) and newly found sections is yielded as soon as each page is
+        available, followed by one 'analysis' event with the full result.
+        """
+        page_texts = []
+        seen_sections = []
+        for page_number, page_text, extractor in pages:
+            page_texts.append(page_text)
+            new_sections = [
+                section for section in self.detect_sections(page_text)
+                if section not in seen_sections
+            ]
+            seen_sections.extend(new_sections)
+
+            event = {
+                'event': 'page',
+                'page_number': page_number,
+                'extractor': extractor,
+                'text': page_text,
+                'sections': new_sections
+            }
+            if len(page_texts) == 1:
+                event['personal_info'] = self.extract_personal_info(page_text)
+            yield event
+
+        text = '\n'.join(page_text for page_text in page_texts if page_text)
+        yield {
+            'event': 'analysis',
+            'text': text,
+            'analysis': self.analyze_resume({'raw_text': text}, job_requirements)
+        }
+
+    def contact_suggestions(self, personal_info):
+        """Suggestions for missing contact details"""
+        suggestions = []
+        if not personal_info.get('email'):
+            suggestions.append("Add your email address")
+        if not personal_info.get('phone'):
+            suggestions.append("Add your phone number")
+        if not personal_info.get('linkedin'):
+            suggestions.append("Add your LinkedIn profile URL")
+        return suggestions
+
+    def summary_suggestions(self, summary):
+        """Suggestions for a missing, short or long professional summary"""
+        suggestions = []
+        if not summary:
+            suggestions.append("Add a professional summary to highlight your key qualifications")
+        elif len(summary.split()) < 30:
+            suggestions.append("Expand your professional summary to better highlight your experience and goals")
+        elif len(summary.split()) > 100:
+            suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
+        return suggestions
+
+    def experience_suggestions(self, experience):
+        """Suggestions for the work experience entries"""
+        suggestions = []
+        if not experience:
+            suggestions.append("Add your work experience section")
+        else:
+            has_dates = any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience)
+            has_bullets = any(re.search(r'[•\-\*]', exp) for exp in experience)
+            has_action_verbs = any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b', 
+                                           exp.lower()) for exp in experience)
             
-            if in_summary_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(sum_key.lower() in line.lower() for sum_key in summary_keywords):
-                        in_summary_section = False
-                        if current_entry:
-                            summary.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    summary.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            summary.append(' '.join(current_entry))
-        
-        return ' '.join(summary) if summary else ''
+            if not has_dates:
+                suggestions.append("Include dates for each work experience")
+            if not has_bullets:
+                suggestions.append("Use bullet points to list your achievements and responsibilities")
+            if not has_action_verbs:
+                suggestions.append("Start bullet points with strong action verbs")
+        return suggestions
+
+    def education_suggestions(self, education, require_gpa=False):
+        """Suggestions for the education entries"""
+        suggestions = []
+        if not education:
+            suggestions.append("Add your educational background")
+        else:
+            has_dates = any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education)
+            has_degree = any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', 
+                                     edu.lower()) for edu in education)
+            has_gpa = any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', 
+                                  edu.lower()) for edu in education)
+            
+            if not has_dates:
+                suggestions.append("Include graduation dates")
+            if not has_degree:
+                suggestions.append("Specify your degree type")
+            if not has_gpa and require_gpa:
+                suggestions.append("Include your GPA if it's above 3.0")
+        return suggestions
+
+    def section_features(self, text, require_gpa=False):
+        """Return the role-independent ATS components of a resume.
+
+        These are every weighted component except the skills match, which
+        depends on the target role. 'is_resume' is False for documents that
+        analyze_resume would reject (marksheets, certificates, ...).
+        """
+        if self.detect_document_type(text) != 'resume':
+            features = dict.fromkeys(('contact', 'summary', 'experience', 'education', 'format'), 0)
+            features['is_resume'] = False
+            return features
+        format_score, _ = self.check_formatting(text)
+        return {
+            'is_resume': True,
+            'contact': 100 - (len(self.contact_suggestions(self.extract_personal_info(text))) * 25),
+            'summary': 100 - (len(self.summary_suggestions(self.extract_summary(text))) * 33),
+            'experience': 100 - (len(self.experience_suggestions(self.extract_experience(text))) * 25),
+            'education': 100 - (len(self.education_suggestions(self.extract_education(text), require_gpa)) * 25),
+            'format': format_score
+        }
+
+    @staticmethod
+    def weighted_ats_score(section_scores):
+        """Combine section scores (0-100 each) into the overall ATS score"""
+        return sum(
+            int(round(section_scores[section] * weight))
+            for section, weight in ATS_WEIGHTS.items()
+        )
 
     def analyze_resume(self, resume_data, job_requirements):
         """Analyze resume and return scores and recommendations"""
@@ -480,21 +552,8 @@ class ResumeAnalyzer:
             format_score, format_deductions = self.check_formatting(text)
             
             # Generate section-specific suggestions
-            contact_suggestions = []
-            if not personal_info.get('email'):
-                contact_suggestions.append("Add your email address")
-            if not personal_info.get('phone'):
-                contact_suggestions.append("Add your phone number")
-            if not personal_info.get('linkedin'):
-                contact_suggestions.append("Add your LinkedIn profile URL")
-            
-            summary_suggestions = []
-            if not summary:
-                summary_suggestions.append("Add a professional summary to highlight your key qualifications")
-            elif len(summary.split()) < 30:
-                summary_suggestions.append("Expand your professional summary to better highlight your experience and goals")
-            elif len(summary.split()) > 100:
-                summary_suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
+            contact_suggestions = self.contact_suggestions(personal_info)
+            summary_suggestions = self.summary_suggestions(summary)
             
             skills_suggestions = []
             if not skills:
@@ -504,38 +563,10 @@ class ResumeAnalyzer:
             if keyword_match['score'] < 70:
                 skills_suggestions.append("Add more skills that match the job requirements")
             
-            experience_suggestions = []
-            if not experience:
-                experience_suggestions.append("Add your work experience section")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience)
-                has_bullets = any(re.search(r'[•\-\*]', exp) for exp in experience)
-                has_action_verbs = any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b', 
-                                               exp.lower()) for exp in experience)
-                
-                if not has_dates:
-                    experience_suggestions.append("Include dates for each work experience")
-                if not has_bullets:
-                    experience_suggestions.append("Use bullet points to list your achievements and responsibilities")
-                if not has_action_verbs:
-                    experience_suggestions.append("Start bullet points with strong action verbs")
-            
-            education_suggestions = []
-            if not education:
-                education_suggestions.append("Add your educational background")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education)
-                has_degree = any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', 
-                                         edu.lower()) for edu in education)
-                has_gpa = any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', 
-                                      edu.lower()) for edu in education)
-                
-                if not has_dates:
-                    education_suggestions.append("Include graduation dates")
-                if not has_degree:
-                    education_suggestions.append("Specify your degree type")
-                if not has_gpa and job_requirements.get('require_gpa', False):
-                    education_suggestions.append("Include your GPA if it's above 3.0")
+            experience_suggestions = self.experience_suggestions(experience)
+            education_suggestions = self.education_suggestions(
+                education, job_requirements.get('require_gpa', False)
+            )
             
             format_suggestions = []
             if format_score < 100:
@@ -549,14 +580,14 @@ class ResumeAnalyzer:
             education_score = 100 - (len(education_suggestions) * 25)
             
             # Calculate overall ATS score with weighted components
-            ats_score = (
-                int(round(contact_score * 0.1)) +      # 10% weight for contact info
-                int(round(summary_score * 0.1)) +      # 10% weight for summary
-                int(round(skills_score * 0.3)) +       # 30% weight for skills match
-                int(round(experience_score * 0.2)) +   # 20% weight for experience
-                int(round(education_score * 0.1)) +    # 10% weight for education
-                int(round(format_score * 0.2))         # 20% weight for formatting
-            )
+            ats_score = self.weighted_ats_score({
+                'contact': contact_score,
+                'summary': summary_score,
+                'skills': skills_score,
+                'experience': experience_score,
+                'education': education_score,
+                'format': format_score
+            })
             
             # Combine all suggestions into a single list
             suggestions = []
@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ..config.job_roles import JOB_ROLES
+from .skill_matcher import SkillMatcher
+
+
+# Required skills count this many times in a role's term frequencies, so they
+# outweigh recommended skills when ranking
+REQUIRED_SKILL_WEIGHT = 2
+
+
+def _role_terms(role_info):
+    """Return a role's skill terms, lowercased, with required skills repeated"""
+    recommended = role_info.get('recommended_skills', {})
+    terms = [skill.lower() for skill in role_info.get('required_skills', [])] * REQUIRED_SKILL_WEIGHT
+    terms += [skill.lower() for skill in recommended.get('technical', [])]
+    terms += [skill.lower() for skill in recommended.get('soft', [])]
+    return terms
+
+
+def _identity(terms):
+    return terms
+
+
+class RoleRecommender:
+    """Ranks JOB_ROLES roles by how well a resume's skills fit them.
+
+    Each role is a TF-IDF vector over skill terms (whole skills such as
+    "machine learning", not single words), built once from its required and
+    recommended skills. A resume is reduced to the skills it mentions, aliases
+    included, and scored against every role with one sparse product.
+    """
+
+    def __init__(self, job_roles=None):
+        job_roles = JOB_ROLES if job_roles is None else job_roles
+        self.roles = []
+        documents = []
+        for category, roles in job_roles.items():
+            for role, info in roles.items():
+                self.roles.append((category, role, set(_role_terms(info))))
+                documents.append(_role_terms(info))
+
+        self.vectorizer = TfidfVectorizer(analyzer=_identity, lowercase=False)
+        # Rows are L2-normalized, so a dot product is the cosine similarity
+        self.role_matrix = self.vectorizer.fit_transform(documents)
+        self.skill_matcher = SkillMatcher(self.vectorizer.get_feature_names_out())
+
+    def resume_terms(self, text):
+        """Return the role skill terms mentioned in a resume"""
+        return sorted(self.skill_matcher.find(text))
+
+    def recommend(self, text, top_k=5):
+        """Return the top_k best fitting roles for a resume, best first.
+
+        Each entry has the role, its category, a 0-100 fit score and the
+        role skills found in the resume. Roles with no matching skill are left
+        out.
+        """
+        terms = self.resume_terms(text)
+        if not terms:
+            return []
+
+        scores = (self.role_matrix @ self.vectorizer.transform([terms]).T).toarray().ravel()
+        top_k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ranked = sorted(candidates, key=lambda i: (-scores[i], i))
+
+        recommendations = []
+        for i in ranked:
+            if scores[i] <= 0:
+                continue
+            category, role, role_terms = self.roles[i]
+            recommendations.append({
+                'role': role,
+                'category': category,
+                'score': round(float(scores[i]) * 100, 1),
+                'matched_skills': [term for term in terms if term in role_terms]
+            })
+        return recommendations
+
+
+_role_recommender = None
+_role_recommender_lock = threading.Lock()
+
+
+def get_role_recommender():
+    """Return the process-wide recommender over JOB_ROLES"""
+    global _role_recommender
+    if _role_recommender is None:
+        with _role_recommender_lock:
+            if _role_recommender is None:
+                _role_recommender = RoleRecommender()
+    return _role_recommender
@@ -0,0 +1,57 @@
+import re
+from functools import lru_cache
+
+from ..config.skill_aliases import SKILL_ALIASES
+
+
+# Letters, digits and the symbols that are part of skill names (C++, C#, R&D).
+# A dot between them stays in the token, so "Node.js" is one token and does
+# not contain "js"; a sentence-ending dot is dropped.
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#&]+(?:\.[a-z0-9+#&]+)*")
+
+
+def tokenize(text):
+    """Lowercase text and split it into skill tokens"""
+    return tuple(TOKEN_PATTERN.findall(text.lower()))
+
+
+class SkillMatcher:
+    """Matches a fixed list of skills and their aliases against text.
+
+    Every skill and alias is stored as a token sequence in one lookup table,
+    so matching is a single pass over the text's tokens that checks each
+    position against the table. Matching is on whole tokens ("Java" does not
+    match "JavaScript"), and the cost does not grow with the number of skills.
+    """
+
+    def __init__(self, skills, aliases=None):
+        aliases = SKILL_ALIASES if aliases is None else aliases
+        self.skills = list(dict.fromkeys(skills))
+        self._phrases = {}
+        for skill in self.skills:
+            for form in [skill] + aliases.get(skill.lower(), []):
+                tokens = tokenize(form)
+                if tokens:
+                    self._phrases.setdefault(tokens, set()).add(skill)
+        self._max_tokens = max((len(tokens) for tokens in self._phrases), default=0)
+
+    def find(self, text):
+        """Return the set of skills that occur in text"""
+        tokens = tokenize(text)
+        found = set()
+        for start in range(len(tokens)):
+            for end in range(start + 1, min(start + self._max_tokens, len(tokens)) + 1):
+                skills = self._phrases.get(tokens[start:end])
+                if skills:
+                    found |= skills
+        return found
+
+
+@lru_cache(maxsize=128)
+def _cached_skill_matcher(skills):
+    return SkillMatcher(skills)
+
+
+def get_skill_matcher(skills):
+    """Return the cached matcher for a skill list, e.g. a JOB_ROLES role's required_skills"""
+    return _cached_skill_matcher(tuple(skills))
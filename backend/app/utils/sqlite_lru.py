@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+import time
+
+
+class SQLiteLRUCache:
+    """Size-bounded, least-recently-used cache table in an SQLite file.
+
+    Base class of the extraction and LLM response caches. Each entry has a
+    key, the subclass's value columns, its size in bytes and its created and
+    last-accessed times. Entries past ttl_seconds (if set) are dropped, and
+    least recently used entries are evicted once the total size passes
+    max_bytes. The entry count and total size are kept in a one-row
+    <table>_totals table that triggers update on every change, so eviction
+    and stats never scan the cache, and the totals stay right when several
+    processes share the file.
+    """
+
+    name = "cache"
+
+    def __init__(self, db_path, table, key_column, columns, max_bytes, ttl_seconds=None):
+        self.db_path = db_path
+        self.table = table
+        self.key_column = key_column
+        self.columns = list(columns)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        table = self.table
+        columns = ",\n".join(f"{name} {definition}" for name, definition in self.columns)
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                {self.key_column} TEXT PRIMARY KEY,
+                {columns},
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            ''')
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_last_accessed ON {table} (last_accessed)')
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table} (created_at)')
+            self._conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table}_totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                entries INTEGER NOT NULL,
+                size_bytes INTEGER NOT NULL
+            )
+            ''')
+            # Caches created before the totals table existed start from a count
+            self._conn.execute(f'''
+            INSERT OR IGNORE INTO {table}_totals (id, entries, size_bytes)
+            SELECT 1, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM {table}
+            ''')
+            self._conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE {table}_totals SET entries = entries + 1, size_bytes = size_bytes + NEW.size_bytes;
+            END
+            ''')
+            self._conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE {table}_totals SET entries = entries - 1, size_bytes = size_bytes - OLD.size_bytes;
+            END
+            ''')
+            self._conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_resize AFTER UPDATE OF size_bytes ON {table}
+            BEGIN
+                UPDATE {table}_totals SET size_bytes = size_bytes - OLD.size_bytes + NEW.size_bytes;
+            END
+            ''')
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _totals(self):
+        return self._conn.execute(f'SELECT entries, size_bytes FROM {self.table}_totals').fetchone()
+
+    def _read(self, key):
+        """Return the value columns of a live entry as a tuple, or None"""
+        names = ", ".join(name for name, _ in self.columns)
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    f'SELECT {names}, created_at FROM {self.table} WHERE {self.key_column} = ?', (key,)
+                ).fetchone()
+                now = time.time()
+                if row is not None and self.ttl_seconds is not None and now - row[-1] > self.ttl_seconds:
+                    self._conn.execute(f'DELETE FROM {self.table} WHERE {self.key_column} = ?', (key,))
+                    self._conn.commit()
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                self._conn.execute(
+                    f'UPDATE {self.table} SET last_accessed = ? WHERE {self.key_column} = ?', (now, key)
+                )
+                self._conn.commit()
+                self.hits += 1
+                return row[:-1]
+            except Exception as e:
+                print(f"Error reading {self.name}: {str(e)}")
+                self.misses += 1
+                return None
+
+    def _write(self, key, values, size_bytes):
+        """Store values (in column order) under key, then evict if needed"""
+        if size_bytes > self.max_bytes:
+            return
+        names = [name for name, _ in self.columns]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names + ['size_bytes', 'created_at', 'last_accessed'])
+        now = time.time()
+        with self._lock:
+            try:
+                # An upsert rather than INSERT OR REPLACE, whose implicit
+                # delete would not fire the totals trigger
+                self._conn.execute(f'''
+                INSERT INTO {self.table} ({self.key_column}, {", ".join(names)}, size_bytes, created_at, last_accessed)
+                VALUES ({", ".join("?" * (len(names) + 4))})
+                ON CONFLICT ({self.key_column}) DO UPDATE SET {updates}
+                ''', (key, *values, size_bytes, now, now))
+                self._evict(now)
+                self._conn.commit()
+            except Exception as e:
+                print(f"Error writing {self.name}: {str(e)}")
+                self._conn.rollback()
+
+    def _evict(self, now):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        if self.ttl_seconds is not None:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE created_at < ?', (now - self.ttl_seconds,))
+        total = self._totals()[1]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            f'SELECT {self.key_column}, size_bytes FROM {self.table} ORDER BY last_accessed ASC'
+        )
+        victims = []
+        for key, size_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size_bytes
+        self._conn.executemany(f'DELETE FROM {self.table} WHERE {self.key_column} = ?', victims)
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table}')
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current cache size"""
+        with self._lock:
+            entries, size_bytes = self._totals()
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'size_bytes': size_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,385 @@
+import contextvars
+import io
+import os
+import tempfile
+import warnings
+from collections import deque
+
+import pypdf
+
+from .extraction_cache import get_extraction_cache
+from .ocr import find_poppler_path, get_page_count, submit_ocr_page
+
+
+# A page needs at least this many non-whitespace characters from its text
+# layer before we trust it instead of falling through to the next extractor
+MIN_PAGE_CHARS = 25
+# Share of letters/digits below which text is treated as glyph junk, e.g. "(cid:12)"
+MIN_ALNUM_RATIO = 0.5
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+# Tesseract language(s), e.g. "eng" or "eng+deu"; None uses tesseract's default
+OCR_LANG = os.getenv("OCR_LANG") or None
+# Joins pages in the extracted text: a line holding only a form feed, which
+# line-based readers see as a blank line and prompt compaction uses to find
+# each page's header and footer
+PAGE_SEPARATOR = "\n\f\n"
+
+
+_copy_meter = contextvars.ContextVar('extraction_copy_meter', default=None)
+
+
+class CopyMeter:
+    """Counts the bytes copied or spilled to disk while handling one request.
+
+    Use as a context manager around a request; extraction code reports its
+    copies through record_copy().
+    """
+
+    def __init__(self):
+        self.bytes_copied = 0
+        self._token = None
+
+    def __enter__(self):
+        self._token = _copy_meter.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _copy_meter.reset(self._token)
+        return False
+
+
+def record_copy(nbytes):
+    """Add nbytes to the copy meter of the current request, if any"""
+    meter = _copy_meter.get()
+    if meter is not None:
+        meter.bytes_copied += nbytes
+
+
+def get_file_bytes(file):
+    """Return the content of an upload as bytes or a memoryview.
+
+    bytes, bytearray and memoryview inputs are used as-is and in-memory
+    uploads (BytesIO, Streamlit's UploadedFile) share their buffer, so only
+    real file objects are copied.
+    """
+    if isinstance(file, (bytes, memoryview)):
+        return file
+    if isinstance(file, bytearray):
+        return memoryview(file)
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        content = file.read()
+        file.seek(0)  # Reset file pointer
+        record_copy(len(content))
+        return content
+    content = bytes(file)
+    record_copy(len(content))
+    return content
+
+
+def _as_bytes(data):
+    """Return data as bytes so every BytesIO over it shares one buffer"""
+    if isinstance(data, bytes):
+        return data
+    data = bytes(data)
+    record_copy(len(data))
+    return data
+
+
+def extract_docx_text(docx_file):
+    """Extract paragraph text from a DOCX upload without touching the disk"""
+    from docx import Document
+    doc = Document(io.BytesIO(_as_bytes(get_file_bytes(docx_file))))
+    return '\n'.join(paragraph.text for paragraph in doc.paragraphs)
+
+
+def is_usable_text(text, min_chars=MIN_PAGE_CHARS):
+    """Check whether extracted page text is dense enough to be the real content"""
+    if not text:
+        return False
+    chars = [c for c in text if not c.isspace()]
+    if len(chars) < min_chars:
+        return False
+    alnum = sum(1 for c in chars if c.isalnum())
+    return alnum / len(chars) >= MIN_ALNUM_RATIO
+
+
+def _has_fonts(page):
+    """Return True if a pypdf page declares fonts, i.e. has a text layer at all"""
+    try:
+        resources = page['/Resources']
+        return '/Font' in resources
+    except Exception:
+        # Unknown structure (e.g. inherited resources) - assume it might
+        return True
+
+
+class _PDFSources:
+    """Lazily opened readers over one PDF, shared by all of its pages"""
+
+    def __init__(self, pdf_bytes):
+        self.pdf_bytes = pdf_bytes
+        self.poppler_path = find_poppler_path()
+        self._plumber = None
+        self._plumber_failed = False
+        self._temp_path = None
+
+    def plumber(self):
+        """Return the pdfplumber document, opening it on first use"""
+        if self._plumber is None and not self._plumber_failed:
+            try:
+                import pdfplumber
+                self._plumber = pdfplumber.open(io.BytesIO(self.pdf_bytes))
+            except Exception as e:
+                print(f"pdfplumber could not open PDF: {e}")
+                self._plumber_failed = True
+        return self._plumber
+
+    def temp_path(self):
+        """Spill the PDF to disk, only when OCR needs a file path for poppler"""
+        if self._temp_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+                temp_file.write(self.pdf_bytes)
+                self._temp_path = temp_file.name
+            record_copy(len(self.pdf_bytes))
+        return self._temp_path
+
+    def close(self):
+        if self._plumber is not None:
+            self._plumber.close()
+        if self._temp_path and os.path.exists(self._temp_path):
+            os.unlink(self._temp_path)
+
+
+class PDFTextExtractor:
+    """Per-page adaptive PDF text extraction.
+
+    Every page is first read with pypdf, the cheapest extractor. Pages whose
+    text layer is too sparse are retried with pdfplumber, and pages with no
+    usable text layer at all are sent to OCR. The extractor that produced each
+    page is recorded, and results are shared through the extraction cache.
+    """
+
+    def __init__(self, min_page_chars=MIN_PAGE_CHARS, enable_ocr=True, use_cache=True, ocr_dpi=None, ocr_lang=None):
+        self.min_page_chars = min_page_chars
+        self.enable_ocr = enable_ocr
+        self.use_cache = use_cache
+        self.ocr_dpi = ocr_dpi or OCR_DPI
+        self.ocr_lang = ocr_lang or OCR_LANG
+
+    def cache_options(self):
+        """The settings that change the extracted text, as part of the cache key"""
+        options = f"min_page_chars={self.min_page_chars};ocr={self.enable_ocr}"
+        if self.enable_ocr:
+            options += f";dpi={self.ocr_dpi};lang={self.ocr_lang or ''}"
+        return options
+
+    def extract(self, pdf_bytes):
+        """Extract text from PDF bytes or a memoryview.
+
+        Returns a dict with the joined 'text', a summary 'extractor' (e.g.
+        'pypdf+ocr' for mixed documents) and 'pages', a list of
+        {'page_number', 'text', 'extractor'} dicts in page order.
+        """
+        content_hash, cached = self._lookup(pdf_bytes)
+        if cached:
+            pages = self._pages_from_cache(cached)
+        else:
+            pages = [
+                {'page_number': page_number, 'text': text, 'extractor': extractor}
+                for page_number, text, extractor in self._iter_uncached(pdf_bytes, content_hash)
+            ]
+
+        return {
+            'text': PAGE_SEPARATOR.join(page['text'] for page in pages if page['text']).strip(),
+            'extractor': self._summarize_extractors(pages),
+            'pages': pages,
+            'cached': bool(cached)
+        }
+
+    def iter_pages(self, pdf_bytes):
+        """Yield (page_number, text, extractor) tuples as pages are decoded.
+
+        Pages come out in order. OCR for scanned pages runs in the background
+        while later pages are still being parsed, so callers can start work
+        on the first page before the whole document is done.
+        """
+        content_hash, cached = self._lookup(pdf_bytes)
+        if cached:
+            for page in self._pages_from_cache(cached):
+                yield page['page_number'], page['text'], page['extractor']
+            return
+        yield from self._iter_uncached(pdf_bytes, content_hash)
+
+    def _lookup(self, pdf_bytes):
+        """Return (content_hash, cached entry or None)"""
+        if not self.use_cache:
+            return None, None
+        cache = get_extraction_cache()
+        content_hash = cache.make_key(pdf_bytes, self.cache_options())
+        return content_hash, cache.get(content_hash)
+
+    def _iter_uncached(self, pdf_bytes, content_hash):
+        """Decode every page in order, then store the document in the cache
+        unless OCR failed on any page (so a later attempt can succeed)"""
+        sources = _PDFSources(_as_bytes(pdf_bytes))
+        pages = []
+        pending = deque()
+        failed = False
+        try:
+            for page_number, text, extractor, needs_ocr in self._decode_pages(sources):
+                future = self._submit_ocr(sources, page_number) if needs_ocr else None
+                failed = failed or (needs_ocr and future is None)
+                pending.append((page_number, text, extractor, future))
+
+                # Emit every finished page at the head of the queue
+                while pending and (pending[0][3] is None or pending[0][3].done()):
+                    page, ok = self._resolve(pending.popleft())
+                    failed = failed or not ok
+                    pages.append(page)
+                    yield page['page_number'], page['text'], page['extractor']
+
+            while pending:
+                page, ok = self._resolve(pending.popleft())
+                failed = failed or not ok
+                pages.append(page)
+                yield page['page_number'], page['text'], page['extractor']
+        finally:
+            # Drop queued OCR work if the caller stopped early
+            for _, _, _, future in pending:
+                if future is not None:
+                    future.cancel()
+            sources.close()
+
+        if content_hash is not None and not failed:
+            text = PAGE_SEPARATOR.join(page['text'] for page in pages if page['text']).strip()
+            get_extraction_cache().put(content_hash, text, self._summarize_extractors(pages), pages)
+
+    def _decode_pages(self, sources):
+        """Yield (page_number, text, extractor, needs_ocr) using the text layer.
+
+        pypdf is tried first; pdfplumber only for sparse pages, or for every
+        page if pypdf cannot open the document.
+        """
+        reader = None
+        try:
+            reader = pypdf.PdfReader(io.BytesIO(sources.pdf_bytes))
+            page_count = len(reader.pages)
+        except Exception as e:
+            print(f"pypdf could not open PDF: {e}")
+            reader = None
+            page_count = self._fallback_page_count(sources)
+
+        for index in range(page_count):
+            page_number = index + 1
+            text, extractor = "", 'none'
+            try_plumber = True
+
+            if reader is not None:
+                page = reader.pages[index]
+                try:
+                    page_text = (page.extract_text() or "").strip()
+                except Exception as e:
+                    print(f"Error extracting page {page_number} with pypdf: {e}")
+                    page_text = ""
+
+                if is_usable_text(page_text, self.min_page_chars):
+                    yield page_number, page_text, 'pypdf', False
+                    continue
+                if page_text:
+                    text, extractor = page_text, 'pypdf'
+                # Only a page with some text layer is worth a pdfplumber pass
+                try_plumber = bool(page_text) or _has_fonts(page)
+
+            if try_plumber:
+                page_text = self._plumber_page_text(sources, index).strip()
+                if is_usable_text(page_text, self.min_page_chars):
+                    yield page_number, page_text, 'pdfplumber', False
+                    continue
+
+            yield page_number, text, extractor, self.enable_ocr
+
+    def _fallback_page_count(self, sources):
+        """Count pages with pdfplumber, or poppler, when pypdf cannot open the file"""
+        pdf = sources.plumber()
+        if pdf is not None:
+            return len(pdf.pages)
+        if not self.enable_ocr:
+            return 0
+        try:
+            return get_page_count(sources.temp_path(), sources.poppler_path)
+        except Exception as e:
+            print(f"Could not read page count: {e}")
+            return 0
+
+    def _plumber_page_text(self, sources, index):
+        """Extract one page with pdfplumber, hiding its colour-space warnings"""
+        pdf = sources.plumber()
+        if pdf is None:
+            return ""
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
+                warnings.filterwarnings("ignore", message=".*Cannot convert.*")
+                return pdf.pages[index].extract_text() or ""
+        except Exception as e:
+            if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
+                print(f"Error extracting page with pdfplumber: {e}")
+            return ""
+
+    def _submit_ocr(self, sources, page_number):
+        """Queue one page on the OCR pool, or return None if OCR is unavailable"""
+        try:
+            return submit_ocr_page(sources.temp_path(), page_number, sources.poppler_path, self.ocr_dpi, self.ocr_lang)
+        except Exception as e:
+            print(f"OCR extraction failed: {e}")
+            return None
+
+    @staticmethod
+    def _resolve(entry):
+        """Turn a queued page into (its final record, whether OCR succeeded),
+        waiting for OCR if needed"""
+        page_number, text, extractor, future = entry
+        ok = True
+        if future is not None:
+            try:
+                ocr_text = future.result().strip()
+                # Keep a partial text layer if OCR found nothing better
+                if ocr_text:
+                    text, extractor = ocr_text, 'ocr'
+            except Exception as e:
+                print(f"OCR extraction failed on page {page_number}: {e}")
+                ok = False
+        return {'page_number': page_number, 'text': text, 'extractor': extractor}, ok
+
+    @staticmethod
+    def _summarize_extractors(pages):
+        """Return the extractors used, in order of first use, e.g. 'pypdf+ocr'"""
+        used = []
+        for page in pages:
+            if page['text'] and page['extractor'] not in used:
+                used.append(page['extractor'])
+        return '+'.join(used) if used else 'none'
+
+    @staticmethod
+    def _pages_from_cache(cached):
+        """Normalize cached pages, which may be plain strings from older entries"""
+        pages = []
+        for index, page in enumerate(cached['pages']):
+            if isinstance(page, dict):
+                pages.append(page)
+            else:
+                pages.append({'page_number': index + 1, 'text': page or "", 'extractor': cached['extractor']})
+        return pages
+
+
+_pdf_text_extractor = None
+
+
+def get_pdf_text_extractor():
+    """Return the default extractor shared by the analyzers"""
+    global _pdf_text_extractor
+    if _pdf_text_extractor is None:
+        _pdf_text_extractor = PDFTextExtractor()
+    return _pdf_text_extractor